@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark PlaylistCat at different playlist sizes
+
+Times fetching a playlist (against the offline stand-in backend), the track
+normalization loop of the playlist service, populating the table, sorting it and
+removing tracks, and records the peak memory use of each size. Every size
+runs in a fresh process under QT_QPA_PLATFORM=offscreen; results are written
+as JSON so runs of different versions can be compared. Cold start is timed
+too: the time from launching src/main.py to the first paint of its window.
+
+Usage:
+    python benchmark.py [--sizes 1000 10000 100000] [--repeat 3] [--output benchmark_results.json]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_REPEAT = 3
+DEFAULT_OUTPUT = "benchmark_results.json"
+# Single-track removals timed per repeat
+SINGLE_REMOVALS = 20
+# Tracks, spread over the playlist, removed together in one multi-track removal
+BULK_REMOVALS = 500
+# Line printed by src/main.py under PLAYLISTCAT_STARTUP_TIMING
+STARTUP_LINE = re.compile(r"first paint after ([\d.]+) ms, ready after ([\d.]+) ms")
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KiB, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def summarize(timings):
+    """Reduce repeated timings (seconds) to a result entry"""
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'runs': timings,
+    }
+
+
+def timed(function, *args):
+    """Run function and return (seconds taken, result)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def run_size(size, repeat):
+    """Benchmark one playlist size in this process and return its result entry"""
+    # Keep the benchmark away from the user's auth file and caches
+    home = tempfile.mkdtemp(prefix="playlistcat-bench-")
+    os.environ['HOME'] = home
+    os.environ['XDG_CONFIG_HOME'] = home
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    from ytmusicapi.parsers.playlists import parse_playlist_items
+
+    import fake_backend
+    from request_governor import RequestGovernor, set_governor
+    from client_pool import YTMusicClientPool, build_client
+    from core import PlaylistService
+    from main import PlaylistFetcher, YouTubeMusicPlaylistViewer
+    from utils import normalize_track, track_key
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    # Measure PlaylistCat, not the pacing meant to protect YouTube Music
+    set_governor(RequestGovernor(rate=1e9, burst=10 ** 6))
+    backend = fake_backend.install(tracks=size)
+    playlist_id = backend.playlist_ids[0]
+    service = PlaylistService(YTMusicClientPool(build_client))
+
+    stages = {}
+
+    # Fetch: every page through ytmusicapi, the governor and the response cache
+    fetch_timings = []
+    for _ in range(repeat):
+        fetcher = PlaylistFetcher(service, playlist_id, revalidate=True)
+        results = []
+        fetcher.data_ready.connect(results.append)
+        seconds, _ = timed(fetcher.run)
+        if not results or len(results[0]) != size:
+            raise RuntimeError(f"Fetch returned {len(results[0]) if results else 0} of {size} tracks")
+        fetch_timings.append(seconds)
+    stages['fetch'] = summarize(fetch_timings)
+
+    # Normalize: the per-track loop of core.iter_track_pages on already parsed items
+    raw_tracks = parse_playlist_items([fake_backend.make_track_item(number) for number in range(size)])
+
+    def normalize():
+        return [normalize_track(track, position) for position, track in enumerate(raw_tracks, 1)]
+
+    normalize_timings = []
+    for _ in range(repeat):
+        seconds, tracks = timed(normalize)
+        normalize_timings.append(seconds)
+    stages['normalize'] = summarize(normalize_timings)
+
+    viewer = YouTubeMusicPlaylistViewer()
+    viewer.show()
+    app.processEvents()
+    # Removals ask for confirmation; always say yes
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.StandardButton.Yes)
+
+    def populate():
+        viewer.tracks_data = list(tracks)
+        viewer.populate_table()
+        app.processEvents()
+
+    def sort(column):
+        viewer.sort_table(column)
+        app.processEvents()
+
+    timings = {name: [] for name in ('populate', 'sort_artist', 'sort_title', 'sort_descending',
+                                     'sort_position', 'remove_track', 'remove_bulk')}
+    for _ in range(repeat):
+        # Start every repeat from the playlist order
+        viewer.current_sort_column = 0
+        viewer.current_sort_order = Qt.SortOrder.AscendingOrder
+        viewer.sort_proxy.sort(0, Qt.SortOrder.AscendingOrder)
+
+        timings['populate'].append(timed(populate)[0])
+        timings['sort_artist'].append(timed(sort, 1)[0])
+        timings['sort_title'].append(timed(sort, 2)[0])
+        timings['sort_descending'].append(timed(sort, 2)[0])
+        timings['sort_position'].append(timed(sort, 0)[0])
+
+        # Single removals spread over the playlist, as a user would click them
+        step = max(1, len(viewer.tracks_data) // SINGLE_REMOVALS)
+        keys = [track_key(track) for track in viewer.tracks_data[::step][:SINGLE_REMOVALS]]
+        single = []
+        for key in keys:
+            single.append(timed(lambda: (viewer.remove_track(key), app.processEvents()))[0])
+        timings['remove_track'].append(statistics.mean(single))
+
+        step = max(1, len(viewer.tracks_data) // BULK_REMOVALS)
+        keys = [track_key(track) for track in viewer.tracks_data[::step][:BULK_REMOVALS]]
+        timings['remove_bulk'].append(timed(lambda: (viewer.remove_tracks(keys), app.processEvents()))[0])
+
+    for name, values in timings.items():
+        stages[name] = summarize(values)
+
+    viewer.close()
+    fake_backend.uninstall()
+    shutil.rmtree(home, ignore_errors=True)
+
+    return {
+        'tracks': size,
+        'stages': stages,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def run_startup(repeat, env):
+    """Launch the application repeat times and time its startup"""
+    timings = {'first_paint': [], 'ready': [], 'process': []}
+    for _ in range(repeat):
+        # A fresh home: no saved login and empty caches, like a first launch
+        home = tempfile.mkdtemp(prefix="playlistcat-bench-")
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, str(Path(__file__).parent / "src" / "main.py")],
+                                 capture_output=True, text=True, timeout=120,
+                                 env=dict(env, HOME=home, XDG_CONFIG_HOME=home,
+                                          PLAYLISTCAT_STARTUP_TIMING="exit"))
+        elapsed = time.perf_counter() - start
+        shutil.rmtree(home, ignore_errors=True)
+
+        match = STARTUP_LINE.search(process.stdout)
+        if process.returncode != 0 or not match:
+            raise RuntimeError(f"Startup run failed:\n{process.stdout}{process.stderr}")
+        # The application counts from its first import; process includes the interpreter
+        timings['first_paint'].append(float(match.group(1)) / 1000)
+        timings['ready'].append(float(match.group(2)) / 1000)
+        timings['process'].append(elapsed)
+    return {name: summarize(values) for name, values in timings.items()}
+
+
+def git_revision():
+    """Commit the benchmarked tree is at, or None outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PlaylistCat at different playlist sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Playlist sizes in tracks (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Runs of every stage per size (default: %(default)s)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="JSON file to write the results to (default: %(default)s)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # Child process: benchmark one size and report it on stdout
+        print(json.dumps(run_size(args.worker, args.repeat)))
+        return 0
+
+    print("PlaylistCat 🐱 - Benchmark")
+    print("=" * 50)
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen",
+               QT_LOGGING_RULES="*.debug=false;qt.qpa.*=false")
+    results = []
+    for size in args.sizes:
+        print(f"\n⏱️  {size} tracks...")
+        process = subprocess.run([sys.executable, __file__, "--worker", str(size), "--repeat", str(args.repeat)],
+                                 capture_output=True, text=True, env=env)
+        if process.returncode != 0:
+            print(f"❌ Benchmark of {size} tracks failed:\n{process.stderr}")
+            return 1
+
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        results.append(result)
+        for name, stage in result['stages'].items():
+            print(f"   {name:<16} {stage['min'] * 1000:10.2f} ms (median {stage['median'] * 1000:.2f} ms)")
+        if result['peak_rss_kb'] is not None:
+            print(f"   {'peak RSS':<16} {result['peak_rss_kb'] / 1024:10.1f} MiB")
+
+    print("\n⏱️  Startup...")
+    try:
+        startup = run_startup(args.repeat, env)
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        print(f"❌ Startup benchmark failed:\n{e}")
+        return 1
+    for name, stage in startup.items():
+        print(f"   {name:<16} {stage['min'] * 1000:10.2f} ms (median {stage['median'] * 1000:.2f} ms)")
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results,
+        'startup': startup,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
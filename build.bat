@@ -38,6 +38,19 @@ pyinstaller --onefile --windowed --name playlistcat ^
     --add-data "README.md;." ^
     --add-data "src\utils.py;." ^
     --add-data "src\auth.py;." ^
+    --add-data "src\track_model.py;." ^
+    --add-data "src\track_store.py;." ^
+    --add-data "src\exporters.py;." ^
+    --add-data "src\playlist_pages.py;." ^
+    --add-data "src\playlist_cache.py;." ^
+    --add-data "src\playlist_edits.py;." ^
+    --add-data "src\library_crawl.py;." ^
+    --add-data "src\client_pool.py;." ^
+    --add-data "src\http_session.py;." ^
+    --add-data "src\request_governor.py;." ^
+    --add-data "src\response_cache.py;." ^
+    --add-data "src\tracing.py;." ^
+    --add-data "src\core.py;." ^
     --hidden-import PyQt6.QtCore ^
     --hidden-import PyQt6.QtGui ^
     --hidden-import PyQt6.QtWidgets ^
@@ -50,6 +63,18 @@ if %ERRORLEVEL% neq 0 (
     exit /b 1
 )
 
+echo ⌨️ Building command line version...
+pyinstaller --onefile --console --name playlistcat-cli ^
+    --exclude-module PyQt6 ^
+    --hidden-import ytmusicapi ^
+    --hidden-import requests ^
+    src\cli.py
+
+if %ERRORLEVEL% neq 0 (
+    echo ❌ CLI build failed
+    exit /b 1
+)
+
 REM Create release directory
 echo 📁 Creating release package...
 if not exist "release" mkdir release
@@ -69,6 +94,11 @@ if exist "dist\playlistcat.exe" (
     exit /b 1
 )
 
+if exist "dist\playlistcat-cli.exe" (
+    copy "dist\playlistcat-cli.exe" "release\" >nul 2>&1
+    echo ✅ Copied playlistcat-cli.exe
+)
+
 copy README.md release\ >nul 2>&1
 copy LICENSE release\ >nul 2>&1
 copy examples.py release\ >nul 2>&1
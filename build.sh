@@ -41,6 +41,19 @@ pyinstaller --onefile --windowed --name playlistcat \
     --add-data "README.md:." \
     --add-data "src/utils.py:." \
     --add-data "src/auth.py:." \
+    --add-data "src/track_model.py:." \
+    --add-data "src/track_store.py:." \
+    --add-data "src/exporters.py:." \
+    --add-data "src/playlist_pages.py:." \
+    --add-data "src/playlist_cache.py:." \
+    --add-data "src/playlist_edits.py:." \
+    --add-data "src/library_crawl.py:." \
+    --add-data "src/client_pool.py:." \
+    --add-data "src/http_session.py:." \
+    --add-data "src/request_governor.py:." \
+    --add-data "src/response_cache.py:." \
+    --add-data "src/tracing.py:." \
+    --add-data "src/core.py:." \
     --hidden-import PyQt6.QtCore \
     --hidden-import PyQt6.QtGui \
     --hidden-import PyQt6.QtWidgets \
@@ -53,6 +66,19 @@ pyinstaller --onefile --windowed --name playlistcat \
     exit 1
 }
 
+# Build command line version; it never imports Qt, so PyQt6 is left out
+echo "⌨️  Building command line version..."
+pyinstaller --onefile --console --name playlistcat-cli \
+    --exclude-module PyQt6 \
+    --hidden-import ytmusicapi \
+    --hidden-import requests \
+    --strip \
+    --noupx \
+    src/cli.py || {
+    echo "❌ CLI build failed"
+    exit 1
+}
+
 # Create distribution package
 echo "📁 Creating distribution package..."
 mkdir -p release
@@ -85,5 +111,6 @@ echo "🚀 To distribute:"
 echo "   - Copy the 'release/' folder to target machines"
 echo "   - On Linux/Mac: Run ./run-gui.sh"
 echo "   - On Windows: Run run-gui.bat"
+echo "   - For scripts and servers without a display: ./playlistcat-cli --help"
 echo ""
 echo "💡 For cross-platform builds, run this script on each target OS"
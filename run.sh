@@ -7,6 +7,11 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 # Activate virtual environment
 source "$SCRIPT_DIR/venv/bin/activate"
 
+# With arguments, run a command line subcommand (e.g. ./run.sh fetch PLAYLIST) without the GUI
+if [ $# -gt 0 ]; then
+    exec python "$SCRIPT_DIR/src/cli.py" "$@"
+fi
+
 # Start the GUI application
 echo "Starting PlaylistCat..."
 python "$SCRIPT_DIR/src/main.py"
@@ -11,11 +11,26 @@ import webbrowser
 import shlex
 import time
 import requests
-from typing import Optional, Dict, List, Any
-from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer
+from functools import partial
+from typing import Optional, Dict, List, Any, Callable, Tuple
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, QTimer
 from PyQt6.QtWidgets import QMessageBox, QInputDialog, QDialog, QVBoxLayout, QPushButton, QLabel, QTextEdit
 from ytmusicapi import YTMusic
 
+import tracing
+from client_pool import YTMusicClientPool, build_client
+from core import PlaylistService, default_auth_file_path, sapisid_authorization
+from http_session import create_session
+from response_cache import get_response_cache, revalidating
+from utils import is_auth_error, is_rate_limit_error, format_playlist, get_config_dir
+
+# Saved logins verified this recently are trusted at startup without asking the server
+AUTH_RECHECK_INTERVAL = 6 * 60 * 60
+# Seconds each request of the background check of a saved login may take
+AUTH_CHECK_TIMEOUT = 10
+# When the saved login last worked, kept in the configuration directory
+AUTH_STATE_FILE_NAME = "auth_state.json"
+
 
 class AuthSetupDialog(QDialog):
     """Dialog for setting up YouTube Music authentication"""
@@ -198,44 +213,101 @@ class AuthSetupDialog(QDialog):
             return tokens
 
 
-class PlaylistFetcher(QThread):
-    """Background thread for fetching playlists (both personal and public)"""
+class SavedAuthValidator(QThread):
+    """Background thread that checks saved credentials with a library request.
 
-    playlists_ready = pyqtSignal(list)
-    error_occurred = pyqtSignal(str)
-    progress_update = pyqtSignal(str)
+    Keeps the network round trip off the GUI thread at startup.
+    validation_finished carries whether the credentials work, whether a
+    failure was a confirmed authentication error (as opposed to a timeout,
+    network trouble or throttling, which say nothing about the
+    credentials) and the error message.
+    """
 
-    def __init__(self, ytmusic: YTMusic, fetch_personal: bool = False):
+    validation_finished = pyqtSignal(bool, bool, str)  # Valid, confirmed auth error, error message
+
+    def __init__(self, client_factory: Callable[[], YTMusic]):
         super().__init__()
-        self.ytmusic = ytmusic
-        self.fetch_personal = fetch_personal
+        self.client_factory = client_factory
 
+    @tracing.traced(category="auth")
     def run(self):
+        """Probe the library in background thread."""
         try:
-            if self.fetch_personal:
-                self.progress_update.emit("Fetching your personal playlists...")
-                playlists = self.ytmusic.get_library_playlists(limit=100)
-            else:
-                # For unauthenticated mode, we can't fetch personal playlists
-                # This would be used for other features like search results
-                self.playlists_ready.emit([])
-                return
+            ytmusic = self.client_factory()
+        except requests.RequestException as e:
+            # Building a client fetches the start page, which needs the network
+            self.validation_finished.emit(False, False, str(e))
+            return
+        except Exception as e:
+            # ytmusicapi can't use the saved file at all
+            self.validation_finished.emit(False, True, str(e))
+            return
+
+        try:
+            AuthenticationManager._probe_library(ytmusic)
+        except Exception as e:
+            auth_error = is_auth_error(e) and not isinstance(e, (requests.ConnectionError, requests.Timeout))
+            self.validation_finished.emit(False, auth_error, str(e))
+            return
+        self.validation_finished.emit(True, False, "")
 
-            formatted_playlists = []
-            for playlist in playlists:
-                formatted_playlists.append({
-                    'id': playlist.get('playlistId', ''),
-                    'title': playlist.get('title', 'Unknown Playlist'),
-                    'description': playlist.get('description', ''),
-                    'count': playlist.get('count', 0),
-                    'thumbnails': playlist.get('thumbnails', [])
-                })
 
-            self.progress_update.emit(f"Found {len(formatted_playlists)} playlists")
-            self.playlists_ready.emit(formatted_playlists)
+class TokenRefresher(QThread):
+    """Background thread that checks the credentials and refreshes expired tokens.
 
-        except Exception as e:
-            self.error_occurred.emit(f"Error fetching playlists: {str(e)}")
+    Keeps the network round trips of a refresh off the GUI thread. Given a
+    client pool, the current credentials are probed first and kept if they
+    work or if the check was throttled or could not reach the server.
+    Otherwise each candidate client factory is built and probed in turn.
+    refresh_finished carries the outcome and, after a refresh, the new
+    client and its factory.
+    """
+
+    HEALTHY = 'healthy'      # Current credentials work
+    SKIPPED = 'skipped'      # Throttled or unreachable; nothing learned about the credentials
+    REFRESHED = 'refreshed'  # A candidate worked
+    FAILED = 'failed'        # No candidate worked
+
+    refresh_finished = pyqtSignal(str, object, object)  # Outcome, new client, new client factory
+
+    def __init__(self, candidates: List[Tuple[str, Callable[[], YTMusic]]],
+                 client_pool: Optional[YTMusicClientPool] = None):
+        super().__init__()
+        self.candidates = candidates
+        self.client_pool = client_pool
+
+    @tracing.traced(category="auth")
+    def run(self):
+        """Check and refresh the credentials in background thread."""
+        if self.client_pool is not None:
+            try:
+                print("🔍 Checking authentication health...")
+                with self.client_pool.lease() as ytmusic:
+                    test_playlists = AuthenticationManager._probe_library(ytmusic)
+                print(f"✅ Authentication health check passed ({len(test_playlists)} playlists)")
+                self.refresh_finished.emit(self.HEALTHY, None, None)
+                return
+            except Exception as e:
+                if is_rate_limit_error(e) or isinstance(e, (requests.ConnectionError, requests.Timeout)):
+                    # Throttling and network trouble say nothing about the tokens
+                    print(f"⚠️  Authentication health check skipped: {e}")
+                    self.refresh_finished.emit(self.SKIPPED, None, None)
+                    return
+                print(f"⚠️  Authentication health check failed: {e}")
+
+        for description, client_factory in self.candidates:
+            print(f"🔧 Refreshing using {description}...")
+            try:
+                ytmusic = client_factory()
+                AuthenticationManager._probe_library(ytmusic)
+            except Exception as e:
+                print(f"Refresh using {description} failed: {e}")
+                continue
+            print(f"✅ Token refresh successful using {description}")
+            self.refresh_finished.emit(self.REFRESHED, ytmusic, client_factory)
+            return
+
+        self.refresh_finished.emit(self.FAILED, None, None)
 
 
 class AuthenticationManager(QObject):
@@ -244,14 +316,22 @@ class AuthenticationManager(QObject):
     # Signals
     auth_status_changed = pyqtSignal(bool)  # True if authenticated, False if not
     user_info_updated = pyqtSignal(dict)    # User information
+    token_refresh_finished = pyqtSignal(bool)  # Whether still authenticated after a token refresh
 
     def __init__(self):
         super().__init__()
         self.is_authenticated = False
         self.user_info = {}
-        self.ytmusic = None
+        self._ytmusic = None  # Client for the GUI thread; workers lease theirs from client_pool
+        self._client_factory = None
+        self._credentials_generation = 0  # Bumped whenever the credentials are replaced
+        self.client_pool = YTMusicClientPool()
+        self.service = PlaylistService(self.client_pool)
         self.auth_session = None  # Store authenticated requests session
-        self.auth_file_path = os.path.join(os.path.expanduser("~"), ".playlistcat_auth.json")
+        self.auth_file_path = default_auth_file_path()
+        self.auth_validator = None  # Background check of the saved credentials
+        self.token_refresher = None  # Background check and refresh of the tokens
+        self.auth_state_path = os.path.join(get_config_dir(), AUTH_STATE_FILE_NAME)
 
         # Token refresh management
         self.last_auth_headers = None  # Store original headers for refresh
@@ -267,16 +347,39 @@ class AuthenticationManager(QObject):
         # Initialize with unauthenticated YTMusic
         self.init_unauthenticated()
 
+    @property
+    def ytmusic(self) -> Optional[YTMusic]:
+        """Client for the GUI thread, built from the current credentials on first use"""
+        if self._ytmusic is None and self._client_factory is not None:
+            try:
+                self._ytmusic = self._client_factory()
+            except Exception as e:
+                print(f"Failed to initialize YTMusic: {e}")
+        return self._ytmusic
+
+    def _set_client(self, ytmusic: Optional[YTMusic], factory: Optional[Callable[[], YTMusic]]):
+        """Install new credentials for the GUI-thread client and the worker pool
+
+        ytmusic may be None to build the GUI-thread client lazily from factory.
+        """
+        self._ytmusic = ytmusic
+        self._client_factory = factory
+        self._credentials_generation += 1
+        self.client_pool.swap(factory)
+
+    @staticmethod
+    def _probe_library(ytmusic: YTMusic) -> List[Dict[str, Any]]:
+        """Check library access with a minimal request that bypasses the HTTP response cache"""
+        with revalidating():
+            return ytmusic.get_library_playlists(limit=1)
+
     def init_unauthenticated(self):
         """Initialize YTMusic in unauthenticated mode"""
-        try:
-            self.ytmusic = YTMusic()
-            self.is_authenticated = False
-            self.user_info = {}
-            self.auth_status_changed.emit(False)
-        except Exception as e:
-            print(f"Failed to initialize YTMusic: {e}")
-            self.ytmusic = None
+        # Clients are built when first needed, keeping ytmusicapi's setup out of startup
+        self._set_client(None, build_client)
+        self.is_authenticated = False
+        self.user_info = {}
+        self.auth_status_changed.emit(False)
 
     def setup_authentication(self, parent_widget=None) -> bool:
         """Show authentication setup dialog and configure authentication"""
@@ -287,6 +390,7 @@ class AuthenticationManager(QObject):
 
         return False
 
+    @tracing.traced(category="auth")
     def authenticate_with_headers(self, headers: Dict[str, str]) -> bool:
         """Authenticate using browser headers with multiple fallback methods"""
         try:
@@ -305,8 +409,7 @@ class AuthenticationManager(QObject):
             # First verify the authentication headers work with direct API call
             print("🔧 Verifying authentication headers...")
             try:
-                import requests
-                test_response = requests.get(
+                test_response = create_session().get(
                     'https://music.youtube.com/verify_session',
                     headers={
                         'Cookie': cookie_header,
@@ -333,27 +436,10 @@ class AuthenticationManager(QObject):
             # IMPORTANT: We need to include Authorization header with SAPISIDHASH to avoid OAuth detection
             # See: https://github.com/sigma67/ytmusicapi/issues/781
 
-            # Extract SAPISID from cookies to generate SAPISIDHASH
-            import re
-            import hashlib
-            import time
-
-            sapisid = None
-            for cookie in cookie_header.split(';'):
-                cookie = cookie.strip()
-                if cookie.startswith('SAPISID='):
-                    sapisid = cookie.split('=', 1)[1]
-                    break
-
-            authorization_header = None
-            if sapisid:
-                # Generate SAPISIDHASH as required by ytmusicapi for browser auth detection
-                # Format: SAPISIDHASH {timestamp}_{hash}
-                timestamp = str(int(time.time()))
-                origin = "https://music.youtube.com"
-                hash_string = f"{timestamp} {sapisid} {origin}"
-                sapisidhash = hashlib.sha1(hash_string.encode()).hexdigest()
-                authorization_header = f"SAPISIDHASH {timestamp}_{sapisidhash}"
+            # Generate SAPISIDHASH from the SAPISID cookie as required by
+            # ytmusicapi for browser auth detection
+            authorization_header = sapisid_authorization(cookie_header)
+            if authorization_header:
                 print(f"✅ Generated SAPISIDHASH authorization header")
             else:
                 print("⚠️  No SAPISID found in cookies - this may cause OAuth detection issues")
@@ -393,7 +479,7 @@ class AuthenticationManager(QObject):
                 print(f"⚠️  Could not save auth file: {file_error}")
 
             # Method 2: Create a requests session with proper authentication
-            session = requests.Session()
+            session = create_session()
             session.headers.update({
                 'Cookie': cookie_header,
                 'User-Agent': headers.get('User-Agent', 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0'),
@@ -412,6 +498,7 @@ class AuthenticationManager(QObject):
 
             # Try multiple YTMusic initialization approaches
             test_ytmusic = None
+            client_factory = None
             auth_method = None
             playlists = []  # Initialize playlists list
 
@@ -419,9 +506,10 @@ class AuthenticationManager(QObject):
             if os.path.exists(self.auth_file_path):
                 try:
                     print("🔧 Trying auth file + session...")
-                    test_ytmusic = YTMusic(auth=self.auth_file_path, requests_session=session)
+                    client_factory = partial(build_client, auth=self.auth_file_path, headers=dict(session.headers))
+                    test_ytmusic = client_factory()
                     # Test library access
-                    playlists = test_ytmusic.get_library_playlists(limit=1)
+                    playlists = self._probe_library(test_ytmusic)
                     print(f"✅ Auth file + session works! Found {len(playlists)} playlists")
                     auth_method = "auth_file_session"
                 except Exception as e:
@@ -432,9 +520,10 @@ class AuthenticationManager(QObject):
             if test_ytmusic is None and os.path.exists(self.auth_file_path):
                 try:
                     print("🔧 Trying auth file only...")
-                    test_ytmusic = YTMusic(self.auth_file_path)
+                    client_factory = partial(build_client, auth=self.auth_file_path)
+                    test_ytmusic = client_factory()
                     # Test library access
-                    playlists = test_ytmusic.get_library_playlists(limit=1)
+                    playlists = self._probe_library(test_ytmusic)
                     print(f"✅ Auth file works! Found {len(playlists)} playlists")
                     auth_method = "auth_file"
                 except Exception as e:
@@ -445,7 +534,8 @@ class AuthenticationManager(QObject):
             if test_ytmusic is None:
                 try:
                     print("🔧 Trying session only...")
-                    test_ytmusic = YTMusic(requests_session=session)
+                    client_factory = partial(build_client, headers=dict(session.headers))
+                    test_ytmusic = client_factory()
                     print("✅ Session-only YTMusic created (library access may be limited)")
                     auth_method = "session_only"
                     playlists = []  # Can't test library access with session-only
@@ -454,13 +544,13 @@ class AuthenticationManager(QObject):
                     raise Exception(f"All authentication methods failed. Last error: {e}")
 
             # If we get here, one of the methods worked
-            self.ytmusic = test_ytmusic
+            self._set_client(test_ytmusic, client_factory)
             self.is_authenticated = True
             self.auth_session = session
 
             # Store authentication info for refresh
             self.last_auth_headers = headers.copy()
-            self.last_auth_time = time.time()
+            self._record_verified()
             self.auth_retry_count = 0  # Reset retry count on successful auth
 
             # Start authentication health monitoring
@@ -507,138 +597,92 @@ class AuthenticationManager(QObject):
 
     def _check_authentication_health(self):
         """Periodically check if authentication is still valid and attempt refresh if needed"""
-        if not self.is_authenticated or not self.ytmusic:
-            return
-
-        try:
-            print("🔍 Checking authentication health...")
-            # Try a simple API call to test authentication
-            test_playlists = self.ytmusic.get_library_playlists(limit=1)
-            print(f"✅ Authentication health check passed ({len(test_playlists)} playlists)")
-            self.auth_retry_count = 0  # Reset retry count on success
+        self.start_token_refresh(check_first=True)
+
+    def start_token_refresh(self, check_first: bool = False) -> bool:
+        """
+        Refresh the tokens in a background thread.
+
+        With check_first the current credentials are probed first and only
+        refreshed if they fail, as the periodic health check does. A failed
+        refresh falls back to unauthenticated mode. token_refresh_finished
+        reports whether the login survived.
+
+        Returns:
+            Whether token_refresh_finished will be emitted: False when asked
+            to check while not authenticated, True when a refresh was started
+            or is already running
+        """
+        if self.token_refresher is not None and self.token_refresher.isRunning():
+            return True
+        if check_first and not self.is_authenticated:
+            return False
 
-        except Exception as e:
-            print(f"⚠️  Authentication health check failed: {e}")
-            self._attempt_token_refresh()
+        self.token_refresher = self._create_token_refresher(check_first)
+        self.token_refresher.start()
+        return True
 
-    def _attempt_token_refresh(self):
-        """Attempt to refresh authentication using stored headers"""
+    def _create_token_refresher(self, check_first: bool) -> TokenRefresher:
+        """Set up a token refresh whose outcome is applied when it finishes"""
+        if not check_first:
+            self.auth_retry_count = 0  # Reset retry count for manual refresh
         if self.auth_retry_count >= self.max_auth_retries:
+            # Probe the current credentials at most; there is nothing left to try
             print(f"❌ Maximum authentication retries ({self.max_auth_retries}) exceeded")
-            self._handle_authentication_failure()
+            candidates = []
+        else:
+            candidates = self._refresh_candidates()
+
+        generation = self._credentials_generation
+        refresher = TokenRefresher(candidates, self.client_pool if check_first else None)
+        refresher.refresh_finished.connect(
+            lambda outcome, ytmusic, client_factory:
+                self._on_token_refresh_finished(generation, outcome, ytmusic, client_factory))
+        return refresher
+
+    def _refresh_candidates(self) -> List[Tuple[str, Callable[[], YTMusic]]]:
+        """Client factories to try for a token refresh, best first"""
+        candidates = []
+
+        # Method 1: Regenerate SAPISIDHASH with a new timestamp from the stored headers
+        if self.last_auth_headers and self.auth_session:
+            authorization_header = sapisid_authorization(self.last_auth_headers.get('Cookie', ''))
+            if authorization_header:
+                self.auth_session.headers['Authorization'] = authorization_header
+                candidates.append(("stored headers",
+                                   partial(build_client, headers=dict(self.auth_session.headers))))
+
+        # Method 2: Reload from the auth file
+        if os.path.exists(self.auth_file_path):
+            candidates.append(("saved auth file", partial(build_client, auth=self.auth_file_path)))
+
+        # Method 3: Recreate the client with the existing session's cookies
+        if self.auth_session:
+            candidates.append(("existing session",
+                               partial(build_client, headers=dict(self.auth_session.headers))))
+
+        return candidates
+
+    def _on_token_refresh_finished(self, generation: int, outcome: str, ytmusic: Optional[YTMusic],
+                                   client_factory: Optional[Callable[[], YTMusic]]):
+        """Apply the outcome of a token refresh"""
+        if generation != self._credentials_generation:
+            # Logged in or out while the refresh ran; its outcome no longer applies
+            self.token_refresh_finished.emit(self.is_authenticated)
             return
 
-        self.auth_retry_count += 1
-        print(f"🔧 Attempting authentication refresh (attempt {self.auth_retry_count}/{self.max_auth_retries})...")
-
-        try:
-            # Method 1: Try to regenerate authentication from stored headers
-            if self.last_auth_headers:
-                print("🔧 Refreshing using stored headers...")
-                if self._refresh_from_headers():
-                    print("✅ Token refresh successful using stored headers")
-                    return
-
-            # Method 2: Try to reload from auth file
-            if os.path.exists(self.auth_file_path):
-                print("🔧 Refreshing using saved auth file...")
-                if self._refresh_from_auth_file():
-                    print("✅ Token refresh successful using auth file")
-                    return
-
-            # Method 3: Try to recreate session with existing cookies
-            if self.auth_session:
-                print("🔧 Refreshing using existing session...")
-                if self._refresh_from_session():
-                    print("✅ Token refresh successful using session")
-                    return
-
+        if outcome == TokenRefresher.HEALTHY:
+            self.auth_retry_count = 0  # Reset retry count on success
+            self._record_verified()
+        elif outcome == TokenRefresher.REFRESHED:
+            self.auth_retry_count += 1
+            self._set_client(ytmusic, client_factory)
+            self._record_verified()
+        elif outcome == TokenRefresher.FAILED:
             print("⚠️  All refresh methods failed")
             self._handle_authentication_failure()
 
-        except Exception as e:
-            print(f"❌ Token refresh failed: {e}")
-            self._handle_authentication_failure()
-
-    def _refresh_from_headers(self) -> bool:
-        """Try to refresh authentication using stored headers"""
-        try:
-            if not self.last_auth_headers:
-                return False
-
-            # Regenerate SAPISIDHASH with new timestamp
-            import hashlib
-            cookie_header = self.last_auth_headers.get('Cookie', '')
-
-            # Extract SAPISID for new hash
-            sapisid = None
-            for cookie in cookie_header.split(';'):
-                cookie = cookie.strip()
-                if cookie.startswith('SAPISID='):
-                    sapisid = cookie.split('=', 1)[1]
-                    break
-
-            if sapisid:
-                # Generate new SAPISIDHASH with current timestamp
-                timestamp = str(int(time.time()))
-                origin = "https://music.youtube.com"
-                hash_string = f"{timestamp} {sapisid} {origin}"
-                sapisidhash = hashlib.sha1(hash_string.encode()).hexdigest()
-                authorization_header = f"SAPISIDHASH {timestamp}_{sapisidhash}"
-
-                # Update session headers
-                if self.auth_session:
-                    self.auth_session.headers['Authorization'] = authorization_header
-
-                print("✅ Generated fresh SAPISIDHASH")
-
-                # Test the refreshed authentication
-                test_ytmusic = YTMusic(requests_session=self.auth_session)
-                test_playlists = test_ytmusic.get_library_playlists(limit=1)
-
-                # Update YTMusic instance if successful
-                self.ytmusic = test_ytmusic
-                self.last_auth_time = time.time()
-                return True
-
-        except Exception as e:
-            print(f"Header refresh failed: {e}")
-
-        return False
-
-    def _refresh_from_auth_file(self) -> bool:
-        """Try to refresh authentication using saved auth file"""
-        try:
-            # Recreate YTMusic from auth file
-            new_ytmusic = YTMusic(self.auth_file_path)
-            test_playlists = new_ytmusic.get_library_playlists(limit=1)
-
-            # Update YTMusic instance if successful
-            self.ytmusic = new_ytmusic
-            self.last_auth_time = time.time()
-            return True
-
-        except Exception as e:
-            print(f"Auth file refresh failed: {e}")
-
-        return False
-
-    def _refresh_from_session(self) -> bool:
-        """Try to refresh authentication using existing session"""
-        try:
-            # Recreate YTMusic with existing session
-            new_ytmusic = YTMusic(requests_session=self.auth_session)
-            test_playlists = new_ytmusic.get_library_playlists(limit=1)
-
-            # Update YTMusic instance if successful
-            self.ytmusic = new_ytmusic
-            self.last_auth_time = time.time()
-            return True
-
-        except Exception as e:
-            print(f"Session refresh failed: {e}")
-
-        return False
+        self.token_refresh_finished.emit(self.is_authenticated)
 
     def _handle_authentication_failure(self):
         """Handle authentication failure by falling back to unauthenticated mode"""
@@ -647,32 +691,67 @@ class AuthenticationManager(QObject):
         self.init_unauthenticated()
         self.auth_status_changed.emit(False)
 
+    @tracing.traced(category="auth")
     def force_token_refresh(self) -> bool:
         """Manually force a token refresh (useful for testing or when user reports issues)"""
         print("🔧 Manual token refresh requested...")
-        self.auth_retry_count = 0  # Reset retry count for manual refresh
-        self._attempt_token_refresh()
+        # Runs in the calling thread; the GUI uses start_token_refresh()
+        self._create_token_refresher(check_first=False).run()
         return self.is_authenticated
 
     def load_saved_auth(self) -> bool:
-        """Load previously saved authentication data"""
+        """
+        Load previously saved authentication data.
+
+        Saved credentials are trusted right away, so startup never waits for
+        the network. Unless they worked within AUTH_RECHECK_INTERVAL, a
+        background thread checks them with a short request timeout. Only a
+        confirmed authentication error logs out and removes them; timeouts,
+        network trouble and throttling keep the login.
+
+        Returns:
+            Whether saved credentials were loaded
+        """
         if not os.path.exists(self.auth_file_path):
             return False
+        if self.auth_validator is not None and self.auth_validator.isRunning():
+            return True
 
-        try:
-            # Test authentication with the saved file
-            test_ytmusic = YTMusic(self.auth_file_path)
-            test_ytmusic.get_library_playlists(limit=1)  # Test call
-
-            # If we get here, authentication worked
-            self.ytmusic = test_ytmusic
-            self.is_authenticated = True
+        self._set_client(None, partial(build_client, auth=self.auth_file_path))
+        self.is_authenticated = True
+        self.last_auth_time = self._read_last_verified()
+        self.user_info = {
+            'authenticated': True,
+            'auth_method': 'saved_auth_file',
+            'last_verified': self.last_auth_time,
+        }
+        self.auth_status_changed.emit(True)
 
-            self.auth_status_changed.emit(True)
+        if self.last_auth_time is not None and time.time() - self.last_auth_time < AUTH_RECHECK_INTERVAL:
+            print("✅ Using saved authentication (verified recently)")
             return True
 
-        except Exception as e:
-            print(f"Failed to load saved authentication: {e}")
+        print("🔍 Checking saved authentication in the background...")
+        generation = self._credentials_generation
+        self.auth_validator = SavedAuthValidator(
+            partial(build_client, auth=self.auth_file_path, timeout=AUTH_CHECK_TIMEOUT))
+        self.auth_validator.validation_finished.connect(
+            lambda valid, auth_error, error: self._on_saved_auth_validated(generation, valid, auth_error, error))
+        self.auth_validator.start()
+        return True
+
+    def _on_saved_auth_validated(self, generation: int, valid: bool, auth_error: bool, error: str):
+        """Apply the outcome of the background check of the saved credentials"""
+        if generation != self._credentials_generation:
+            # Logged in or out while the check ran; its outcome no longer applies
+            return
+
+        if valid:
+            print("✅ Saved authentication verified")
+            self._record_verified()
+            self.user_info['last_verified'] = self.last_auth_time
+        elif auth_error:
+            print(f"Failed to load saved authentication: {error}")
 
             # Remove invalid auth file
             try:
@@ -681,7 +760,31 @@ class AuthenticationManager(QObject):
                 pass
 
             self.init_unauthenticated()
-            return False
+        else:
+            print(f"⚠️  Could not verify saved authentication, keeping it: {error}")
+
+    def _read_last_verified(self) -> Optional[float]:
+        """When the saved auth file last worked, or None if unknown or the file changed since"""
+        try:
+            with open(self.auth_state_path) as f:
+                state = json.load(f)
+            last_verified = float(state['last_verified'])
+            if state.get('auth_file') != self.auth_file_path:
+                return None
+            if os.path.getmtime(self.auth_file_path) > last_verified:
+                return None
+            return last_verified
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _record_verified(self):
+        """Remember that the current credentials just worked"""
+        self.last_auth_time = time.time()
+        try:
+            with open(self.auth_state_path, 'w') as f:
+                json.dump({'auth_file': self.auth_file_path, 'last_verified': self.last_auth_time}, f)
+        except OSError as e:
+            print(f"⚠️  Could not save authentication state: {e}")
 
     def save_auth_data(self, auth_data: Dict[str, str]):
         """Save authentication data to file"""
@@ -708,6 +811,14 @@ class AuthenticationManager(QObject):
         self.auth_retry_count = 0
         self.auth_session = None
 
+        # Forget responses cached for this account
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            try:
+                response_cache.clear()
+            except Exception as e:
+                print(f"⚠️  Could not clear HTTP response cache: {e}")
+
         # Remove saved auth data
         try:
             if os.path.exists(self.auth_file_path):
@@ -720,6 +831,7 @@ class AuthenticationManager(QObject):
         self.init_unauthenticated()
         print("✅ Logout complete")
 
+    @tracing.traced(category="auth")
     def get_user_playlists(self) -> List[Dict[str, Any]]:
         """Get user's personal playlists (only works when authenticated) with automatic retry"""
         if not self.is_authenticated or not self.ytmusic:
@@ -730,11 +842,11 @@ class AuthenticationManager(QObject):
             print("🎵 Attempting to fetch user playlists...")
 
             # First try library playlists
-            playlists = self.ytmusic.get_library_playlists(limit=100)
-            print(f"✅ Found {len(playlists)} playlists in library")
+            formatted_playlists = self.service.list_library()
+            print(f"✅ Found {len(formatted_playlists)} playlists in library")
 
             # If library playlists is empty, try searching for user's own playlists
-            if not playlists:
+            if not formatted_playlists:
                 print("🔍 Library playlists empty, searching for user playlists...")
                 try:
                     # Get account info to find user details
@@ -752,34 +864,27 @@ class AuthenticationManager(QObject):
                                 user_playlists.append(item)
 
                     if user_playlists:
-                        playlists = user_playlists
-                        print(f"✅ Found {len(playlists)} playlists via search!")
+                        formatted_playlists = [format_playlist(playlist) for playlist in user_playlists]
+                        print(f"✅ Found {len(formatted_playlists)} playlists via search!")
 
                 except Exception as search_error:
                     print(f"⚠️ Search method failed: {search_error}")
 
-            formatted_playlists = []
-
-            for playlist in playlists:
-                formatted_playlists.append({
-                    'id': playlist.get('playlistId', ''),
-                    'title': playlist.get('title', 'Unknown Playlist'),
-                    'description': playlist.get('description', ''),
-                    'count': playlist.get('count', 0),
-                    'thumbnails': playlist.get('thumbnails', [])
-                })
-
             print(f"✅ Successfully fetched {len(formatted_playlists)} playlists")
             # Reset retry count on successful operation
             self.auth_retry_count = 0
             return formatted_playlists
 
         except Exception as e:
-            error_msg = str(e).lower()
             print(f"❌ Failed to get user playlists: {e}")
 
+            if is_rate_limit_error(e):
+                # Throttled, not logged out: new tokens would only add more requests
+                print("ℹ️  YouTube Music is rate limiting requests. Please try again in a minute.")
+                return []
+
             # Check for authentication-related errors and attempt refresh
-            if any(term in error_msg for term in ["authentication", "401", "unauthorized", "403", "forbidden", "invalid", "expired"]):
+            if is_auth_error(e):
                 print("🔧 Authentication issue detected, attempting automatic refresh...")
 
                 # Try automatic token refresh
@@ -787,17 +892,7 @@ class AuthenticationManager(QObject):
                     # Retry the operation after successful refresh
                     try:
                         print("🔄 Retrying playlist fetch after token refresh...")
-                        playlists = self.ytmusic.get_library_playlists(limit=100)
-                        formatted_playlists = []
-
-                        for playlist in playlists:
-                            formatted_playlists.append({
-                                'id': playlist.get('playlistId', ''),
-                                'title': playlist.get('title', 'Unknown Playlist'),
-                                'description': playlist.get('description', ''),
-                                'count': playlist.get('count', 0),
-                                'thumbnails': playlist.get('thumbnails', [])
-                            })
+                        formatted_playlists = self.service.list_library()
 
                         print(f"✅ Retry successful! Got {len(formatted_playlists)} playlists after refresh")
                         return formatted_playlists
@@ -815,9 +910,17 @@ class AuthenticationManager(QObject):
         """Get the YTMusic instance (works for both authenticated and unauthenticated)"""
         return self.ytmusic
 
+    def get_client_pool(self) -> YTMusicClientPool:
+        """Get the pool that background workers lease their YTMusic clients from"""
+        return self.client_pool
+
+    def get_service(self) -> PlaylistService:
+        """Get the playlist service that fetches with the current credentials"""
+        return self.service
+
     def can_access_personal_content(self) -> bool:
         """Check if we can access personal content"""
-        return self.is_authenticated and self.ytmusic is not None
+        return self.is_authenticated and self.client_pool.available
 
     def get_auth_status_info(self) -> Dict[str, Any]:
         """Get detailed authentication status information"""
@@ -842,5 +945,6 @@ class AuthenticationManager(QObject):
     def refresh_authentication_status(self) -> bool:
         """Manually trigger an authentication health check and refresh if needed"""
         if self.is_authenticated:
-            self._check_authentication_health()
+            # Runs in the calling thread; the GUI uses start_token_refresh(check_first=True)
+            self._create_token_refresher(check_first=True).run()
         return self.is_authenticated
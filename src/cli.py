@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+PlaylistCat command line
+Fetches, exports and edits playlists for scripted batch jobs without Qt or a
+display server, using the credentials saved by the GUI login
+
+Usage:
+    playlistcat-cli fetch PLAYLIST [--output FILE] [--format FORMAT] [--no-cache]
+    playlistcat-cli export [PLAYLIST ...] --output FILE [--format FORMAT]
+    playlistcat-cli list-library [--json]
+    playlistcat-cli remove PLAYLIST SET_VIDEO_ID [SET_VIDEO_ID ...]
+"""
+
+import os
+import sys
+import json
+import argparse
+from typing import Optional, Dict, List, Any
+
+# Add the src directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import extract_playlist_id
+from core import PlaylistService, default_auth_file_path, saved_client_pool
+from exporters import WRITERS, open_writer, format_for_path, export_cached_library
+from playlist_cache import PlaylistCache
+
+
+def status(message: str):
+    """Report progress on stderr, keeping stdout for data"""
+    print(message, file=sys.stderr)
+
+
+def parse_playlist_id(value: str) -> str:
+    """Accept a playlist ID or URL on the command line"""
+    playlist_id = extract_playlist_id(value)
+    if not playlist_id:
+        raise argparse.ArgumentTypeError(f"not a playlist ID or URL: {value}")
+    return playlist_id
+
+
+def open_cache() -> Optional[PlaylistCache]:
+    """Open the playlist cache shared with the GUI, or None if it is unavailable"""
+    try:
+        return PlaylistCache()
+    except Exception as e:
+        status(f"⚠️  Playlist cache unavailable: {e}")
+        return None
+
+
+def signed_in_service(args) -> PlaylistService:
+    """Playlist service for commands that need a logged-in account"""
+    auth_file = args.auth or default_auth_file_path()
+    if not os.path.exists(auth_file):
+        raise RuntimeError(f"Not logged in: log in once with the PlaylistCat window, "
+                           f"or pass --auth with a browser auth file ({auth_file} not found)")
+    return PlaylistService(saved_client_pool(auth_file))
+
+
+def fetch_playlist(service: PlaylistService, playlist_id: str, cache: Optional[PlaylistCache],
+                   writer=None) -> Dict[str, Any]:
+    """
+    Fetch a playlist page by page into the cache and an optional export writer.
+
+    Nothing but the current page is held in memory. The cached copy is only
+    replaced once every page has arrived.
+
+    Returns:
+        Dictionary with the playlist title and number of tracks
+    """
+    staging_id = cache.begin_staged_tracks(playlist_id) if cache is not None else None
+    title = None
+    loaded = total = 0
+    received_page = False
+    try:
+        # Batch jobs want the current playlist, so cached responses are revalidated
+        for page in service.iter_playlist_pages(playlist_id, revalidate=True):
+            received_page = True
+            title = page.get('title') or title
+            total = page.get('track_count') or total
+            if staging_id is not None:
+                cache.append_staged_tracks(staging_id, page['tracks'])
+            if writer is not None:
+                writer.write(page['tracks'], playlist_id)
+            loaded += len(page['tracks'])
+            status(f"Loaded {loaded} of {total} tracks..." if total else f"Loaded {loaded} tracks...")
+
+        if not received_page:
+            raise RuntimeError("Playlist not found or is private")
+
+        if staging_id is not None:
+            cache.commit_staged_tracks(staging_id, playlist_id, title)
+            staging_id = None
+    finally:
+        if staging_id is not None:
+            cache.discard_staged_tracks(staging_id)
+
+    return {'title': title, 'tracks': loaded}
+
+
+def command_fetch(args) -> int:
+    cache = None if args.no_cache else open_cache()
+    writer = partial_path = None
+    if args.output:
+        # Export next to the output and only replace it once every page has
+        # arrived, so a failed or interrupted fetch leaves the old file alone
+        directory, name = os.path.split(os.path.abspath(args.output))
+        partial_path = os.path.join(directory, f".{name}.{os.getpid()}.part")
+        writer = open_writer(partial_path, args.format or format_for_path(args.output))
+
+    completed = False
+    try:
+        result = fetch_playlist(PlaylistService(saved_client_pool(args.auth)), args.playlist, cache, writer)
+        completed = True
+    finally:
+        if writer is not None:
+            try:
+                writer.close()
+                if completed:
+                    os.replace(partial_path, args.output)
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+
+    status(f"✅ Fetched {result['tracks']} tracks of '{result['title'] or args.playlist}'")
+    if args.output:
+        status(f"💾 Exported to {args.output}")
+    return 0
+
+
+def command_export(args) -> int:
+    cache = open_cache()
+    if cache is None:
+        return 1
+
+    missing = [playlist_id for playlist_id in args.playlists if cache.get_info(playlist_id) is None]
+    if missing:
+        status(f"❌ Not cached, fetch first: {', '.join(missing)}")
+        return 1
+
+    summary = export_cached_library(cache, args.output, args.format, args.playlists or None)
+    status(f"💾 Exported {summary['tracks']} tracks from {summary['playlists']} playlists to {args.output}")
+    return 0
+
+
+def command_list_library(args) -> int:
+    count = 0
+    for page in signed_in_service(args).iter_library(revalidate=True):
+        for playlist in page:
+            if args.json:
+                print(json.dumps({key: playlist[key] for key in ('id', 'title', 'count')},
+                                 ensure_ascii=False))
+            else:
+                print(f"{playlist['id']}\t{playlist['count']}\t{playlist['title']}")
+            count += 1
+
+    status(f"✅ Found {count} playlists")
+    return 0
+
+
+def command_remove(args) -> int:
+    service = signed_in_service(args)
+    cache = open_cache()
+    if cache is None:
+        return 1
+
+    # Removal needs the video ID of every entry; the cached copy has them
+    if cache.get_info(args.playlist) is None:
+        status("Playlist not cached, fetching it first...")
+        fetch_playlist(service, args.playlist, cache)
+
+    wanted = set(args.set_video_ids)
+    tracks = [track for track in cache.iter_tracks(args.playlist) if track.set_video_id in wanted]
+    unknown = wanted - {track.set_video_id for track in tracks}
+    if unknown:
+        status(f"❌ Not in the playlist (refetch it if it changed): {', '.join(sorted(unknown))}")
+        return 1
+
+    result = service.remove_items(args.playlist, tracks)
+
+    removed = result['removed']
+    if removed:
+        cache.remove_tracks(args.playlist, [track.set_video_id for track in removed])
+    for track, error in result['failed']:
+        status(f"❌ Could not remove '{track.title}' ({track.set_video_id}): {error}")
+    status(f"✅ Removed {len(removed)} of {len(tracks)} tracks")
+    return 0 if not result['failed'] else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="playlistcat-cli",
+        description="Fetch, export and edit YouTube Music playlists without the GUI")
+    parser.add_argument("--auth", metavar="FILE",
+                        help="Browser auth file (default: the login saved by the PlaylistCat window)")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+    formats = ", ".join(WRITERS)
+
+    fetch = commands.add_parser("fetch", help="Fetch a playlist into the local cache")
+    fetch.add_argument("playlist", type=parse_playlist_id, help="Playlist ID or URL")
+    fetch.add_argument("-o", "--output", metavar="FILE",
+                       help="Also export the tracks to FILE as they arrive")
+    fetch.add_argument("--format", choices=list(WRITERS),
+                       help=f"Export format ({formats}; default: from the file extension)")
+    fetch.add_argument("--no-cache", action="store_true", help="Don't update the local playlist cache")
+    fetch.set_defaults(handler=command_fetch)
+
+    export = commands.add_parser("export", help="Export cached playlists to one file")
+    export.add_argument("playlists", type=parse_playlist_id, nargs="*", metavar="PLAYLIST",
+                        help="Playlists to export (default: every cached playlist)")
+    export.add_argument("-o", "--output", metavar="FILE", required=True, help="File to write")
+    export.add_argument("--format", choices=list(WRITERS),
+                        help=f"Export format ({formats}; default: from the file extension)")
+    export.set_defaults(handler=command_export)
+
+    list_library = commands.add_parser("list-library", help="List the playlists in your library")
+    list_library.add_argument("--json", action="store_true", help="Print one JSON object per playlist")
+    list_library.set_defaults(handler=command_list_library)
+
+    remove = commands.add_parser("remove", help="Remove tracks from a playlist on the server")
+    remove.add_argument("playlist", type=parse_playlist_id, help="Playlist ID or URL")
+    remove.add_argument("set_video_ids", nargs="+", metavar="SET_VIDEO_ID",
+                        help="Playlist entry IDs of the tracks to remove, as exported")
+    remove.set_defaults(handler=command_remove)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        status("Interrupted")
+        return 130
+    except Exception as e:
+        status(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
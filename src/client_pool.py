@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Pool of YTMusic clients for background workers
+Gives every concurrent worker its own YTMusic instance built from the current
+credentials, and switches all future leases to new credentials atomically
+when authentication is refreshed
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Optional, Callable, Iterator, List, Dict
+
+from ytmusicapi import YTMusic
+
+from http_session import create_session
+
+# Clients alive at the same time, leased or idle
+DEFAULT_POOL_SIZE = 8
+
+
+def build_client(auth: Optional[str] = None, headers: Optional[Dict[str, str]] = None,
+                 timeout: Optional[float] = None) -> YTMusic:
+    """
+    Build a YTMusic client that sends through the shared connection pool.
+
+    Args:
+        auth: Optional path to a browser auth file
+        headers: Optional headers for the client's own requests session
+        timeout: Seconds each request may take; the session default if None
+
+    Returns:
+        New YTMusic instance with a session of its own
+    """
+    return YTMusic(auth, requests_session=create_session(headers, timeout))
+
+
+class YTMusicClientPool:
+    """Thread-safe pool of YTMusic clients sharing one set of credentials
+
+    YTMusic instances are not meant to be used from several threads at
+    once, so workers lease a client for a unit of work and hand it back
+    afterwards. Clients are built lazily by a factory; swap() installs a
+    new factory (e.g. after a token refresh). Leases taken before the swap
+    finish their work with the old client, which is discarded when it is
+    returned, and every later lease gets a client with the new credentials.
+    """
+
+    def __init__(self, factory: Optional[Callable[[], YTMusic]] = None,
+                 max_size: int = DEFAULT_POOL_SIZE):
+        self.max_size = max_size
+        self._factory = factory
+        self._generation = 0
+        self._idle: List[YTMusic] = []
+        self._leased = 0
+        self._condition = threading.Condition()
+
+    def swap(self, factory: Optional[Callable[[], YTMusic]]):
+        """Switch the pool to new credentials; None leaves it without a client"""
+        with self._condition:
+            self._factory = factory
+            self._generation += 1
+            self._idle = []
+            self._condition.notify_all()
+
+    @property
+    def available(self) -> bool:
+        """Whether the pool can hand out clients"""
+        return self._factory is not None
+
+    @contextmanager
+    def lease(self) -> Iterator[YTMusic]:
+        """
+        Borrow a client for the duration of a with block.
+
+        Blocks while max_size clients are leased.
+
+        Raises:
+            RuntimeError: If the pool has no credentials to build clients from
+        """
+        with self._condition:
+            while True:
+                if self._factory is None:
+                    raise RuntimeError("No YouTube Music client available")
+                if self._idle or self._leased < self.max_size:
+                    break
+                self._condition.wait()
+
+            client = self._idle.pop() if self._idle else None
+            factory = self._factory
+            generation = self._generation
+            self._leased += 1
+
+        try:
+            if client is None:
+                client = factory()
+            yield client
+        finally:
+            with self._condition:
+                self._leased -= 1
+                # Clients built from replaced credentials are dropped
+                if client is not None and generation == self._generation:
+                    self._idle.append(client)
+                self._condition.notify()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Qt-free core of PlaylistCat
+Saved credentials, request signing and PlaylistService, the fetch/list/remove
+API that the GUI workers and the command line share. Importable without
+PyQt6 or a display, e.g. to embed PlaylistCat in another service
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Dict, List, Any, Iterator, AsyncIterator
+
+import tracing
+from client_pool import YTMusicClientPool, build_client
+from playlist_pages import iter_playlist_pages, iter_library_playlist_pages
+from playlist_edits import remove_playlist_tracks
+from response_cache import revalidating
+from utils import Track, normalize_track, format_playlist
+
+# Saved browser credentials, written by the GUI login
+AUTH_FILE_NAME = ".playlistcat_auth.json"
+# Origin signed into SAPISIDHASH authorization headers
+YTMUSIC_ORIGIN = "https://music.youtube.com"
+
+
+def default_auth_file_path() -> str:
+    """Path of the saved browser credentials"""
+    return os.path.join(os.path.expanduser("~"), AUTH_FILE_NAME)
+
+
+def saved_client_pool(auth_file: Optional[str] = None) -> YTMusicClientPool:
+    """
+    Build a client pool from saved credentials, without checking them.
+
+    Args:
+        auth_file: Browser auth file; the GUI's saved login if None
+
+    Returns:
+        Pool signed in with the auth file if it exists, unauthenticated otherwise
+    """
+    auth_file = auth_file or default_auth_file_path()
+    if os.path.exists(auth_file):
+        return YTMusicClientPool(partial(build_client, auth=auth_file))
+    return YTMusicClientPool(build_client)
+
+
+def revalidating_pages(pages: Iterator, revalidate: bool) -> Iterator:
+    """
+    Iterate lazily fetched pages, revalidating cached responses if asked.
+
+    revalidating() holds for each page request only, never across a yield,
+    so requests the caller makes while the iteration is suspended keep
+    using the cache normally.
+    """
+    try:
+        while True:
+            with revalidating(revalidate):
+                page = next(pages, None)
+            if page is None:
+                return
+            yield page
+    finally:
+        close = getattr(pages, 'close', None)
+        if close is not None:
+            close()
+
+
+def iter_track_pages(ytmusic, playlist_id: str, continuation: Optional[str] = None,
+                     position: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Fetch a playlist page by page and normalize its tracks.
+
+    Each page is a dictionary with:
+    - tracks: normalized Track records of this page
+    - position: playlist items consumed up to the end of this page
+    - continuation: token to pass back in to resume after this page, or None
+    - track_count: track count reported by the playlist header (first page only)
+    - title: playlist title (first page only)
+
+    Args:
+        ytmusic: YTMusic instance to fetch with
+        playlist_id: Playlist to fetch
+        continuation: Resume from this continuation token instead of the start
+        position: Playlist items consumed before the continuation
+    """
+    # Page spans cover the request and ytmusicapi's parsing; the network
+    # part shows up as a nested HTTP span
+    pages = iter_playlist_pages(ytmusic, playlist_id, continuation)
+    for page in tracing.trace_iter(pages, "Fetch playlist page", "fetch"):
+        tracks = []
+        with tracing.span("Normalize tracks", "processing", tracks=len(page['tracks'])):
+            for track in page['tracks']:
+                position += 1
+                if track is None:
+                    continue
+
+                # Extract track information and precompute collation keys once
+                tracks.append(normalize_track(track, position))
+
+        yield dict(page, tracks=tracks, position=position)
+
+
+def sapisid_authorization(cookie_header: str, timestamp: Optional[int] = None) -> Optional[str]:
+    """
+    Build the SAPISIDHASH Authorization header of browser requests.
+
+    ytmusicapi only treats browser credentials as such when they carry this
+    header (see https://github.com/sigma67/ytmusicapi/issues/781).
+
+    Args:
+        cookie_header: Cookie header of the browser session
+        timestamp: Unix time to sign; now if None
+
+    Returns:
+        'SAPISIDHASH {timestamp}_{hash}', or None without a SAPISID cookie
+    """
+    sapisid = None
+    for cookie in cookie_header.split(';'):
+        cookie = cookie.strip()
+        if cookie.startswith('SAPISID='):
+            sapisid = cookie.split('=', 1)[1]
+            break
+    if not sapisid:
+        return None
+
+    timestamp = str(int(time.time() if timestamp is None else timestamp))
+    digest = hashlib.sha1(f"{timestamp} {sapisid} {YTMUSIC_ORIGIN}".encode()).hexdigest()
+    return f"SAPISIDHASH {timestamp}_{digest}"
+
+
+class PlaylistService:
+    """Plain-Python API for fetching and editing playlists
+
+    The GUI workers and the command line are built on this class, and it
+    can be used on its own without Qt or an event loop. It is thread-safe:
+    every call leases its own YTMusic client from the pool, so one service
+    can be shared by any number of threads. The *_async methods run the
+    same calls on worker threads for asyncio code.
+    """
+
+    def __init__(self, client_pool: Optional[YTMusicClientPool] = None):
+        """
+        Args:
+            client_pool: Pool to lease clients from; the saved login if None
+        """
+        self.client_pool = client_pool if client_pool is not None else saved_client_pool()
+
+    @property
+    def available(self) -> bool:
+        """Whether the service has credentials (or anonymous access) to fetch with"""
+        return self.client_pool.available
+
+    def iter_playlist_pages(self, playlist_id: str, continuation: Optional[str] = None,
+                            position: int = 0, revalidate: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch a playlist page by page, see iter_track_pages for the pages.
+
+        A client stays leased until the iteration ends, so close the
+        generator when stopping early.
+
+        Args:
+            playlist_id: Playlist to fetch
+            continuation: Resume from this continuation token instead of the start
+            position: Playlist items consumed before the continuation
+            revalidate: Revalidate responses in the HTTP response cache
+        """
+        with self.client_pool.lease() as ytmusic:
+            pages = iter_track_pages(ytmusic, playlist_id, continuation, position)
+            yield from revalidating_pages(pages, revalidate)
+
+    def get_playlist(self, playlist_id: str, revalidate: bool = False) -> Dict[str, Any]:
+        """
+        Fetch a whole playlist.
+
+        Returns:
+            Dictionary with id, title, track_count (as reported by the
+            playlist, 0 if unknown) and tracks (normalized Track records)
+
+        Raises:
+            LookupError: If the playlist does not exist or is private
+        """
+        playlist = {'id': playlist_id, 'title': None, 'track_count': 0, 'tracks': []}
+        found = False
+        for page in self.iter_playlist_pages(playlist_id, revalidate=revalidate):
+            found = True
+            playlist['title'] = page.get('title') or playlist['title']
+            playlist['track_count'] = page.get('track_count') or playlist['track_count']
+            playlist['tracks'].extend(page['tracks'])
+        if not found:
+            raise LookupError("Playlist not found or is private")
+        return playlist
+
+    def iter_library(self, revalidate: bool = False) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through the signed-in account's library playlists.
+
+        Yields:
+            Lists of playlist records (see utils.format_playlist), one per page
+        """
+        with self.client_pool.lease() as ytmusic:
+            pages = tracing.trace_iter(iter_library_playlist_pages(ytmusic), "Fetch library page", "fetch")
+            for page in revalidating_pages(pages, revalidate):
+                yield [format_playlist(playlist) for playlist in page]
+
+    def list_library(self, revalidate: bool = False) -> List[Dict[str, Any]]:
+        """Get all playlists in the signed-in account's library"""
+        playlists = []
+        for page in self.iter_library(revalidate):
+            playlists.extend(page)
+        return playlists
+
+    def remove_items(self, playlist_id: str, tracks: List[Track]) -> Dict[str, Any]:
+        """
+        Remove tracks from a playlist on the server, see remove_playlist_tracks.
+
+        Returns:
+            Dictionary with removed (tracks) and failed ((track, error message) tuples)
+        """
+        with self.client_pool.lease() as ytmusic:
+            return remove_playlist_tracks(ytmusic, playlist_id, tracks)
+
+    async def _run_async(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(function, *args, **kwargs))
+
+    async def get_playlist_async(self, playlist_id: str, revalidate: bool = False) -> Dict[str, Any]:
+        """Async version of get_playlist"""
+        return await self._run_async(self.get_playlist, playlist_id, revalidate)
+
+    async def list_library_async(self, revalidate: bool = False) -> List[Dict[str, Any]]:
+        """Async version of list_library"""
+        return await self._run_async(self.list_library, revalidate)
+
+    async def remove_items_async(self, playlist_id: str, tracks: List[Track]) -> Dict[str, Any]:
+        """Async version of remove_items"""
+        return await self._run_async(self.remove_items, playlist_id, tracks)
+
+    async def iter_playlist_pages_async(self, playlist_id: str, continuation: Optional[str] = None,
+                                        position: int = 0,
+                                        revalidate: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of iter_playlist_pages; pages are fetched one at a time as they are awaited"""
+        # The page generator holds a client lease and thread-local revalidation,
+        # so it is advanced and closed on one thread of its own
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playlistcat-pages")
+        pages = self.iter_playlist_pages(playlist_id, continuation, position, revalidate)
+        try:
+            while True:
+                page = await loop.run_in_executor(executor, next, pages, None)
+                if page is None:
+                    return
+                yield page
+        finally:
+            await loop.run_in_executor(executor, pages.close)
+            executor.shutdown(wait=False)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Streaming export of playlist tracks for analytics
+Writes normalized tracks as JSONL, CSV, Parquet or Arrow one page at a time,
+so a playlist or a whole cached library is exported without holding it in
+memory. Parquet and Arrow need the optional pyarrow package
+"""
+
+import os
+import abc
+import csv
+import json
+import importlib.util
+from typing import Optional, Dict, List, Any, Iterable, Tuple
+
+# pyarrow takes a while to import, so it is only loaded by the first
+# Parquet or Arrow export
+ARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+pyarrow = None
+
+from utils import Track
+
+# Columns of every export, in order
+EXPORT_FIELDS = ('playlist_id', 'position', 'artist', 'title', 'video_id', 'set_video_id')
+# File extension -> export format
+EXPORT_EXTENSIONS = {
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+# Rows collected before the columnar writers emit a row group / record batch
+COLUMNAR_BATCH_ROWS = 65536
+
+
+def _import_arrow():
+    """Import pyarrow and the modules the columnar writers use"""
+    global pyarrow
+    if pyarrow is None:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    return pyarrow
+
+
+def export_row(track: Track, playlist_id: str) -> Tuple:
+    """Get the exported values of a track, in EXPORT_FIELDS order"""
+    return (playlist_id, track.position, track.artist, track.title, track.video_id, track.set_video_id)
+
+
+class TrackWriter(abc.ABC):
+    """Base class of the streaming track writers
+
+    Tracks are passed to write() a page at a time; the file is complete
+    once close() has been called. Writers are context managers.
+    Subclasses implement _write_rows().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+
+    def write(self, tracks: Iterable[Track], playlist_id: str = ''):
+        """
+        Append a page of tracks to the export.
+
+        Args:
+            tracks: Normalized tracks, e.g. a page from PlaylistFetcher.tracks_ready
+            playlist_id: Playlist the tracks belong to
+        """
+        rows = [export_row(track, playlist_id) for track in tracks]
+        if rows:
+            self._write_rows(rows)
+            self.count += len(rows)
+
+    @abc.abstractmethod
+    def _write_rows(self, rows: List[Tuple]):
+        """Write rows in EXPORT_FIELDS order"""
+
+    def close(self):
+        """Finish the file"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class JsonlTrackWriter(TrackWriter):
+    """Writes one JSON object per track and line"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, 'w', encoding='utf-8', newline='\n')
+
+    def _write_rows(self, rows: List[Tuple]):
+        self._file.writelines(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + '\n'
+                              for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+class CsvTrackWriter(TrackWriter):
+    """Writes a CSV file with a header row"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(EXPORT_FIELDS)
+
+    def _write_rows(self, rows: List[Tuple]):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _ColumnarTrackWriter(TrackWriter):
+    """Collects rows into columns and hands them to pyarrow in large batches
+
+    Subclasses open the file and implement _write_batch().
+    """
+
+    def __init__(self, path: str):
+        if not ARROW_AVAILABLE:
+            raise RuntimeError("Parquet and Arrow export need pyarrow: pip install pyarrow")
+        _import_arrow()
+        super().__init__(path)
+        self.schema = pyarrow.schema([
+            ('playlist_id', pyarrow.string()),
+            ('position', pyarrow.int64()),
+            ('artist', pyarrow.string()),
+            ('title', pyarrow.string()),
+            ('video_id', pyarrow.string()),
+            ('set_video_id', pyarrow.string()),
+        ])
+        self._rows: List[Tuple] = []
+
+    def _write_rows(self, rows: List[Tuple]):
+        self._rows.extend(rows)
+        if len(self._rows) >= COLUMNAR_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        columns = [pyarrow.array(column, type=field.type)
+                   for column, field in zip(zip(*self._rows), self.schema)]
+        self._write_batch(pyarrow.RecordBatch.from_arrays(columns, schema=self.schema))
+        self._rows = []
+
+    @abc.abstractmethod
+    def _write_batch(self, batch):
+        """Write a pyarrow.RecordBatch to the file"""
+
+
+class ParquetTrackWriter(_ColumnarTrackWriter):
+    """Writes a Parquet file, one row group per batch"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch)
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+class ArrowTrackWriter(_ColumnarTrackWriter):
+    """Writes an Arrow IPC (Feather v2) file"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._sink = pyarrow.OSFile(path, 'wb')
+        self._writer = pyarrow.ipc.new_file(self._sink, self.schema)
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch)
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+        self._sink.close()
+
+
+WRITERS = {
+    'jsonl': JsonlTrackWriter,
+    'csv': CsvTrackWriter,
+    'parquet': ParquetTrackWriter,
+    'arrow': ArrowTrackWriter,
+}
+
+
+def format_for_path(path: str) -> Optional[str]:
+    """Guess the export format from a file name, or None if the extension is unknown"""
+    return EXPORT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def open_writer(path: str, export_format: Optional[str] = None) -> TrackWriter:
+    """
+    Create a writer for an export file.
+
+    Args:
+        path: File to write
+        export_format: One of WRITERS; guessed from the extension if None
+
+    Returns:
+        TrackWriter to write pages of tracks to
+
+    Raises:
+        ValueError: If the format is unknown
+        RuntimeError: If the format needs pyarrow and it is not installed
+    """
+    export_format = export_format or format_for_path(path)
+    if export_format not in WRITERS:
+        raise ValueError(f"Unknown export format for {path}; use one of: {', '.join(WRITERS)}")
+    return WRITERS[export_format](path)
+
+
+def write_paged(writer: TrackWriter, tracks: Iterable[Track], playlist_id: str = '',
+                page_size: int = 1000):
+    """Feed a stream of tracks to a writer page_size tracks at a time"""
+    page = []
+    for track in tracks:
+        page.append(track)
+        if len(page) >= page_size:
+            writer.write(page, playlist_id)
+            page = []
+    writer.write(page, playlist_id)
+
+
+def export_tracks(path: str, tracks: Iterable[Track], playlist_id: str = '',
+                  export_format: Optional[str] = None, page_size: int = 1000) -> int:
+    """
+    Export a sequence of tracks, writing them a page at a time.
+
+    Returns:
+        Number of tracks written
+    """
+    with open_writer(path, export_format) as writer:
+        write_paged(writer, tracks, playlist_id, page_size)
+    return writer.count
+
+
+def export_cached_library(cache, path: str, export_format: Optional[str] = None,
+                          playlist_ids: Optional[Iterable[str]] = None,
+                          page_size: int = 1000) -> Dict[str, Any]:
+    """
+    Export every playlist in the playlist cache into one file.
+
+    Tracks are streamed from the cache, so memory use does not grow with
+    the size of the library.
+
+    Args:
+        cache: PlaylistCache to read from
+        path: File to write
+        export_format: One of WRITERS; guessed from the extension if None
+        playlist_ids: Playlists to export; all cached playlists if None
+        page_size: Tracks written at a time
+
+    Returns:
+        Dictionary with the number of playlists and tracks written
+    """
+    if playlist_ids is None:
+        playlist_ids = [info['playlist_id'] for info in cache.cached_playlists()]
+
+    playlists = 0
+    with open_writer(path, export_format) as writer:
+        for playlist_id in playlist_ids:
+            write_paged(writer, cache.iter_tracks(playlist_id), playlist_id, page_size)
+            playlists += 1
+    return {'playlists': playlists, 'tracks': writer.count}
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Stand-in YouTube Music backend for offline testing and benchmarking
+Answers InnerTube requests from synthetic playlists kept in memory, with
+continuation paging, optional latency and injected 429 responses, so the
+playlist fetch, library, authentication and removal code can be run and
+timed deterministically on a machine with no network. install() routes every
+session created by http_session afterwards to the stand-in instead of
+music.youtube.com; the real YTMusic client, request governor and response
+cache are exercised unchanged
+"""
+
+import os
+import gzip
+import json
+import time
+import random
+import tempfile
+import threading
+from typing import Optional, Dict, List, Any, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from http_session import set_transport
+from response_cache import ResponseCache, set_response_cache
+
+# Tracks per playlist page and playlists per library page, as served by YouTube Music
+PAGE_SIZE = 100
+LIBRARY_PAGE_SIZE = 25
+# Distinct artists the synthetic tracks are spread over
+ARTIST_COUNT = 300
+VISITOR_ID = "CgtGYWtlVmlzaXRvcg%3D%3D"
+
+API_PREFIX = "/youtubei/v1/"
+LIBRARY_BROWSE_ID = "FEmusic_liked_playlists"
+
+# Response cache and its directory while a fake backend is installed, and the cache it replaced
+_installed: Optional[Dict[str, Any]] = None
+
+
+def fake_browser_headers() -> Dict[str, str]:
+    """
+    Get browser headers for a signed-in fake account.
+
+    They pass AuthenticationManager.authenticate_with_headers() and, dumped
+    to JSON, work as a browser auth file.
+    """
+    cookie = "; ".join([
+        "SID=fake-sid", "HSID=fake-hsid", "SSID=fake-ssid", "APISID=fake-apisid",
+        "SAPISID=fake-sapisid", "__Secure-3PAPISID=fake-sapisid",
+    ])
+    return {
+        'Cookie': cookie,
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0',
+        'X-Goog-AuthUser': '0',
+        'authorization': 'SAPISIDHASH 0_fake',
+        'origin': 'https://music.youtube.com',
+    }
+
+
+def _runs(*texts: str) -> Dict[str, Any]:
+    return {"runs": [{"text": text} for text in texts]}
+
+
+def make_track_item(number: int) -> Dict[str, Any]:
+    """Build the playlist shelf item of synthetic track number (as served for an owned playlist)"""
+    video_id = f"vid{number:07d}"
+    artist = number % ARTIST_COUNT
+    seconds = 120 + number % 240
+    return {"musicResponsiveListItemRenderer": {
+        "flexColumns": [
+            {"musicResponsiveListItemFlexColumnRenderer": {"text": {"runs": [{
+                "text": f"Song {number}",
+                "navigationEndpoint": {"watchEndpoint": {"videoId": video_id}}}]}}},
+            {"musicResponsiveListItemFlexColumnRenderer": {"text": {"runs": [{
+                "text": f"Artist {artist}",
+                "navigationEndpoint": {"browseEndpoint": {
+                    "browseId": f"UCfake{artist:04d}",
+                    "browseEndpointContextSupportedConfigs": {"browseEndpointContextMusicConfig": {
+                        "pageType": "MUSIC_PAGE_TYPE_ARTIST"}}}}}]}}},
+        ],
+        "fixedColumns": [
+            {"musicResponsiveListItemFixedColumnRenderer": {"text": _runs(f"{seconds // 60}:{seconds % 60:02d}")}},
+        ],
+        "menu": {"menuRenderer": {"items": [{"menuServiceItemRenderer": {"serviceEndpoint": {
+            "playlistEditEndpoint": {"actions": [{"setVideoId": f"set{number:07d}",
+                                                  "removedVideoId": video_id}]}}}}]}},
+        "overlay": {"musicItemThumbnailOverlayRenderer": {"content": {"musicPlayButtonRenderer": {
+            "playNavigationEndpoint": {"watchEndpoint": {"videoId": video_id}}}}}},
+    }}
+
+
+def _continuation_item(token: str) -> Dict[str, Any]:
+    return {"continuationItemRenderer": {"continuationEndpoint": {"continuationCommand": {"token": token}}}}
+
+
+class FakeInnerTube:
+    """In-memory YouTube Music server with synthetic playlists
+
+    Thread-safe. Every playlist is owned by the signed-in fake account and
+    holds synthetic tracks (see make_track_item()) that can be removed
+    through the edit endpoint. Injected 429s are drawn from a random
+    generator seeded with seed, so a run with the same settings and the
+    same request order throttles the same requests.
+
+    Args:
+        playlists: Number of playlists created up front
+        tracks: Tracks in each of them
+        page_size: Tracks per playlist page
+        library_page_size: Playlists per library page
+        latency: Seconds every response is delayed by
+        throttle_rate: Fraction of requests answered with 429 Too Many Requests
+        retry_after: Retry-After seconds sent with injected 429s
+        seed: Seed of the 429 injection
+    """
+
+    def __init__(self, playlists: int = 1, tracks: int = 1000, page_size: int = PAGE_SIZE,
+                 library_page_size: int = LIBRARY_PAGE_SIZE, latency: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: int = 0, seed: int = 0):
+        self.page_size = page_size
+        self.library_page_size = library_page_size
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        # False makes every signed-in request fail with 401, as with expired cookies
+        self.auth_valid = True
+        # True makes every request fail to connect, as without a network
+        self.offline = False
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._playlists: Dict[str, Dict[str, Any]] = {}
+        self._library: List[str] = []
+        self._next_track = 0
+
+        self.requests = 0
+        self.throttled = 0
+        self.endpoints: Dict[str, int] = {}
+
+        for _ in range(playlists):
+            self.add_playlist(tracks)
+
+    def add_playlist(self, tracks: int, title: Optional[str] = None,
+                     playlist_id: Optional[str] = None) -> str:
+        """
+        Create a playlist of fresh synthetic tracks and add it to the library.
+
+        Returns:
+            ID of the new playlist
+        """
+        with self._lock:
+            playlist_id = playlist_id or f"PLfake{len(self._library):06d}"
+            self._playlists[playlist_id] = {
+                'title': title or f"Fake Playlist {len(self._library) + 1}",
+                'tracks': list(range(self._next_track, self._next_track + tracks)),
+            }
+            self._library.append(playlist_id)
+            self._next_track += tracks
+        return playlist_id
+
+    @property
+    def playlist_ids(self) -> List[str]:
+        """IDs of the playlists in library order"""
+        with self._lock:
+            return list(self._library)
+
+    def track_count(self, playlist_id: str) -> int:
+        """Get the current number of tracks in a playlist"""
+        with self._lock:
+            return len(self._playlists[playlist_id]['tracks'])
+
+    def stats(self) -> Dict[str, Any]:
+        """Get request counters, total and per endpoint"""
+        with self._lock:
+            return {'requests': self.requests, 'throttled': self.throttled,
+                    'endpoints': dict(self.endpoints)}
+
+    def handle(self, method: str, url: str, headers: Dict[str, str],
+               body: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer a request.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            headers: Request headers
+            body: Decoded JSON body, if any
+
+        Returns:
+            Tuple of (status code, response headers, response body)
+        """
+        parts = urlsplit(url)
+        path = parts.path
+        endpoint = path[len(API_PREFIX):] if path.startswith(API_PREFIX) else path
+        signed_in = 'SAPISID=' in CaseInsensitiveDict(headers).get('Cookie', '')
+
+        with self._lock:
+            self.requests += 1
+            self.endpoints[endpoint] = self.endpoints.get(endpoint, 0) + 1
+            if self.throttle_rate and self._random.random() < self.throttle_rate:
+                self.throttled += 1
+                return self._error(429, "Too Many Requests", {'Retry-After': str(self.retry_after)})
+            if signed_in and not self.auth_valid:
+                return self._error(401, "Request had invalid authentication credentials.")
+
+            if method.upper() == 'GET':
+                if path in ('', '/'):
+                    page = f'<html><script>ytcfg.set({{"VISITOR_DATA": "{VISITOR_ID}"}});</script></html>'
+                    return 200, {'Content-Type': 'text/html; charset=utf-8'}, page.encode('utf-8')
+                if path == '/verify_session':
+                    return self._json({})
+                return self._error(404, "Not Found")
+
+            body = body or {}
+            if endpoint == 'browse':
+                params = parse_qs(parts.query)
+                if 'ctoken' in params:
+                    return self._library_page(signed_in, int(params['ctoken'][0].split(':', 1)[1]))
+                if 'continuation' in body:
+                    playlist_id, offset = body['continuation'].rsplit(':', 1)
+                    return self._playlist_page(playlist_id, int(offset))
+                browse_id = body.get('browseId', '')
+                if browse_id == LIBRARY_BROWSE_ID:
+                    return self._library_page(signed_in, 0)
+                if browse_id.startswith('VL'):
+                    return self._playlist_page(browse_id[2:], 0)
+                return self._error(404, "Requested entity was not found.")
+            if endpoint == 'browse/edit_playlist':
+                return self._edit_playlist(signed_in, body)
+            return self._error(404, "Not Found")
+
+    @staticmethod
+    def _json(payload: Dict[str, Any], status: int = 200,
+              headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        response_headers = {'Content-Type': 'application/json; charset=UTF-8'}
+        response_headers.update(headers or {})
+        return status, response_headers, json.dumps(payload).encode('utf-8')
+
+    def _error(self, status: int, message: str,
+               headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        return self._json({'error': {'code': status, 'message': message}}, status, headers)
+
+    def _playlist_page(self, playlist_id: str, offset: int) -> Tuple[int, Dict[str, str], bytes]:
+        playlist = self._playlists.get(playlist_id)
+        if playlist is None:
+            return self._error(404, "Requested entity was not found.")
+
+        tracks = playlist['tracks']
+        items = [make_track_item(number) for number in tracks[offset:offset + self.page_size]]
+        if offset + self.page_size < len(tracks):
+            items.append(_continuation_item(f"{playlist_id}:{offset + self.page_size}"))
+
+        if offset:
+            return self._json({"onResponseReceivedActions": [
+                {"appendContinuationItemsAction": {"continuationItems": items}}]})
+
+        header = {"musicResponsiveHeaderRenderer": {
+            "title": _runs(playlist['title']),
+            "subtitle": _runs("Playlist", " • ", "2025"),
+            "secondSubtitle": _runs(f"{len(tracks)} songs", " • ", f"{len(tracks) * 4 // 60} hours"),
+        }}
+        editable = {"musicEditablePlaylistDetailHeaderRenderer": {
+            "header": header,
+            "editHeader": {"musicPlaylistEditHeaderRenderer": {"privacy": "PRIVATE"}},
+            "playlistId": playlist_id,
+        }}
+        return self._json({"contents": {"twoColumnBrowseResultsRenderer": {
+            "tabs": [{"tabRenderer": {"content": {"sectionListRenderer": {"contents": [editable]}}}}],
+            "secondaryContents": {"sectionListRenderer": {"contents": [
+                {"musicPlaylistShelfRenderer": {"playlistId": playlist_id, "contents": items}}]}},
+        }}})
+
+    def _library_page(self, signed_in: bool, offset: int) -> Tuple[int, Dict[str, str], bytes]:
+        if not signed_in:
+            return self._error(401, "The caller does not have permission")
+
+        items = []
+        if offset == 0:
+            # The library grid starts with the "New playlist" button
+            items.append({"musicTwoRowItemRenderer": {"title": _runs("New playlist"), "subtitle": _runs()}})
+        for playlist_id in self._library[offset:offset + self.library_page_size]:
+            playlist = self._playlists[playlist_id]
+            items.append({"musicTwoRowItemRenderer": {
+                "title": {"runs": [{"text": playlist['title'], "navigationEndpoint": {
+                    "browseEndpoint": {"browseId": "VL" + playlist_id}}}]},
+                "subtitle": _runs("Fake User", " • ", f"{len(playlist['tracks'])} songs"),
+                "thumbnailRenderer": {"musicThumbnailRenderer": {"thumbnail": {"thumbnails": [
+                    {"url": f"https://example.invalid/{playlist_id}.jpg", "width": 226, "height": 226}]}}},
+                "menu": {"menuRenderer": {"items": [{"menuNavigationItemRenderer": {
+                    "navigationEndpoint": {"playlistEditorEndpoint": {"playlistId": playlist_id}}}}]}},
+            }})
+
+        grid: Dict[str, Any] = {"items": items}
+        if offset + self.library_page_size < len(self._library):
+            token = f"library:{offset + self.library_page_size}"
+            grid["continuations"] = [{"nextContinuationData": {"continuation": token}}]
+
+        if offset:
+            return self._json({"continuationContents": {"gridContinuation": grid}})
+        return self._json({"contents": {"singleColumnBrowseResultsRenderer": {"tabs": [
+            {"tabRenderer": {"content": {"sectionListRenderer": {"contents": [{"gridRenderer": grid}]}}}}]}}})
+
+    def _edit_playlist(self, signed_in: bool, body: Dict[str, Any]) -> Tuple[int, Dict[str, str], bytes]:
+        if not signed_in:
+            return self._error(401, "The caller does not have permission")
+        playlist = self._playlists.get(body.get('playlistId', ''))
+        if playlist is None:
+            return self._error(404, "Requested entity was not found.")
+
+        # Like the real server, a batch with an unknown item is rejected as a whole
+        positions = {f"set{number:07d}": index for index, number in enumerate(playlist['tracks'])}
+        removed = set()
+        for action in body.get('actions', []):
+            if action.get('action') != 'ACTION_REMOVE_VIDEO':
+                return self._error(400, "Request contains an invalid argument.")
+            index = positions.get(action.get('setVideoId'))
+            if index is None or action.get('removedVideoId') != f"vid{playlist['tracks'][index]:07d}":
+                return self._error(400, "Precondition check failed.")
+            removed.add(index)
+
+        playlist['tracks'] = [number for index, number in enumerate(playlist['tracks'])
+                              if index not in removed]
+        return self._json({"status": "STATUS_SUCCEEDED", "playlistEditResults": []})
+
+
+class FakeTransport(BaseAdapter):
+    """requests transport adapter that answers from a FakeInnerTube instead of the network"""
+
+    def __init__(self, backend: FakeInnerTube):
+        super().__init__()
+        self.backend = backend
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.backend.offline:
+            raise requests.ConnectionError(f"Failed to establish a new connection: {request.url} (fake backend offline)")
+        if self.backend.latency:
+            time.sleep(self.backend.latency)
+
+        body = None
+        if request.body:
+            raw = request.body if isinstance(request.body, bytes) else request.body.encode('utf-8')
+            if raw[:2] == b'\x1f\x8b':
+                raw = gzip.decompress(raw)
+            body = json.loads(raw)
+
+        status, headers, content = self.backend.handle(request.method, request.url,
+                                                       dict(request.headers), body)
+        response = requests.Response()
+        response.status_code = status
+        response.reason = requests.status_codes._codes.get(status, ('',))[0].replace('_', ' ').title()
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def install(backend: Optional[FakeInnerTube] = None, **options) -> FakeInnerTube:
+    """
+    Route all sessions created from now on to a fake backend.
+
+    Fake responses go to a temporary response cache of their own, never
+    into the user's.
+
+    Args:
+        backend: Backend to use; a new FakeInnerTube(**options) if None
+
+    Returns:
+        The installed backend
+    """
+    global _installed
+    backend = backend or FakeInnerTube(**options)
+    if _installed is None:
+        cache_dir = tempfile.TemporaryDirectory(prefix="playlistcat-fake-")
+        previous = set_response_cache(ResponseCache(os.path.join(cache_dir.name, "http_cache.sqlite3")))
+        _installed = {'cache_dir': cache_dir, 'previous_cache': previous}
+    set_transport(FakeTransport(backend))
+    return backend
+
+
+def uninstall():
+    """Send sessions created from now on to the network again"""
+    global _installed
+    set_transport(None)
+    if _installed is not None:
+        set_response_cache(_installed['previous_cache'])
+        _installed['cache_dir'].cleanup()
+        _installed = None
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP connection pool for YouTube Music requests
+Every requests session handed to YTMusic is built here and mounted on one
+process-wide connection pool, so new clients (e.g. after a token refresh)
+reuse open keep-alive connections instead of paying new TCP and TLS
+handshakes, and all requests share one request governor and response cache
+"""
+
+import threading
+from typing import Optional, Dict
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import tracing
+from request_governor import get_governor, is_idempotent
+from response_cache import get_response_cache, endpoint_of
+
+# Idle keep-alive connections kept per host; covers the worker pool plus the GUI thread
+POOL_MAXSIZE = 16
+# Hosts with a pool of their own (music.youtube.com and a few Google endpoints)
+POOL_CONNECTIONS = 4
+# Seconds to wait for a response when the caller doesn't say
+DEFAULT_TIMEOUT = 30
+
+_adapter: Optional[BaseAdapter] = None
+_adapter_lock = threading.Lock()
+
+
+def _shared_adapter() -> BaseAdapter:
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+        return _adapter
+
+
+def set_transport(adapter: Optional[BaseAdapter]):
+    """
+    Replace the transport that sessions created from now on send through.
+
+    Used to run against a stand-in server (see fake_backend) instead of the
+    network. Sessions created earlier keep their transport.
+
+    Args:
+        adapter: requests transport adapter, or None to go back to the network
+    """
+    global _adapter
+    with _adapter_lock:
+        _adapter = adapter
+
+
+class PooledSession(requests.Session):
+    """requests session that sends through the shared connection pool
+
+    Headers and cookies stay per session, so clients with different
+    credentials never see each other's, while the underlying connections
+    are reused across all of them. Every request is paced and retried by
+    the process-wide request governor, and API reads are answered from the
+    response cache while fresh. Requests without an explicit timeout get
+    the session's timeout, DEFAULT_TIMEOUT unless set otherwise.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+        adapter = _shared_adapter()
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers['Accept-Encoding'] = 'gzip, deflate'
+        self.headers['Connection'] = 'keep-alive'
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        send = super().request
+        governor = get_governor()
+        idempotent = is_idempotent(method, endpoint_of(url))
+
+        def send_request(extra_headers):
+            call_kwargs = kwargs
+            if extra_headers:
+                call_kwargs = dict(kwargs, headers={**(kwargs.get('headers') or {}), **extra_headers})
+            return governor.send(lambda: send(method, url, **call_kwargs), idempotent)
+
+        with tracing.span(f"{method} {endpoint_of(url) or '/'}", "network") as details:
+            cache = get_response_cache()
+            if cache is None:
+                response = send_request({})
+            else:
+                headers = CaseInsensitiveDict(self.headers)
+                headers.update(kwargs.get('headers') or {})
+                response = cache.send(method, url, kwargs.get('json'), headers, send_request)
+            details['status'] = response.status_code
+            return response
+
+    def close(self):
+        # The connection pool outlives any single session
+        pass
+
+
+def create_session(headers: Optional[Dict[str, str]] = None,
+                   timeout: Optional[float] = None) -> requests.Session:
+    """
+    Create a requests session on the shared connection pool.
+
+    Args:
+        headers: Optional headers to send with every request of this session
+        timeout: Seconds to wait for each response; DEFAULT_TIMEOUT if None
+
+    Returns:
+        New session; cheap to create, since connections are shared
+    """
+    session = PooledSession(DEFAULT_TIMEOUT if timeout is None else timeout)
+    if headers:
+        session.headers.update(headers)
+    return session
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Whole-library crawl for YouTube Music
+Fetches the tracks of many playlists over a small pool of worker threads and
+stores them in the playlist cache; pacing is left to the request governor
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, List, Any, Callable
+
+from utils import Track, is_rate_limit_error
+from core import iter_track_pages, revalidating_pages
+
+# Playlists fetched at the same time; the request governor decides how
+# many of their requests are actually in flight
+CRAWL_WORKERS = 4
+# Attempts per page once the governor gives up on a throttled request
+MAX_RATE_LIMIT_RETRIES = 4
+# Seconds to wait before the first of those attempts; doubles every time
+RATE_LIMIT_BACKOFF = 5
+
+
+def fetch_playlist_tracks(ytmusic, playlist_id: str,
+                          should_stop: Optional[Callable[[], bool]] = None,
+                          revalidate: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Fetch all tracks of a playlist, backing off and resuming when throttled.
+
+    A page that still fails with HTTP 429 after the request governor's own
+    retries (or while it pauses requests) is retried from the same
+    continuation with exponential backoff, so a throttled crawl doesn't
+    start over.
+
+    Args:
+        ytmusic: YTMusic instance to fetch with
+        playlist_id: Playlist to fetch
+        should_stop: Optional callable polled between pages to cancel the fetch
+        revalidate: Revalidate cached HTTP responses instead of serving them
+
+    Returns:
+        Dictionary with tracks (normalized records), title and found (False
+        if the playlist does not exist or is private), or None if the fetch
+        was stopped
+    """
+    tracks: List[Track] = []
+    title = None
+    found = False
+    continuation = None
+    position = 0
+    retries = 0
+
+    while True:
+        pages = revalidating_pages(iter_track_pages(ytmusic, playlist_id, continuation, position),
+                                   revalidate)
+        try:
+            while True:
+                if should_stop and should_stop():
+                    return None
+
+                page = next(pages, None)
+                if page is None:
+                    return {'tracks': tracks, 'title': title, 'found': found}
+
+                found = True
+                if page.get('title'):
+                    title = page['title']
+                tracks.extend(page['tracks'])
+                position = page['position']
+
+                retries = 0
+                continuation = page['continuation']
+                if not continuation:
+                    return {'tracks': tracks, 'title': title, 'found': found}
+
+        except Exception as e:
+            if not is_rate_limit_error(e) or retries >= MAX_RATE_LIMIT_RETRIES:
+                raise
+            delay = RATE_LIMIT_BACKOFF * 2 ** retries
+            retries += 1
+            print(f"⏳ Rate limited while fetching {playlist_id}, retrying in {delay}s...")
+            deadline = time.monotonic() + delay
+            while time.monotonic() < deadline:
+                if should_stop and should_stop():
+                    return None
+                time.sleep(0.1)
+
+
+def crawl_playlists(client_pool, playlists: List[Dict[str, Any]], cache,
+                    max_workers: int = CRAWL_WORKERS,
+                    on_result: Optional[Callable[[Dict[str, Any], int, str], None]] = None,
+                    should_stop: Optional[Callable[[], bool]] = None,
+                    revalidate: bool = False) -> Dict[str, Any]:
+    """
+    Fetch every playlist and store its tracks in the playlist cache.
+
+    Args:
+        client_pool: YTMusicClientPool each worker leases its client from
+        playlists: Playlist records with at least id and title
+        cache: PlaylistCache to write into
+        max_workers: Number of playlists fetched at the same time
+        on_result: Optional callback(playlist, track count, error message),
+            called from the calling thread as each playlist finishes; the
+            error message is empty on success
+        should_stop: Optional callable polled between requests to cancel the crawl
+        revalidate: Revalidate cached HTTP responses, so the cache is not
+            filled with responses fetched before the crawl started
+
+    Returns:
+        Dictionary with:
+        - cached: number of playlists written to the cache
+        - failed: list of (playlist, error message) tuples
+        - stopped: whether the crawl was cancelled before finishing
+    """
+    cached = 0
+    failed = []
+
+    def crawl_one(playlist: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with client_pool.lease() as ytmusic:
+            result = fetch_playlist_tracks(ytmusic, playlist['id'], should_stop, revalidate)
+        if result is not None and result['found']:
+            cache.save_tracks(playlist['id'], result['tracks'], result['title'] or playlist.get('title'))
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures: Dict[Any, Dict[str, Any]] = {}
+    try:
+        futures = {executor.submit(crawl_one, playlist): playlist
+                   for playlist in playlists if playlist.get('id')}
+        for future in as_completed(futures):
+            playlist = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = None
+                error = str(e)
+            else:
+                if result is None:
+                    continue  # Stopped
+                error = "" if result['found'] else "Playlist not found or is private"
+
+            if error:
+                failed.append((playlist, error))
+            else:
+                cached += 1
+            if on_result:
+                on_result(playlist, len(result['tracks']) if result else 0, error)
+
+            if should_stop and should_stop():
+                break
+    finally:
+        # Playlists not started yet are dropped; running ones stop at their next page
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+    return {'cached': cached, 'failed': failed, 'stopped': bool(should_stop and should_stop())}
@@ -7,157 +7,372 @@ A Qt application to fetch and display YouTube Music playlists with sorting capab
 import sys
 import webbrowser
 import os
-from typing import List, Dict, Any, Optional
+import locale
+import time
+
+# Startup timing counts from here, before the GUI toolkit is imported
+STARTUP_CLOCK = time.perf_counter()
+
+from contextlib import closing
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Callable
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
-    QPushButton, QLineEdit, QLabel, QTableWidget, QTableWidgetItem,
-    QHeaderView, QMessageBox, QProgressBar, QFrame, QComboBox, QGroupBox
+    QPushButton, QLineEdit, QLabel, QTableView, QAbstractItemView,
+    QHeaderView, QMessageBox, QProgressBar, QFrame, QComboBox, QGroupBox, QCheckBox,
+    QFileDialog
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QIcon
-from ytmusicapi import YTMusic
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QModelIndex
+from PyQt6.QtGui import QFont, QIcon, QKeySequence, QShortcut
 
 # Add the src directory to Python path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from utils import extract_playlist_id, validate_playlist_id
-    from auth import AuthenticationManager as AuthManager
-except ImportError:
-    # Fallback if modules are not found
-    def extract_playlist_id(input_string):
-        if not input_string:
-            return None
-        input_string = input_string.strip()
-        if 'list=' in input_string:
-            return input_string.split('list=')[1].split('&')[0]
-        return input_string
-
-    def validate_playlist_id(playlist_id):
-        return playlist_id and playlist_id.startswith('PL') and len(playlist_id) > 10
-
-    # Mock AuthenticationManager for fallback
-    class AuthManager:
-        def __init__(self):
-            self.is_authenticated = False
-            try:
-                self.ytmusic = YTMusic()
-            except:
-                self.ytmusic = None
+from utils import (
+    Track, extract_playlist_id, validate_playlist_id, track_key, format_age, is_auth_error
+)
+import tracing
+from playlist_cache import PlaylistCache
+from track_model import TrackTableModel, TrackSortProxyModel, RemoveButtonDelegate, TrackKeyRole
+from track_store import MappedTrackList
+from exporters import ARROW_AVAILABLE, export_tracks, export_cached_library, format_for_path
+
+# The network stack (ytmusicapi, requests and the modules built on them) is
+# imported once the window is on screen, see create_auth_manager
+if TYPE_CHECKING:
+    from core import PlaylistService
+    from client_pool import YTMusicClientPool
+
+# Set to 1 to print the time to first paint at startup, or to "exit" to
+# also close the window right afterwards (used by benchmark.py)
+STARTUP_TIMING_ENV_VAR = "PLAYLISTCAT_STARTUP_TIMING"
+
+# Save dialog file types -> export format
+EXPORT_FILTERS = {
+    "CSV (*.csv)": 'csv',
+    "JSON Lines (*.jsonl)": 'jsonl',
+    "Parquet (*.parquet)": 'parquet',
+    "Arrow (*.arrow)": 'arrow',
+}
+
+
+class FallbackAuthManager:
+    """Unauthenticated stand-in used when the auth module cannot be imported"""
 
-        def get_ytmusic(self):
-            return self.ytmusic
+    def __init__(self):
+        from client_pool import YTMusicClientPool, build_client
+        from core import PlaylistService
 
-        def can_access_personal_content(self):
-            return False
+        self.is_authenticated = False
+        try:
+            self.ytmusic = build_client()
+        except:
+            self.ytmusic = None
+        self.client_pool = YTMusicClientPool(build_client if self.ytmusic else None)
+        self.service = PlaylistService(self.client_pool)
 
-        def setup_authentication(self, parent=None):
-            return False
+    def get_ytmusic(self):
+        return self.ytmusic
 
-        def logout(self):
-            pass
+    def get_client_pool(self):
+        return self.client_pool
 
-        def load_saved_auth(self):
-            return False
+    def get_service(self):
+        return self.service
+
+    def can_access_personal_content(self):
+        return False
+
+    def setup_authentication(self, parent=None):
+        return False
+
+    def logout(self):
+        pass
+
+    def load_saved_auth(self):
+        return False
+
+
+def create_auth_manager():
+    """Import the authentication module on demand and create its manager"""
+    try:
+        from auth import AuthenticationManager
+    except ImportError as e:
+        print(f"⚠️  Authentication unavailable: {e}")
+        return FallbackAuthManager()
+    return AuthenticationManager()
 
 
 class PlaylistFetcher(QThread):
-    """Background thread for fetching playlist data from YouTube Music."""
+    """Background thread for fetching playlist data from YouTube Music.
 
+    Tracks are emitted page by page through tracks_ready as each
+    continuation page arrives; data_ready carries the complete list once
+    the last page has been processed.
+
+    Fetches are cancelled cooperatively with cancel(), which takes effect
+    at the next page boundary so a request is never aborted halfway.
+    After an error or cancellation, continuation and position describe
+    where the fetch stopped and can be passed to a new fetcher to resume.
+
+    A complete fetch that started from the first page is written to the
+    optional playlist cache from the worker thread. With revalidate set,
+    responses in the HTTP response cache are not trusted without asking
+    the server again.
+
+    With keep_tracks off (low-memory mode), tracks are only delivered page
+    by page: they are not collected for data_ready, which then carries an
+    empty list, and the cache is written one page at a time.
+    """
+
+    tracks_ready = pyqtSignal(list)
     data_ready = pyqtSignal(list)
     error_occurred = pyqtSignal(str)
     progress_update = pyqtSignal(str)
+    progress_changed = pyqtSignal(int, int)  # Tracks loaded, total reported by the playlist (0 if unknown)
 
-    def __init__(self, ytmusic: YTMusic, playlist_id: str):
+    def __init__(self, service: "PlaylistService", playlist_id: str,
+                 continuation: Optional[str] = None, position: int = 0,
+                 loaded: int = 0, total: int = 0, cache: Optional[PlaylistCache] = None,
+                 revalidate: bool = False, keep_tracks: bool = True):
         super().__init__()
-        self.ytmusic = ytmusic
+        self.service = service
         self.playlist_id = playlist_id
-
+        self.cache = cache
+        self.revalidate = revalidate
+        self.keep_tracks = keep_tracks
+        self.title = None
+
+        # Resume point: token of the next page to fetch and the number of
+        # playlist items consumed before it
+        self.continuation = continuation
+        self.position = position
+        self.loaded = loaded
+        self.total = total
+
+    def cancel(self):
+        """Ask the fetch to stop at the next page boundary."""
+        self.requestInterruption()
+
+    def is_resumable(self) -> bool:
+        """Check whether the fetch stopped partway with pages left to load."""
+        return self.position > 0 and bool(self.continuation)
+
+    @tracing.traced(category="fetch")
     def run(self):
         """Fetch playlist data in background thread."""
+        # Without the full track list the cache is filled as pages arrive
+        staging_id = None
         try:
-            self.progress_update.emit("Fetching playlist data...")
-            playlist_data = self.ytmusic.get_playlist(
-                self.playlist_id, limit=None)
+            resuming = self.continuation is not None
+            self.progress_update.emit(
+                "Resuming playlist fetch..." if resuming else "Fetching playlist data...")
+            tracks = []
+            received_page = False
+            if self.cache is not None and not resuming and not self.keep_tracks:
+                staging_id = self.cache.begin_staged_tracks(self.playlist_id)
+
+            pages = self.service.iter_playlist_pages(self.playlist_id, self.continuation,
+                                                     self.position, self.revalidate)
+            with closing(pages):
+                for page in pages:
+                    if self.isInterruptionRequested():
+                        return
+
+                    received_page = True
+                    if page.get('track_count'):
+                        self.total = page['track_count']
+                    if page.get('title'):
+                        self.title = page['title']
+
+                    # Only advance the resume point once the page is fully processed
+                    page_tracks = page['tracks']
+                    self.position = page['position']
+                    self.continuation = page['continuation']
+                    self.loaded += len(page_tracks)
+
+                    if self.keep_tracks:
+                        tracks.extend(page_tracks)
+                    elif staging_id is not None:
+                        staging_id = self.stage_tracks(staging_id, page_tracks)
+                    self.tracks_ready.emit(page_tracks)
+                    self.progress_changed.emit(self.loaded, self.total)
+                    if self.total:
+                        self.progress_update.emit(f"Loaded {self.loaded} of {self.total} tracks...")
+                    else:
+                        self.progress_update.emit(f"Loaded {self.loaded} tracks...")
 
-            if not playlist_data:
+            if not received_page and not resuming:
                 self.error_occurred.emit("Playlist not found or is private")
                 return
 
-            self.progress_update.emit("Processing tracks...")
-            tracks = []
+            self.continuation = None
 
-            for i, track in enumerate(playlist_data.get('tracks', []), 1):
-                if track is None:
-                    continue
-
-                # Extract track information
-                title = track.get('title', 'Unknown Title')
-                artists = []
-
-                # Handle artists list
-                if 'artists' in track and track['artists']:
-                    artists = [artist.get('name', '')
-                               for artist in track['artists'] if artist]
-
-                artist_str = ', '.join(
-                    artists) if artists else 'Unknown Artist'
-
-                # Create YouTube Music URL
-                video_id = track.get('videoId', '')
-                set_video_id = track.get('setVideoId', '')
-                youtube_url = f"https://music.youtube.com/watch?v={video_id}" if video_id else ""
-
-                tracks.append({
-                    'position': i,
-                    'artist': artist_str,
-                    'title': title,
-                    'url': youtube_url,
-                    'video_id': video_id,
-                    'set_video_id': set_video_id
-                })
-
-            self.progress_update.emit(f"Found {len(tracks)} tracks")
+            # A resumed fetch only holds the tail of the playlist, so only
+            # complete fetches refresh the cache
+            if self.cache is not None and not resuming:
+                try:
+                    if staging_id is not None:
+                        self.cache.commit_staged_tracks(staging_id, self.playlist_id, self.title)
+                        staging_id = None
+                    elif self.keep_tracks:
+                        self.cache.save_tracks(self.playlist_id, tracks, self.title)
+                except Exception as cache_error:
+                    print(f"⚠️  Could not update playlist cache: {cache_error}")
+
+            self.progress_update.emit(f"Found {self.loaded} tracks")
             self.data_ready.emit(tracks)
 
         except Exception as e:
+            if self.isInterruptionRequested():
+                return
             self.error_occurred.emit(f"Error fetching playlist: {str(e)}")
+        finally:
+            if staging_id is not None:
+                self.discard_staged_tracks(staging_id)
+
+    def stage_tracks(self, staging_id: str, tracks: list) -> Optional[str]:
+        """Add a page to the staged cache copy; returns None once staging has failed"""
+        try:
+            self.cache.append_staged_tracks(staging_id, tracks)
+            return staging_id
+        except Exception as cache_error:
+            print(f"⚠️  Could not update playlist cache: {cache_error}")
+            self.discard_staged_tracks(staging_id)
+            return None
+
+    def discard_staged_tracks(self, staging_id: str):
+        """Drop the staged cache copy of a fetch that did not complete"""
+        try:
+            self.cache.discard_staged_tracks(staging_id)
+        except Exception as cache_error:
+            print(f"⚠️  Could not clean up playlist cache: {cache_error}")
 
 
 class PersonalPlaylistFetcher(QThread):
-    """Background thread for fetching user's personal playlists."""
+    """Background thread for fetching user's personal playlists.
+
+    The whole library is paged through; playlists_page_ready carries each
+    page as it arrives and playlists_ready the complete list at the end.
+    """
 
+    playlists_page_ready = pyqtSignal(list)
     playlists_ready = pyqtSignal(list)
     error_occurred = pyqtSignal(str)
     progress_update = pyqtSignal(str)
 
-    def __init__(self, ytmusic: YTMusic):
+    def __init__(self, service: "PlaylistService", revalidate: bool = False):
         super().__init__()
-        self.ytmusic = ytmusic
+        self.service = service
+        self.revalidate = revalidate
+        self.auth_error = False  # Whether the last error looked like expired credentials
 
+    @tracing.traced(category="fetch")
     def run(self):
         """Fetch personal playlists in background thread."""
         try:
             self.progress_update.emit("Fetching your playlists...")
-            playlists = self.ytmusic.get_library_playlists(limit=100)
-
             formatted_playlists = []
-            for playlist in playlists:
-                formatted_playlists.append({
-                    'id': playlist.get('playlistId', ''),
-                    'title': playlist.get('title', 'Unknown Playlist'),
-                    'description': playlist.get('description', ''),
-                    'count': playlist.get('count', 0),
-                    'thumbnails': playlist.get('thumbnails', [])
-                })
+            pages = self.service.iter_library(self.revalidate)
+            with closing(pages):
+                for playlists in pages:
+                    if self.isInterruptionRequested():
+                        return
 
+                    formatted_playlists.extend(playlists)
+                    self.playlists_page_ready.emit(playlists)
+                    self.progress_update.emit(f"Fetching your playlists... {len(formatted_playlists)} so far")
+
+            if self.isInterruptionRequested():
+                return
             self.progress_update.emit(f"Found {len(formatted_playlists)} playlists")
             self.playlists_ready.emit(formatted_playlists)
 
         except Exception as e:
+            self.auth_error = is_auth_error(e)
             self.error_occurred.emit(f"Error fetching playlists: {str(e)}")
 
 
+class LibraryCrawler(QThread):
+    """Background thread that fetches every personal playlist into the playlist cache.
+
+    Playlists are fetched over a bounded worker pool at a shared request
+    rate; playlist_crawled reports each one as it finishes.
+    """
+
+    playlist_crawled = pyqtSignal(dict, int, str)  # Playlist, tracks cached, error message ('' on success)
+    crawl_finished = pyqtSignal(dict)
+
+    def __init__(self, client_pool: "YTMusicClientPool", playlists: list, cache: PlaylistCache):
+        super().__init__()
+        self.client_pool = client_pool
+        self.playlists = playlists
+        self.cache = cache
+
+    def run(self):
+        """Crawl the playlists in background thread."""
+        from library_crawl import crawl_playlists
+
+        try:
+            # Cached playlists are stamped as fetched now, so no stale responses
+            summary = crawl_playlists(self.client_pool, self.playlists, self.cache,
+                                      on_result=self.playlist_crawled.emit,
+                                      should_stop=self.isInterruptionRequested, revalidate=True)
+        except Exception as e:
+            summary = {'cached': 0, 'failed': [({'title': 'Library crawl'}, str(e))], 'stopped': False}
+        self.crawl_finished.emit(summary)
+
+
+class LibraryExporter(QThread):
+    """Background thread that exports every cached playlist into one file.
+
+    Tracks are streamed from the playlist cache to the writer, so the
+    library is never loaded into memory as a whole.
+    """
+
+    export_finished = pyqtSignal(dict)  # Playlists and tracks written
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, cache: PlaylistCache, path: str, export_format: str):
+        super().__init__()
+        self.cache = cache
+        self.path = path
+        self.export_format = export_format
+
+    def run(self):
+        """Export the cached library in background thread."""
+        try:
+            summary = export_cached_library(self.cache, self.path, self.export_format)
+        except Exception as e:
+            self.error_occurred.emit(f"Error exporting library: {str(e)}")
+            return
+        self.export_finished.emit(summary)
+
+
+class TrackRemover(QThread):
+    """Background thread for removing tracks from a playlist on the server.
+
+    The GUI removes the rows before starting the thread; removal_finished
+    reports which tracks the server actually removed and which it refused,
+    so the refused ones can be put back.
+    """
+
+    removal_finished = pyqtSignal(dict)
+
+    def __init__(self, service: "PlaylistService", playlist_id: str, tracks: list):
+        super().__init__()
+        self.service = service
+        self.playlist_id = playlist_id
+        self.tracks = tracks
+
+    def run(self):
+        """Remove the tracks in background thread."""
+        try:
+            result = self.service.remove_items(self.playlist_id, self.tracks)
+        except Exception as e:
+            result = {'removed': [], 'failed': [(track, str(e)) for track in self.tracks]}
+        self.removal_finished.emit(result)
+
+
 class YouTubeMusicPlaylistViewer(QMainWindow):
     """Main application window for YouTube Music Playlist Viewer."""
 
@@ -170,22 +385,69 @@ class YouTubeMusicPlaylistViewer(QMainWindow):
         self.fetcher_thread = None
         self.playlist_fetcher_thread = None
         self.current_playlist_id = None  # Track current playlist for refresh functionality
+        self.fetch_received_tracks = False  # Whether the running fetch has delivered a page yet
+        self.retired_threads = []  # Cancelled workers kept alive until their last request returns
+        self.resume_pending = None  # Cancelled fetcher to resume from once its in-flight page returns
+        self.refresh_in_place = False  # Whether the running fetch updates tracks already on display
+        self.removal_threads = []  # Server removals in flight; their rows are already gone from the table
+        self.library_retried = False  # Whether the running library fetch already refreshed the tokens
+        self.library_revalidate = False  # Whether the running library fetch bypasses the HTTP response cache
+        self.library_received_page = False  # Whether the running library fetch has delivered a page yet
+        self.auth_refresh_callback = None  # Called with the outcome of the background token refresh
+        self.crawler_thread = None
+        self.crawled_count = 0  # Playlists finished by the running library crawl
+        self.exporter_thread = None
+        self._auth_manager = None  # Created on first use, normally right after the first paint
+        self.startup_timing = os.environ.get(STARTUP_TIMING_ENV_VAR, '')
+        self.first_paint_time = None
+
+        # Local cache of previously fetched playlists
+        try:
+            self.playlist_cache = PlaylistCache()
+        except Exception as e:
+            print(f"⚠️  Playlist cache unavailable: {e}")
+            self.playlist_cache = None
 
-        # Initialize authentication manager
-        self.auth_manager = AuthManager()
-
-        # Initialize UI first
+        # Initialize UI first; authentication is set up once the window has
+        # been painted (see finish_startup)
         self.init_ui()
         self.setWindowTitle("PlaylistCat - YouTube Music Playlist Viewer")
         self.resize(1000, 700)
 
-        # Connect auth status changed signal if available (after UI is created)
-        if hasattr(self.auth_manager, 'auth_status_changed'):
-            self.auth_manager.auth_status_changed.connect(self.on_auth_status_changed)
-
-        # Try to load saved authentication (after UI and signal connection)
+    @property
+    def auth_manager(self):
+        """Authentication manager, created with its network stack on first use"""
+        if self._auth_manager is None:
+            with tracing.span("Create authentication manager", "startup"):
+                self._auth_manager = create_auth_manager()
+
+            # Connect auth status changed signal if available (after UI is created)
+            if hasattr(self._auth_manager, 'auth_status_changed'):
+                self._auth_manager.auth_status_changed.connect(self.on_auth_status_changed)
+            if hasattr(self._auth_manager, 'token_refresh_finished'):
+                self._auth_manager.token_refresh_finished.connect(self.on_token_refresh_finished)
+        return self._auth_manager
+
+    def paintEvent(self, event):
+        """Paint the window; the first paint kicks off the deferred startup work."""
+        super().paintEvent(event)
+        if self.first_paint_time is None:
+            self.first_paint_time = time.perf_counter()
+            QTimer.singleShot(0, self.finish_startup)
+
+    @tracing.traced(category="startup")
+    def finish_startup(self):
+        """Set up authentication once the window is on screen."""
+        # Try to load saved authentication; it is checked in the background
         self.auth_manager.load_saved_auth()
 
+        if self.startup_timing:
+            first_paint = (self.first_paint_time - STARTUP_CLOCK) * 1000
+            ready = (time.perf_counter() - STARTUP_CLOCK) * 1000
+            print(f"⏱️  Startup: first paint after {first_paint:.1f} ms, ready after {ready:.1f} ms")
+            if self.startup_timing == "exit":
+                self.close()
+
     def init_ui(self):
         """Initialize the user interface."""
         central_widget = QWidget()
@@ -240,6 +502,10 @@ class YouTubeMusicPlaylistViewer(QMainWindow):
         instructions.setStyleSheet("color: gray; font-size: 10px;")
         layout.addWidget(instructions)
 
+        # Ctrl+Shift+T starts and stops recording a performance trace
+        self.trace_shortcut = QShortcut(QKeySequence("Ctrl+Shift+T"), self)
+        self.trace_shortcut.activated.connect(self.toggle_tracing)
+
     def create_auth_section(self):
         """Create authentication section of the UI"""
         self.auth_frame = QGroupBox("Authentication")
@@ -280,9 +546,23 @@ class YouTubeMusicPlaylistViewer(QMainWindow):
         personal_layout.addWidget(self.personal_playlist_combo)
 
         self.refresh_playlists_button = QPushButton("Refresh Playlists (Auto Token Refresh)")
-        self.refresh_playlists_button.clicked.connect(self.refresh_personal_playlists)
+        self.refresh_playlists_button.clicked.connect(
+            lambda: self.refresh_personal_playlists(revalidate=True))
         personal_layout.addWidget(self.refresh_playlists_button)
 
+        self.crawl_button = QPushButton("Cache All Playlists")
+        self.crawl_button.clicked.connect(self.toggle_library_crawl)
+        self.crawl_button.setEnabled(False)
+        self.crawl_button.setToolTip("Fetch every playlist in your library into the local cache")
+        personal_layout.addWidget(self.crawl_button)
+
+        self.export_library_button = QPushButton("Export Cached Library...")
+        self.export_library_button.clicked.connect(self.export_library)
+        self.export_library_button.setEnabled(self.playlist_cache is not None)
+        self.export_library_button.setToolTip(
+            "Export the tracks of every cached playlist to one CSV, JSON Lines, Parquet or Arrow file")
+        personal_layout.addWidget(self.export_library_button)
+
         self.personal_frame = QWidget()
         self.personal_frame.setLayout(personal_layout)
         self.personal_frame.setVisible(False)  # Hidden by default
@@ -307,42 +587,150 @@ class YouTubeMusicPlaylistViewer(QMainWindow):
         self.refresh_button.setEnabled(False)
         manual_layout.addWidget(self.refresh_button)
 
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.on_cancel_clicked)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.setToolTip("Stop loading after the current page")
+        manual_layout.addWidget(self.cancel_button)
+
+        self.remove_selected_button = QPushButton("Remove Selected")
+        self.remove_selected_button.clicked.connect(self.remove_selected_tracks)
+        self.remove_selected_button.setEnabled(False)
+        self.remove_selected_button.setToolTip("Remove all selected tracks from the playlist (Delete)")
+        manual_layout.addWidget(self.remove_selected_button)
+
+        self.export_button = QPushButton("Export...")
+        self.export_button.clicked.connect(self.export_playlist)
+        self.export_button.setToolTip("Save the tracks as CSV, JSON Lines, Parquet or Arrow")
+        manual_layout.addWidget(self.export_button)
+
+        self.low_memory_checkbox = QCheckBox("Low-memory mode")
+        self.low_memory_checkbox.setToolTip(
+            "Keep loaded tracks in a temporary file instead of in memory, "
+            "for playlists with tens of thousands of tracks")
+        manual_layout.addWidget(self.low_memory_checkbox)
+
         input_layout.addLayout(manual_layout)
 
     def create_table(self):
         """Create and configure the tracks table."""
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)  # Added Remove column
-        self.table.setHorizontalHeaderLabels(
-            ["Position", "Artist", "Track Name", "YouTube Music Link", "Remove"])
-
-        # Configure table appearance
+        self.track_model = TrackTableModel(self)
+        self.sort_proxy = TrackSortProxyModel(self)
+        self.sort_proxy.setSourceModel(self.track_model)
+        self.table = QTableView()
+        self.table.setModel(self.sort_proxy)
+
+        # Configure table appearance. Columns that would otherwise be sized
+        # to their contents get fixed widths so that Qt never has to scan
+        # every row of a large playlist to lay out the header.
         header = self.table.horizontalHeader()
         if header:
             header.setSectionResizeMode(
-                0, QHeaderView.ResizeMode.ResizeToContents)  # Position
+                0, QHeaderView.ResizeMode.Fixed)             # Position
             header.setSectionResizeMode(
-                1, QHeaderView.ResizeMode.Interactive)        # Artist
+                1, QHeaderView.ResizeMode.Interactive)       # Artist
             header.setSectionResizeMode(
                 2, QHeaderView.ResizeMode.Stretch)           # Track Name
             header.setSectionResizeMode(
-                3, QHeaderView.ResizeMode.ResizeToContents)  # Link
+                3, QHeaderView.ResizeMode.Fixed)             # Link
             header.setSectionResizeMode(
-                4, QHeaderView.ResizeMode.ResizeToContents)  # Remove
+                4, QHeaderView.ResizeMode.Fixed)             # Remove
+            header.resizeSection(0, 70)
+            header.resizeSection(1, 250)
+            header.resizeSection(3, 140)
+            header.resizeSection(4, 90)
+
+        # Uniform row heights let the view compute the visible window
+        # directly instead of measuring every row
+        vertical_header = self.table.verticalHeader()
+        if vertical_header:
+            vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+            vertical_header.setDefaultSectionSize(26)
 
         self.table.setAlternatingRowColors(True)
         self.table.setSelectionBehavior(
-            QTableWidget.SelectionBehavior.SelectRows)
-        # Disable built-in sorting, use custom logic
+            QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(
+            QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.setEditTriggers(
+            QAbstractItemView.EditTrigger.NoEditTriggers)
+        # Disable built-in sorting; header clicks drive the sort proxy
         self.table.setSortingEnabled(False)
+        if header:
+            header.setSortIndicatorShown(True)
+            header.setSortIndicator(self.current_sort_column, self.current_sort_order)
+
+        # The Remove column is painted by a delegate rather than holding a
+        # button widget per row; clicks are hit-tested and reported by track key
+        self.remove_delegate = RemoveButtonDelegate(self.table)
+        self.remove_delegate.remove_requested.connect(self.remove_track)
+        self.table.setItemDelegateForColumn(
+            TrackTableModel.COLUMN_REMOVE, self.remove_delegate)
+        self.table.setMouseTracking(True)
 
         # Connect double-click to open URL
-        self.table.itemDoubleClicked.connect(self.open_track_url)
+        self.table.doubleClicked.connect(self.open_track_url)
+
+        # Selected rows can be removed together with the Delete key
+        selection_model = self.table.selectionModel()
+        if selection_model:
+            selection_model.selectionChanged.connect(self.on_selection_changed)
+        self.delete_shortcut = QShortcut(QKeySequence(QKeySequence.StandardKey.Delete), self.table)
+        self.delete_shortcut.setContext(Qt.ShortcutContext.WidgetShortcut)
+        self.delete_shortcut.activated.connect(self.remove_selected_tracks)
 
         # Connect header clicks for custom sorting
         if header:
             header.sectionClicked.connect(self.sort_table)
 
+    def closeEvent(self, event):
+        """Stop background workers cooperatively before the window closes."""
+        workers = [self.fetcher_thread, self.playlist_fetcher_thread, self.crawler_thread,
+                   self.exporter_thread]
+        workers += list(self.retired_threads)
+        # Removals are not interrupted: a half-applied batch is worse than a short wait
+        workers += list(self.removal_threads)
+        workers.append(getattr(self._auth_manager, 'auth_validator', None))
+        workers.append(getattr(self._auth_manager, 'token_refresher', None))
+        for worker in workers:
+            if worker is not None and worker.isRunning():
+                worker.requestInterruption()
+        for worker in workers:
+            if worker is not None:
+                worker.wait()
+
+        # Without an auth manager nothing was fetched and the cache was never opened
+        if self._auth_manager is not None:
+            from response_cache import get_response_cache
+
+            response_cache = get_response_cache()
+            if response_cache is not None:
+                stats = response_cache.stats()
+                print(f"📦 HTTP response cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+                      f"{stats['misses']} misses, {stats['bytes_saved'] // 1024} KB not downloaded")
+
+        if tracing.is_enabled():
+            try:
+                tracing.stop()
+            except OSError as e:
+                print(f"⚠️  Could not save trace: {e}")
+        super().closeEvent(event)
+
+    def toggle_tracing(self):
+        """Start recording a performance trace, or stop and save the one being recorded."""
+        if not tracing.is_enabled():
+            tracing.start()
+            self.status_label.setText(
+                "⏺️ Recording a performance trace - press Ctrl+Shift+T again to save it")
+            return
+
+        try:
+            path = tracing.stop()
+        except OSError as e:
+            self.status_label.setText(f"❌ Could not save trace: {e}")
+            return
+        self.status_label.setText(f"⏹️ Trace saved to {path} - open it at https://ui.perfetto.dev")
+
     def toggle_authentication(self):
         """Toggle between login and logout"""
         if hasattr(self.auth_manager, 'is_authenticated') and self.auth_manager.is_authenticated:
@@ -381,145 +769,368 @@ class YouTubeMusicPlaylistViewer(QMainWindow):
             self.auth_button.setText("Login")
             self.refresh_auth_button.setVisible(False)  # Hide refresh auth button
             self.personal_frame.setVisible(False)
+            self.crawl_button.setEnabled(False)
+            if self.crawler_thread and self.crawler_thread.isRunning():
+                self.crawler_thread.requestInterruption()
             self.personal_playlist_combo.clear()
             self.personal_playlist_combo.addItem("Select a playlist...")
             self.status_label.setText("Enter a playlist ID to get started or login to access your playlists")
 
-    def refresh_personal_playlists(self):
-        """Refresh the list of personal playlists with automatic token refresh"""
+    def refresh_personal_playlists(self, revalidate: bool = False):
+        """Refresh the list of personal playlists with automatic token refresh
+
+        Args:
+            revalidate: Ask the server again instead of using recently cached responses
+        """
         if not hasattr(self.auth_manager, 'can_access_personal_content') or not self.auth_manager.can_access_personal_content():
             QMessageBox.information(self, "Not Authenticated",
                                   "Please login first to access your personal playlists.")
             return
 
-        # Stop any running playlist fetcher
+        self.library_retried = False
+        self.library_revalidate = revalidate
+        self.start_library_fetch()
+
+    def start_library_fetch(self):
+        """Start a background fetch of the whole personal library."""
+        # Stop any running playlist fetcher; it finishes its current request first
         if self.playlist_fetcher_thread and self.playlist_fetcher_thread.isRunning():
-            self.playlist_fetcher_thread.terminate()
-            self.playlist_fetcher_thread.wait()
+            fetcher = self.playlist_fetcher_thread
+            fetcher.requestInterruption()
+            self.retired_threads.append(fetcher)
+            fetcher.finished.connect(lambda: self.retired_threads.remove(fetcher))
+        self.playlist_fetcher_thread = None
+
+        service = self.auth_manager.get_service()
+        if not service.available:
+            self.status_label.setText("Not authenticated - please login")
+            return
 
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
         self.status_label.setText("Fetching your playlists...")
         self.refresh_playlists_button.setEnabled(False)
+        self.library_received_page = False
+
+        print("🔄 Refreshing playlists in the background...")
+        self.playlist_fetcher_thread = PersonalPlaylistFetcher(service, self.library_revalidate)
+        self.playlist_fetcher_thread.playlists_page_ready.connect(self.on_personal_playlists_page)
+        self.playlist_fetcher_thread.playlists_ready.connect(self.on_personal_playlists_ready)
+        self.playlist_fetcher_thread.error_occurred.connect(self.on_personal_playlists_error)
+        self.playlist_fetcher_thread.progress_update.connect(self.on_library_progress)
+        self.playlist_fetcher_thread.start()
+
+    def is_current_library_fetch(self) -> bool:
+        """Whether the signal being handled comes from the running library fetcher."""
+        return self.sender() is self.playlist_fetcher_thread
+
+    def on_library_progress(self, message: str):
+        """Show progress of the running library fetch."""
+        if self.is_current_library_fetch():
+            self.status_label.setText(message)
+
+    def on_personal_playlists_page(self, playlists: List[Dict[str, Any]]):
+        """Add a page of personal playlists to the combo box as it arrives."""
+        if not self.is_current_library_fetch():
+            return
 
-        # Use the authentication manager's get_user_playlists which has token refresh
-        try:
-            print("🔄 Refreshing playlists using auth manager...")
-            playlists = self.auth_manager.get_user_playlists()
+        if not self.library_received_page:
+            # Keep the previous list on screen until the new one starts arriving
+            self.library_received_page = True
+            self.personal_playlists = []
+            self.personal_playlist_combo.clear()
+            self.personal_playlist_combo.addItem("Select a playlist...")
 
-            if playlists:
-                print(f"✅ Successfully refreshed {len(playlists)} playlists")
-                self.on_personal_playlists_ready(playlists)
-                self.status_label.setText(f"Found {len(playlists)} personal playlists")
-            else:
-                print("⚠️  No playlists returned")
-                # Check if we're still authenticated
-                if self.auth_manager.is_authenticated:
-                    # Try to refresh authentication status
-                    print("🔧 Attempting authentication refresh...")
-                    refresh_success = self.auth_manager.refresh_authentication_status()
-
-                    if refresh_success:
-                        # Retry after refresh
-                        playlists = self.auth_manager.get_user_playlists()
-                        if playlists:
-                            print(f"✅ Retry successful! Got {len(playlists)} playlists after refresh")
-                            self.on_personal_playlists_ready(playlists)
-                            self.status_label.setText(f"Found {len(playlists)} personal playlists")
-                        else:
-                            self.status_label.setText("No personal playlists found")
-                            QMessageBox.information(self, "No Playlists",
-                                                  "No personal playlists found. This could mean:\n"
-                                                  "• Your account has no created playlists\n"
-                                                  "• Authentication tokens have expired\n"
-                                                  "• Account permissions are restricted\n\n"
-                                                  "Try logging out and logging in again with fresh authentication.")
-                    else:
-                        # Authentication refresh failed
-                        self.status_label.setText("Authentication expired - please login again")
-                        QMessageBox.warning(self, "Authentication Expired",
-                                          "Your authentication has expired. Please logout and login again with a fresh cURL command from your browser.")
-                        # Update UI to show not authenticated
-                        self.on_auth_status_changed(False)
-                else:
-                    self.status_label.setText("Not authenticated - please login")
-                    QMessageBox.information(self, "Not Authenticated",
-                                          "You are no longer authenticated. Please login again.")
+        self.personal_playlists.extend(playlists)
+        for playlist in playlists:
+            title = playlist['title']
+            count = playlist.get('count', 0)
+            display_text = f"{title} ({count} tracks)"
+            self.personal_playlist_combo.addItem(display_text, playlist['id'])
 
-        except Exception as e:
-            print(f"❌ Error refreshing playlists: {e}")
-            self.status_label.setText("Error refreshing playlists")
-            QMessageBox.critical(self, "Error",
-                               f"Failed to refresh playlists: {str(e)}\n\n"
-                               "This might be due to expired authentication. "
-                               "Try logging out and logging in again.")
+    def on_personal_playlists_error(self, error_message: str):
+        """Handle a failed library fetch, refreshing expired tokens once."""
+        fetcher = self.sender()
+        if fetcher is not self.playlist_fetcher_thread:
+            return
+        print(f"❌ {error_message}")
 
-        finally:
-            self.progress_bar.setVisible(False)
-            self.refresh_playlists_button.setEnabled(True)
+        if fetcher.auth_error and not self.library_retried:
+            print("🔧 Authentication issue detected, attempting automatic refresh...")
+            self.library_retried = True
+            if self.start_auth_refresh(lambda refreshed: self.on_library_auth_refreshed(refreshed, error_message)):
+                self.status_label.setText("Refreshing authentication...")
+                return
+
+        self.show_library_error(error_message)
+
+    def on_library_auth_refreshed(self, refresh_success: bool, error_message: str):
+        """Retry the library fetch after a token refresh, or report the original error."""
+        if refresh_success:
+            print("🔄 Retrying playlist fetch after token refresh...")
+            self.start_library_fetch()
+        else:
+            self.show_library_error(error_message)
+
+    def show_library_error(self, error_message: str):
+        """Report a library fetch that failed for good."""
+        self.progress_bar.setVisible(False)
+        self.refresh_playlists_button.setEnabled(True)
+        self.status_label.setText("Error refreshing playlists")
+        QMessageBox.critical(self, "Error",
+                           f"Failed to refresh playlists: {error_message}\n\n"
+                           "This might be due to expired authentication. "
+                           "Try logging out and logging in again.")
+
+    def start_auth_refresh(self, on_finished: Callable[[bool], None], check_first: bool = False) -> bool:
+        """
+        Check or refresh the tokens in the background.
+
+        on_finished is called with whether the login survived. Only one
+        refresh is waited for at a time.
+
+        Returns:
+            Whether on_finished will be called
+        """
+        if self.auth_refresh_callback is not None or not hasattr(self.auth_manager, 'start_token_refresh'):
+            return False
+        if not self.auth_manager.start_token_refresh(check_first):
+            return False
+        self.auth_refresh_callback = on_finished
+        return True
+
+    def on_token_refresh_finished(self, is_authenticated: bool):
+        """Hand the outcome of a background token refresh to whoever asked for it."""
+        callback, self.auth_refresh_callback = self.auth_refresh_callback, None
+        if callback is not None:
+            callback(is_authenticated)
 
     def force_auth_refresh(self):
         """Force authentication token refresh"""
-        if not hasattr(self.auth_manager, 'force_token_refresh'):
+        if not hasattr(self.auth_manager, 'start_token_refresh'):
             QMessageBox.information(self, "Not Available",
                                   "Token refresh is not available in this authentication mode.")
             return
 
+        print("🔄 Manual authentication refresh requested...")
+        if not self.start_auth_refresh(self.on_manual_auth_refreshed):
+            self.status_label.setText("An authentication refresh is already running")
+            return
+
         # Disable button during refresh
         self.refresh_auth_button.setEnabled(False)
         self.refresh_auth_button.setText("Refreshing...")
+        self.status_label.setText("Refreshing authentication...")
+
+    def on_manual_auth_refreshed(self, refresh_success: bool):
+        """Report the outcome of a token refresh requested with the Refresh Auth button."""
+        # Re-enable button
+        self.refresh_auth_button.setEnabled(True)
+        self.refresh_auth_button.setText("Refresh Auth")
+
+        if refresh_success:
+            QMessageBox.information(self, "Success",
+                                  "Authentication tokens refreshed successfully!")
+            self.status_label.setText("Authentication refreshed - ready to fetch playlists")
+            # Automatically refresh playlists after successful auth refresh
+            self.refresh_personal_playlists()
+            return
 
-        try:
-            print("🔄 Manual authentication refresh requested...")
-            refresh_success = self.auth_manager.force_token_refresh()
-
-            if refresh_success:
-                QMessageBox.information(self, "Success",
-                                      "Authentication tokens refreshed successfully!")
-                self.status_label.setText("Authentication refreshed - ready to fetch playlists")
-                # Automatically refresh playlists after successful auth refresh
-                self.refresh_personal_playlists()
-            else:
-                # Get authentication status info for more details
-                if hasattr(self.auth_manager, 'get_auth_status_info'):
-                    status = self.auth_manager.get_auth_status_info()
-                    retry_count = status.get('auth_retry_count', 0)
-                    max_retries = status.get('max_retries', 3)
-
-                    QMessageBox.warning(self, "Refresh Failed",
-                                      f"Authentication token refresh failed.\n\n"
-                                      f"Retry attempts: {retry_count}/{max_retries}\n\n"
-                                      "This usually means your browser session has expired. "
-                                      "Please logout and login again with a fresh cURL command.")
-                else:
-                    QMessageBox.warning(self, "Refresh Failed",
-                                      "Authentication token refresh failed. "
-                                      "Please logout and login again.")
-
-        except Exception as e:
-            print(f"❌ Error during manual auth refresh: {e}")
-            QMessageBox.critical(self, "Error",
-                               f"Error during authentication refresh: {str(e)}")
-
-        finally:
-            # Re-enable button
-            self.refresh_auth_button.setEnabled(True)
-            self.refresh_auth_button.setText("Refresh Auth")
+        # Get authentication status info for more details
+        if hasattr(self.auth_manager, 'get_auth_status_info'):
+            status = self.auth_manager.get_auth_status_info()
+            retry_count = status.get('auth_retry_count', 0)
+            max_retries = status.get('max_retries', 3)
+
+            QMessageBox.warning(self, "Refresh Failed",
+                              f"Authentication token refresh failed.\n\n"
+                              f"Retry attempts: {retry_count}/{max_retries}\n\n"
+                              "This usually means your browser session has expired. "
+                              "Please logout and login again with a fresh cURL command.")
+        else:
+            QMessageBox.warning(self, "Refresh Failed",
+                              "Authentication token refresh failed. "
+                              "Please logout and login again.")
 
     def on_personal_playlists_ready(self, playlists: List[Dict[str, Any]]):
         """Handle personal playlists fetch completion"""
-        self.personal_playlists = playlists
-        self.personal_playlist_combo.clear()
-        self.personal_playlist_combo.addItem("Select a playlist...")
+        if not self.is_current_library_fetch():
+            return
 
-        for playlist in playlists:
-            title = playlist['title']
-            count = playlist.get('count', 0)
-            display_text = f"{title} ({count} tracks)"
-            self.personal_playlist_combo.addItem(display_text, playlist['id'])
+        if playlists:
+            print(f"✅ Successfully refreshed {len(playlists)} playlists")
+            self.progress_bar.setVisible(False)
+            self.refresh_playlists_button.setEnabled(True)
+            self.crawl_button.setEnabled(self.playlist_cache is not None)
+            self.status_label.setText(f"Found {len(playlists)} personal playlists")
+            return
 
+        print("⚠️  No playlists returned")
+        if not self.library_retried and self.auth_manager.is_authenticated:
+            # An empty library can mean the tokens went stale; check them and retry once
+            print("🔧 Attempting authentication refresh...")
+            self.library_retried = True
+            if self.start_auth_refresh(self.on_empty_library_auth_checked, check_first=True):
+                self.status_label.setText("Checking authentication...")
+                return
+
+        self.show_empty_library(None)
+
+    def on_empty_library_auth_checked(self, refresh_success: bool):
+        """Retry an empty library fetch once the tokens have been checked."""
+        if refresh_success:
+            self.start_library_fetch()
+        else:
+            self.show_empty_library(False)
+
+    def show_empty_library(self, refresh_success: Optional[bool]):
+        """Explain an empty library, given the outcome of the token check if one ran."""
         self.progress_bar.setVisible(False)
-        self.status_label.setText(f"Found {len(playlists)} personal playlists")
+        self.refresh_playlists_button.setEnabled(True)
+        if refresh_success is False:
+            # Authentication refresh failed
+            self.status_label.setText("Authentication expired - please login again")
+            QMessageBox.warning(self, "Authentication Expired",
+                              "Your authentication has expired. Please logout and login again with a fresh cURL command from your browser.")
+            # Update UI to show not authenticated
+            self.on_auth_status_changed(False)
+        elif not self.auth_manager.is_authenticated:
+            self.status_label.setText("Not authenticated - please login")
+            QMessageBox.information(self, "Not Authenticated",
+                                  "You are no longer authenticated. Please login again.")
+        else:
+            self.status_label.setText("No personal playlists found")
+            QMessageBox.information(self, "No Playlists",
+                                  "No personal playlists found. This could mean:\n"
+                                  "• Your account has no created playlists\n"
+                                  "• Authentication tokens have expired\n"
+                                  "• Account permissions are restricted\n\n"
+                                  "Try logging out and logging in again with fresh authentication.")
+
+    def toggle_library_crawl(self):
+        """Start caching every personal playlist, or stop a running crawl."""
+        if self.crawler_thread and self.crawler_thread.isRunning():
+            self.crawler_thread.requestInterruption()
+            self.crawl_button.setEnabled(False)
+            self.crawl_button.setText("Stopping...")
+            return
+
+        client_pool = self.auth_manager.get_client_pool()
+        if not self.personal_playlists or not client_pool.available or self.playlist_cache is None:
+            return
+
+        self.crawled_count = 0
+        self.crawler_thread = LibraryCrawler(client_pool, list(self.personal_playlists), self.playlist_cache)
+        self.crawler_thread.playlist_crawled.connect(self.on_playlist_crawled)
+        self.crawler_thread.crawl_finished.connect(self.on_crawl_finished)
+        self.crawler_thread.start()
+
+        self.crawl_button.setText(f"Stop Caching (0/{len(self.personal_playlists)})")
+        self.status_label.setText(f"Caching {len(self.personal_playlists)} playlists in the background...")
+
+    def on_playlist_crawled(self, playlist: dict, track_count: int, error: str):
+        """Report a playlist finished by the library crawl."""
+        self.crawled_count += 1
+        total = len(self.crawler_thread.playlists)
+        if error:
+            print(f"❌ Could not cache '{playlist.get('title', '')}': {error}")
+        else:
+            print(f"📥 Cached '{playlist.get('title', '')}' ({track_count} tracks)")
+        if not self.crawler_thread.isInterruptionRequested():
+            self.crawl_button.setText(f"Stop Caching ({self.crawled_count}/{total})")
+        self.status_label.setText(
+            f"Cached '{playlist.get('title', '')}' ({track_count} tracks) - {self.crawled_count}/{total} playlists"
+            if not error else
+            f"Could not cache '{playlist.get('title', '')}' - {self.crawled_count}/{total} playlists")
+
+    def on_crawl_finished(self, summary: dict):
+        """Report the outcome of the library crawl."""
+        self.crawl_button.setText("Cache All Playlists")
+        self.crawl_button.setEnabled(bool(self.personal_playlists) and
+                                     self.auth_manager.can_access_personal_content())
+
+        failed = summary['failed']
+        status = f"Cached {summary['cached']} playlists"
+        if failed:
+            status += f", {len(failed)} failed"
+        if summary['stopped']:
+            status += " (stopped)"
+        self.status_label.setText(status)
+
+        if failed:
+            listed = "\n".join(f"• {playlist.get('title', 'Unknown Playlist')}: {error}"
+                               for playlist, error in failed[:10])
+            if len(failed) > 10:
+                listed += f"\n... and {len(failed) - 10} more"
+            QMessageBox.warning(self, "Some Playlists Not Cached",
+                              f"{len(failed)} playlist(s) could not be cached:\n\n{listed}")
+
+    def ask_export_path(self, title: str, default_name: str) -> Optional[tuple]:
+        """Ask where to export tracks to.
+
+        Returns:
+            (path, export format), or None if the dialog was cancelled
+        """
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, title, default_name, ";;".join(EXPORT_FILTERS))
+        if not path:
+            return None
+
+        export_format = format_for_path(path)
+        if export_format is None:
+            export_format = EXPORT_FILTERS.get(selected_filter, 'csv')
+            path += f".{export_format}"
+        return path, export_format
+
+    def export_playlist(self):
+        """Export the tracks on display, in playlist order."""
+        if not self.tracks_data:
+            self.status_label.setText("Nothing to export - fetch a playlist first")
+            return
+
+        choice = self.ask_export_path("Export Playlist", f"{self.current_playlist_id or 'playlist'}.csv")
+        if choice is None:
+            return
+        path, export_format = choice
+
+        try:
+            count = export_tracks(path, self.tracks_data, self.current_playlist_id or '', export_format)
+        except Exception as e:
+            QMessageBox.warning(self, "Export Failed", f"Could not export the playlist:\n\n{e}")
+            return
+        self.status_label.setText(f"💾 Exported {count} tracks to {path}")
+
+    def export_library(self):
+        """Export every cached playlist into one file in the background."""
+        if self.playlist_cache is None or (self.exporter_thread and self.exporter_thread.isRunning()):
+            return
+
+        extension = "parquet" if ARROW_AVAILABLE else "csv"
+        choice = self.ask_export_path("Export Cached Library", f"playlistcat-library.{extension}")
+        if choice is None:
+            return
+        path, export_format = choice
+
+        self.exporter_thread = LibraryExporter(self.playlist_cache, path, export_format)
+        self.exporter_thread.export_finished.connect(self.on_library_exported)
+        self.exporter_thread.error_occurred.connect(self.on_library_export_error)
+        self.exporter_thread.start()
+
+        self.export_library_button.setEnabled(False)
+        self.status_label.setText(f"Exporting cached playlists to {path}...")
+
+    def on_library_exported(self, summary: dict):
+        """Report a finished library export."""
+        self.export_library_button.setEnabled(True)
+        self.status_label.setText(
+            f"💾 Exported {summary['tracks']} tracks from {summary['playlists']} cached playlists "
+            f"to {self.exporter_thread.path}")
+
+    def on_library_export_error(self, error_message: str):
+        """Report a failed library export."""
+        self.export_library_button.setEnabled(True)
+        self.status_label.setText("Library export failed")
+        QMessageBox.warning(self, "Export Failed", error_message)
 
     def on_personal_playlist_selected(self, text: str):
         """Handle personal playlist selection"""
@@ -548,7 +1159,8 @@ class YouTubeMusicPlaylistViewer(QMainWindow):
             QMessageBox.warning(self, "Warning", "Invalid playlist ID format")
             return
 
-        self.start_fetch(playlist_id)
+        # Continue an interrupted fetch of the same playlist rather than restarting it
+        self.start_fetch(playlist_id, resume=True)
 
     def refresh_playlist(self):
         """Refresh the current playlist."""
@@ -558,27 +1170,72 @@ class YouTubeMusicPlaylistViewer(QMainWindow):
             if playlist_id and validate_playlist_id(playlist_id):
                 self.start_fetch(playlist_id)
 
-    def start_fetch(self, playlist_id: str):
-        """Start the background fetch process."""
-        if self.fetcher_thread and self.fetcher_thread.isRunning():
-            self.fetcher_thread.terminate()
-            self.fetcher_thread.wait()
+    def start_fetch(self, playlist_id: str, resume: bool = False):
+        """Start the background fetch process.
+
+        Args:
+            playlist_id: Playlist to fetch
+            resume: Continue an interrupted (failed or cancelled) fetch of the
+                same playlist from its last continuation page instead of
+                starting over
+        """
+        previous = self.fetcher_thread
+        resume_from = None
+        if (resume and previous is not None and previous.playlist_id == playlist_id
+                and not self.refresh_in_place):
+            if previous.isRunning() and previous.isInterruptionRequested():
+                # A cancelled fetch stops at its current page boundary, which
+                # may be a slow request away; resume once it gets there
+                self.resume_when_finished(previous)
+                return
+            if not previous.isRunning() and previous.is_resumable():
+                resume_from = previous
+
+        self.cancel_fetch()
 
         # Store current playlist ID for refresh functionality
+        previous_playlist_id = self.current_playlist_id
         self.current_playlist_id = playlist_id
 
         # Update UI for loading state
         self.fetch_button.setEnabled(False)
         self.refresh_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # Indeterminate progress
         self.status_label.setText("Fetching playlist...")
 
-        # Get YTMusic instance from auth manager
-        ytmusic = self.auth_manager.get_ytmusic()
-        if ytmusic:
+        # Refetching the playlist on display, or a previously fetched copy
+        # shown right away, is brought up to date in place once the fetch
+        # completes. Diffing needs both versions in memory, so in low-memory
+        # mode the fetched pages replace the rows instead.
+        low_memory = self.low_memory_checkbox.isChecked()
+        self.refresh_in_place = False
+        if resume_from is None:
+            if playlist_id == previous_playlist_id and self.track_model.rowCount() > 0:
+                if not low_memory:
+                    self.refresh_in_place = True
+                    self.status_label.setText("Checking for updates...")
+            else:
+                self.refresh_in_place = self.show_cached_playlist(playlist_id) and not low_memory
+
+        # Workers fetch through the auth manager's service and its client pool
+        service = self.auth_manager.get_service()
+        if service.available:
             # Start background thread
-            self.fetcher_thread = PlaylistFetcher(ytmusic, playlist_id)
+            if resume_from is not None:
+                self.fetcher_thread = PlaylistFetcher(
+                    service, playlist_id, resume_from.continuation, resume_from.position,
+                    resume_from.loaded, resume_from.total, keep_tracks=not low_memory)
+                # Pages continue the rows that are already shown
+                self.fetch_received_tracks = True
+            else:
+                # An explicit refresh must not be answered from the HTTP response cache
+                self.fetcher_thread = PlaylistFetcher(service, playlist_id, cache=self.playlist_cache,
+                                                      revalidate=not resume, keep_tracks=not low_memory)
+                self.fetch_received_tracks = False
+            self.fetcher_thread.tracks_ready.connect(self.on_tracks_ready)
+            self.fetcher_thread.progress_changed.connect(self.on_fetch_progress)
             self.fetcher_thread.data_ready.connect(self.on_data_ready)
             self.fetcher_thread.error_occurred.connect(self.on_error)
             self.fetcher_thread.progress_update.connect(self.on_progress_update)
@@ -587,93 +1244,217 @@ class YouTubeMusicPlaylistViewer(QMainWindow):
             QMessageBox.critical(self, "Error", "YouTube Music API not available")
             self.fetch_button.setEnabled(True)
             self.refresh_button.setEnabled(True)
+            self.cancel_button.setEnabled(False)
             self.progress_bar.setVisible(False)
 
-    def on_data_ready(self, tracks: List[Dict[str, Any]]):
-        """Handle successful data fetch."""
+    def show_cached_playlist(self, playlist_id: str) -> bool:
+        """Display the cached copy of a playlist, if there is one.
+
+        Returns:
+            True if cached tracks are now shown
+        """
+        if self.playlist_cache is None:
+            return False
+
+        try:
+            info = self.playlist_cache.get_info(playlist_id)
+            if info is None:
+                tracks = None
+            elif self.low_memory_checkbox.isChecked():
+                tracks = self.new_track_list(self.playlist_cache.iter_tracks(playlist_id))
+            else:
+                tracks = self.playlist_cache.load_tracks(playlist_id)
+        except Exception as e:
+            print(f"⚠️  Could not read playlist cache: {e}")
+            return False
+
+        if tracks is None:
+            return False
+
         self.tracks_data = tracks
         self.populate_table()
+        age = format_age(time.time() - info['fetched_at'])
+        self.status_label.setText(
+            f"Showing {len(tracks)} cached tracks (fetched {age}) - checking for updates...")
+        return True
+
+    def new_track_list(self, tracks) -> list:
+        """Collect tracks for display: in memory, or in a disk-backed list in low-memory mode."""
+        if self.low_memory_checkbox.isChecked():
+            return MappedTrackList(tracks)
+        return list(tracks)
+
+    def resume_when_finished(self, fetcher: PlaylistFetcher):
+        """Resume a cancelled fetch once its in-flight page request has returned."""
+        self.fetch_button.setEnabled(False)
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Finishing the current page before continuing...")
+        if self.resume_pending is not fetcher:
+            self.resume_pending = fetcher
+            fetcher.finished.connect(lambda: self.on_cancelled_fetch_finished(fetcher))
+
+    def on_cancelled_fetch_finished(self, fetcher: PlaylistFetcher):
+        """Continue the fetch that was waiting for a cancelled fetcher to stop."""
+        if self.resume_pending is not fetcher:
+            return
+        self.resume_pending = None
+        if self.fetcher_thread is not fetcher:
+            # Another fetch or a refresh was started in the meantime
+            return
+        # finished is emitted as the thread exits, so this returns at once
+        fetcher.wait()
+        self.start_fetch(fetcher.playlist_id, resume=True)
+
+    def cancel_fetch(self):
+        """Drop the current playlist fetch so that a new one can take its place.
+
+        A running fetcher is asked to stop at its next page boundary and is
+        kept alive until its in-flight request returns; anything it still
+        emits is ignored.
+        """
+        fetcher = self.fetcher_thread
+        self.fetcher_thread = None
+        if fetcher is None or not fetcher.isRunning():
+            return
+
+        fetcher.cancel()
+        self.retired_threads.append(fetcher)
+        fetcher.finished.connect(lambda: self.retired_threads.remove(fetcher))
+
+    def on_cancel_clicked(self):
+        """Handle the Cancel button: stop the fetch but keep what was loaded."""
+        fetcher = self.fetcher_thread
+        if fetcher is None or not fetcher.isRunning():
+            return
+
+        # Keep the fetcher as the current one so that a page it is already
+        # delivering still lands and its resume point stays valid
+        fetcher.cancel()
+
+        self.fetch_button.setEnabled(True)
+        self.refresh_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        self.status_label.setText(
+            f"Fetch cancelled - {len(self.tracks_data)} tracks loaded. "
+            "Click 'Fetch Playlist' to continue or 'Refresh' to start over.")
+
+    def is_current_fetch(self) -> bool:
+        """Check whether the signal being handled comes from the current fetcher."""
+        return self.fetcher_thread is not None and self.sender() is self.fetcher_thread
+
+    @tracing.traced(category="ui")
+    def on_tracks_ready(self, tracks: List[Track]):
+        """Show a page of tracks as soon as it has been fetched."""
+        if not self.is_current_fetch() or self.refresh_in_place:
+            # Tracks on display stay untouched until the refresh can be diffed in
+            return
+
+        if not self.fetch_received_tracks:
+            # First page of a new fetch replaces whatever was shown before
+            self.fetch_received_tracks = True
+            self.tracks_data = self.new_track_list(tracks)
+            self.populate_table()
+        else:
+            self.track_model.append_tracks(tracks)
+
+    def on_fetch_progress(self, loaded: int, total: int):
+        """Drive the progress bar from the playlist's reported track count."""
+        if not self.is_current_fetch() or self.fetcher_thread.isInterruptionRequested():
+            return
+
+        if total > 0:
+            self.progress_bar.setRange(0, max(total, loaded))
+            self.progress_bar.setValue(loaded)
+
+    @tracing.traced(category="ui")
+    def on_data_ready(self, tracks: List[Track]):
+        """Handle successful data fetch."""
+        if not self.is_current_fetch():
+            return
+
+        if self.refresh_in_place:
+            # Patch only the rows that changed; sort and scroll position are kept
+            diff = self.track_model.update_tracks(tracks)
+            changes = []
+            if diff['added']:
+                changes.append(f"{len(diff['added'])} added")
+            if diff['removed']:
+                changes.append(f"{len(diff['removed'])} removed")
+            if diff['moved']:
+                changes.append(f"{diff['moved']} moved")
+            if changes:
+                status = f"Playlist updated: {', '.join(changes)} - {len(self.tracks_data)} tracks"
+            else:
+                status = f"Playlist is up to date - {len(self.tracks_data)} tracks"
+        else:
+            if not self.fetch_received_tracks:
+                self.tracks_data = tracks
+                self.populate_table()
+            status = f"Loaded {len(self.tracks_data)} tracks"
+        self.refresh_in_place = False
 
         # Update UI
         self.fetch_button.setEnabled(True)
         self.refresh_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
         self.progress_bar.setVisible(False)
-        self.status_label.setText(f"Loaded {len(tracks)} tracks")
+        self.status_label.setText(status)
 
     def on_error(self, error_message: str):
         """Handle fetch error."""
+        if not self.is_current_fetch():
+            return
+
+        if self.refresh_in_place:
+            # Keep showing the current tracks rather than interrupting with a dialog
+            self.refresh_in_place = False
+            self.fetch_button.setEnabled(True)
+            self.refresh_button.setEnabled(True)
+            self.cancel_button.setEnabled(False)
+            self.progress_bar.setVisible(False)
+            self.status_label.setText(
+                f"Showing {len(self.tracks_data)} tracks - could not check for updates: {error_message}")
+            return
+
+        resumable = self.fetcher_thread.is_resumable()
+        if resumable:
+            error_message += (f"\n\n{len(self.tracks_data)} tracks were loaded before the error. "
+                              "Click 'Fetch Playlist' to continue from where it stopped.")
         QMessageBox.critical(self, "Error", error_message)
 
         # Reset UI
         self.fetch_button.setEnabled(True)
         self.refresh_button.setEnabled(
             bool(self.playlist_input.text().strip()))
+        self.cancel_button.setEnabled(False)
         self.progress_bar.setVisible(False)
-        self.status_label.setText("Error occurred while fetching playlist")
+        if resumable:
+            self.status_label.setText(
+                f"Fetch interrupted after {len(self.tracks_data)} tracks - click 'Fetch Playlist' to resume")
+        else:
+            self.status_label.setText("Error occurred while fetching playlist")
 
     def on_progress_update(self, message: str):
         """Update progress status."""
+        if not self.is_current_fetch() or self.fetcher_thread.isInterruptionRequested():
+            return
+        if self.refresh_in_place:
+            message = f"Checking for updates ({message.rstrip('.')})"
         self.status_label.setText(message)
 
+    @tracing.traced(category="ui")
     def populate_table(self):
         """Populate the table with track data."""
-        self.table.setRowCount(len(self.tracks_data))
-
-        for row, track in enumerate(self.tracks_data):
-            # Position
-            pos_item = QTableWidgetItem(str(track['position']))
-            pos_item.setData(Qt.ItemDataRole.UserRole, track['position'])
-            pos_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 0, pos_item)
-
-            # Artist
-            artist_item = QTableWidgetItem(track['artist'])
-            artist_item.setData(Qt.ItemDataRole.UserRole, track['artist'])
-            self.table.setItem(row, 1, artist_item)
-
-            # Track Name
-            title_item = QTableWidgetItem(track['title'])
-            title_item.setData(Qt.ItemDataRole.UserRole, track['title'])
-            self.table.setItem(row, 2, title_item)
-
-            # YouTube Music Link
-            if track['url']:
-                link_item = QTableWidgetItem("🎵 Open")
-                link_item.setData(Qt.ItemDataRole.UserRole, track['url'])
-                link_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                link_item.setToolTip(f"Double-click to open: {track['url']}")
-            else:
-                link_item = QTableWidgetItem("N/A")
-                link_item.setData(Qt.ItemDataRole.UserRole, "")
-                link_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            self.table.setItem(row, 3, link_item)
-
-            # Remove Button
-            remove_button = QPushButton("🗑️ Remove")
-            remove_button.setToolTip(f"Remove '{track['title']}' from the list")
-            remove_button.clicked.connect(lambda checked, r=row: self.remove_track(r))
-            remove_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #ff6b6b;
-                    color: white;
-                    border: none;
-                    padding: 4px 8px;
-                    border-radius: 3px;
-                    font-size: 10px;
-                }
-                QPushButton:hover {
-                    background-color: #ff5252;
-                }
-                QPushButton:pressed {
-                    background-color: #e53935;
-                }
-            """)
-            self.table.setCellWidget(row, 4, remove_button)
+        self.track_model.set_tracks(self.tracks_data)
 
+    @tracing.traced(category="ui")
     def sort_table(self, logical_index: int):
         """Handle custom sorting for the first three columns."""
+        header = self.table.horizontalHeader()
         if logical_index > 2:  # Only sort first three columns (skip Link and Remove)
+            # The header flips its indicator on any click; put it back
+            header.setSortIndicator(self.sort_proxy.sort_column(), self.sort_proxy.sort_order())
             return
 
         # Toggle sort order if clicking the same column
@@ -688,138 +1469,202 @@ class YouTubeMusicPlaylistViewer(QMainWindow):
 
         self.current_sort_column = logical_index
 
-        # Sort the data
+        # Sort through the proxy: the precomputed collation keys are compared
+        # directly and the view is only told that its row order changed.
+        # Positions are never renumbered - they stay as original YouTube Music order
+        self.sort_proxy.sort(logical_index, self.current_sort_order)
+        header.setSortIndicator(logical_index, self.current_sort_order)
         reverse = self.current_sort_order == Qt.SortOrder.DescendingOrder
 
-        if logical_index == 0:  # Position - sort by original YouTube Music position
-            self.tracks_data.sort(key=lambda x: int(
-                x['position']), reverse=reverse)
-        elif logical_index == 1:  # Artist - sort by artist but keep original positions
-            self.tracks_data.sort(
-                key=lambda x: x['artist'].lower(), reverse=reverse)
-        elif logical_index == 2:  # Track Name - sort by title but keep original positions
-            self.tracks_data.sort(
-                key=lambda x: x['title'].lower(), reverse=reverse)
-
-        # Note: We DO NOT renumber positions here - they stay as original YouTube Music order
-        # Repopulate table with sorted data
-        self.populate_table()
-
         # Update status
         sort_order_text = "descending" if reverse else "ascending"
         column_names = ["Position", "Artist", "Track Name"]
         self.status_label.setText(
             f"Sorted by {column_names[logical_index]} ({sort_order_text})")
 
-    def open_track_url(self, item: QTableWidgetItem):
+    def open_track_url(self, index: QModelIndex):
         """Open the YouTube Music URL for the selected track."""
-        row = item.row()
-        url_item = self.table.item(row, 3)
+        if not index.isValid() or index.column() == TrackTableModel.COLUMN_REMOVE:
+            return
+
+        track = self.track_model.track_for_key(index.data(TrackKeyRole))
+        if track is None:
+            return
 
-        if url_item and url_item.data(Qt.ItemDataRole.UserRole):
-            url = url_item.data(Qt.ItemDataRole.UserRole)
-            webbrowser.open(url)
+        if track['url']:
+            webbrowser.open(track['url'])
         else:
-            track_item = self.table.item(row, 2)
-            track_name = track_item.text() if track_item else "Unknown Track"
+            track_name = track.get('title', 'Unknown Track')
             QMessageBox.information(
                 self,
                 "No URL Available",
                 f"No YouTube Music URL available for '{track_name}'"
             )
 
-    def remove_track(self, row: int):
-        """Remove a track from the playlist."""
-        if row < 0 or row >= len(self.tracks_data):
+    def on_selection_changed(self, selected=None, deselected=None):
+        """Enable the Remove Selected button while rows are selected."""
+        selection_model = self.table.selectionModel()
+        self.remove_selected_button.setEnabled(
+            bool(selection_model and selection_model.hasSelection()))
+
+    def selected_track_keys(self) -> list:
+        """Get the track keys of the selected rows, in display order."""
+        selection_model = self.table.selectionModel()
+        if not selection_model:
+            return []
+        rows = sorted(index.row() for index in selection_model.selectedRows())
+        return [self.sort_proxy.index(row, 0).data(TrackKeyRole) for row in rows]
+
+    def remove_selected_tracks(self):
+        """Remove all selected tracks from the playlist."""
+        keys = self.selected_track_keys()
+        if keys:
+            self.remove_tracks(keys)
+
+    def remove_track(self, key: str):
+        """Remove a track, identified by its track key, from the playlist."""
+        self.remove_tracks([key])
+
+    def remove_tracks(self, keys: list):
+        """Remove tracks, identified by their track keys, from the playlist.
+
+        All tracks are confirmed with one dialog and disappear from the
+        table immediately. The server is updated with batched requests on a
+        TrackRemover thread, so several removals can be in flight at once;
+        tracks the server refuses are reported and put back.
+        """
+        tracks = [track for track in (self.track_model.track_for_key(key) for key in keys)
+                  if track is not None]
+        if not tracks:
             return
 
-        # Get track info for confirmation
-        track = self.tracks_data[row]
-        track_name = track.get('title', 'Unknown Track')
-        artist_name = track.get('artist', 'Unknown Artist')
-
         # Confirm removal
+        if len(tracks) == 1:
+            track_name = tracks[0].get('title', 'Unknown Track')
+            artist_name = tracks[0].get('artist', 'Unknown Artist')
+            question = (f"Are you sure you want to remove this track from the playlist?\n\n"
+                        f"🎵 {track_name}\n"
+                        f"👤 {artist_name}")
+        else:
+            listed = "\n".join(f"🎵 {track.get('artist', 'Unknown Artist')} - "
+                               f"{track.get('title', 'Unknown Track')}" for track in tracks[:10])
+            if len(tracks) > 10:
+                listed += f"\n... and {len(tracks) - 10} more"
+            question = (f"Are you sure you want to remove these {len(tracks)} tracks "
+                        f"from the playlist?\n\n{listed}")
+
         reply = QMessageBox.question(
             self,
-            "Remove Track",
-            f"Are you sure you want to remove this track from the playlist?\n\n"
-            f"🎵 {track_name}\n"
-            f"👤 {artist_name}",
+            "Remove Tracks" if len(tracks) > 1 else "Remove Track",
+            question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             QMessageBox.StandardButton.No
         )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
 
-        if reply == QMessageBox.StandardButton.Yes:
-            # Try to remove from server first
-            server_removal_success = False
+        playlist_id = getattr(self, 'current_playlist_id', '')
+        service = self.auth_manager.get_service()
+        can_sync = bool(playlist_id and service.available and
+                        any(track.get('video_id') and track.get('set_video_id') for track in tracks))
+
+        # Remove the rows right away; the model shares self.tracks_data and
+        # only notifies the view about the removed rows, one contiguous run
+        # at a time. Tracks the server refuses are put back when it answers.
+        # Note: We preserve original YouTube Music position numbers
+        # No renumbering - positions may have gaps after removal, which is correct
+        # This ensures position sorting always reflects original YouTube Music order
+        self.track_model.remove_tracks([track_key(track) for track in tracks])
+
+        if not can_sync:
+            self.status_label.setText(
+                f"📝 {len(tracks)} track(s) removed from display (read-only mode). "
+                f"{len(self.tracks_data)} tracks remaining.")
+            return
 
-            # Check if we have the required IDs for server removal
-            video_id = track.get('video_id', '')
-            set_video_id = track.get('set_video_id', '')
-            playlist_id = getattr(self, 'current_playlist_id', '')
-            ytmusic = self.auth_manager.get_ytmusic() if self.auth_manager else None
+        remover = TrackRemover(service, playlist_id, tracks)
+        remover.removal_finished.connect(self.on_removal_finished)
+        remover.finished.connect(lambda: self.removal_threads.remove(remover))
+        self.removal_threads.append(remover)
+        remover.start()
 
-            if video_id and set_video_id and playlist_id and ytmusic:
+        self.status_label.setText(
+            f"Removing {len(tracks)} track(s) from server... "
+            f"({len(self.removal_threads)} removal(s) in progress)")
+
+    def on_removal_finished(self, result: dict):
+        """Handle the server's answer to a background track removal."""
+        remover = self.sender()
+        playlist_id = remover.playlist_id
+        removed = result['removed']
+        failed = result['failed']
+
+        if removed:
+            if self.playlist_cache is not None:
                 try:
-                    self.status_label.setText("Removing track from server...")
-
-                    # Prepare the removal data
-                    videos_to_remove = [{
-                        'videoId': video_id,
-                        'setVideoId': set_video_id
-                    }]
-
-                    # Call the YouTube Music API to remove from server
-                    result = ytmusic.remove_playlist_items(playlist_id, videos_to_remove)
-
-                    if result:  # API returns success status
-                        server_removal_success = True
-                        self.status_label.setText("✅ Track removed from server successfully")
-                    else:
-                        self.status_label.setText("⚠️ Server removal may have failed")
-
-                except Exception as e:
-                    self.status_label.setText(f"❌ Server removal failed: {str(e)}")
-                    # Ask user if they want to continue with local removal
-                    reply = QMessageBox.question(
-                        self,
-                        "Server Removal Failed",
-                        f"Failed to remove track from server:\n{str(e)}\n\n"
-                        f"Do you want to remove it from the local display anyway?",
-                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                        QMessageBox.StandardButton.No
-                    )
-                    if reply != QMessageBox.StandardButton.Yes:
-                        return
-
-            # Remove from local data (always do this, whether server removal succeeded or not)
-            self.tracks_data.pop(row)
-
-            # Note: We preserve original YouTube Music position numbers
-            # No renumbering - positions may have gaps after removal, which is correct
-            # This ensures position sorting always reflects original YouTube Music order
+                    self.playlist_cache.remove_tracks(
+                        playlist_id, [track['set_video_id'] for track in removed])
+                except Exception as cache_error:
+                    print(f"⚠️  Could not update playlist cache: {cache_error}")
+            if playlist_id == self.current_playlist_id:
+                # A refresh that completed in the meantime may have brought them back
+                self.track_model.remove_tracks([track_key(track) for track in removed])
+
+        for track, error in failed:
+            print(f"❌ Could not remove '{track.get('title', '')}' from server: {error}")
+
+        # Enable refresh button if we have a current playlist
+        if self.current_playlist_id:
+            self.refresh_button.setEnabled(True)
 
-            # Refresh the table display
-            self.populate_table()
+        # Other removals finishing later report their own results
+        in_progress = sum(1 for thread in self.removal_threads if thread is not remover)
+        pending_text = f" ({in_progress} removal(s) still in progress)" if in_progress else ""
+        remaining = len(self.tracks_data)
 
-            # Update status message
-            if server_removal_success:
+        if not failed:
+            if len(removed) == 1:
                 self.status_label.setText(
-                    f"✅ Removed '{track_name}' from playlist. {len(self.tracks_data)} tracks remaining.")
-            elif video_id and set_video_id and playlist_id:
-                self.status_label.setText(
-                    f"⚠️ '{track_name}' removed locally. Server sync may be needed. {len(self.tracks_data)} tracks remaining.")
+                    f"✅ Removed '{removed[0].get('title', 'Unknown Track')}' from playlist. "
+                    f"{remaining} tracks remaining.{pending_text}")
             else:
                 self.status_label.setText(
-                    f"📝 '{track_name}' removed from display (read-only mode). {len(self.tracks_data)} tracks remaining.")
+                    f"✅ Removed {len(removed)} tracks from playlist. {remaining} tracks remaining.{pending_text}")
+            return
 
-            # Enable refresh button if we have a current playlist
-            if hasattr(self, 'current_playlist_id') and self.current_playlist_id:
-                self.refresh_button.setEnabled(True)
+        # Roll back the tracks the server refused
+        if playlist_id == self.current_playlist_id:
+            self.track_model.restore_tracks(track for track, error in failed)
+            remaining = len(self.tracks_data)
+
+        total = len(removed) + len(failed)
+        self.status_label.setText(
+            f"⚠️ Removed {len(removed)} of {total} track(s) from server; "
+            f"{len(failed)} restored. {remaining} tracks remaining.{pending_text}")
+
+        listed = "\n".join(f"• {track.get('title', 'Unknown Track')}: {error}"
+                           for track, error in failed[:10])
+        if len(failed) > 10:
+            listed += f"\n... and {len(failed) - 10} more"
+        QMessageBox.warning(
+            self,
+            "Server Removal Failed",
+            f"{len(failed)} of {total} track(s) could not be removed from the server "
+            f"and were put back in the playlist:\n\n{listed}"
+        )
 
 
 def main():
     """Main application entry point."""
+    # PLAYLISTCAT_TRACE=trace.json records a performance trace of the whole session
+    tracing.start_from_environment()
+
+    # Use the user's collation rules for the precomputed sort keys
+    try:
+        locale.setlocale(locale.LC_COLLATE, '')
+    except locale.Error:
+        pass
+
     app = QApplication(sys.argv)
     app.setApplicationName("PlaylistCat")
 
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache of fetched playlists
+Stores the normalized track records per playlist ID in an SQLite database in
+the user config directory, so previously seen playlists open instantly
+"""
+
+import os
+import time
+import uuid
+import sqlite3
+from typing import Optional, Dict, List, Any, Iterable, Iterator
+
+from utils import Track, get_config_dir, make_track
+
+# Playlist ID prefix of tracks written by a fetch that has not completed yet
+STAGING_PREFIX = "~staging:"
+# Seconds after its last page that a staged fetch counts as abandoned, e.g.
+# because the app was killed; younger ones may belong to another process
+STAGING_MAX_AGE = 60 * 60
+# Rows read from the database at a time when streaming a playlist
+READ_BATCH = 1000
+
+
+class PlaylistCache:
+    """SQLite-backed store of normalized playlist tracks and fetch timestamps
+
+    Every call opens its own short-lived connection, so a single cache
+    object can be shared between the GUI thread and fetcher threads.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS playlists (
+            playlist_id TEXT PRIMARY KEY,
+            title TEXT,
+            track_count INTEGER NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS tracks (
+            playlist_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            artist TEXT NOT NULL,
+            title TEXT NOT NULL,
+            video_id TEXT NOT NULL,
+            set_video_id TEXT NOT NULL,
+            PRIMARY KEY (playlist_id, position)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS staging (
+            staging_id TEXT PRIMARY KEY,
+            touched_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join(get_config_dir(), "playlist_cache.sqlite3")
+        conn = self._connect()
+        try:
+            conn.executescript(self.SCHEMA)
+            # Staged tracks of fetches that never completed. Fetches still
+            # running, possibly in another process, have touched theirs recently.
+            cutoff = time.time() - STAGING_MAX_AGE
+            with conn:
+                conn.execute("DELETE FROM staging WHERE touched_at < ?", (cutoff,))
+                conn.execute("DELETE FROM tracks WHERE playlist_id >= ? AND playlist_id < ? "
+                             "AND playlist_id NOT IN (SELECT staging_id FROM staging)",
+                             (STAGING_PREFIX, STAGING_PREFIX[:-1] + ";"))
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get_info(self, playlist_id: str) -> Optional[Dict[str, Any]]:
+        """Get title, track count and fetch time of a cached playlist, or None if not cached"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT title, track_count, fetched_at FROM playlists WHERE playlist_id = ?",
+                (playlist_id,)).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        return {'title': row[0], 'track_count': row[1], 'fetched_at': row[2]}
+
+    def cached_playlists(self) -> List[Dict[str, Any]]:
+        """Get ID, title, track count and fetch time of every cached playlist, by title"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT playlist_id, title, track_count, fetched_at FROM playlists "
+                "ORDER BY title COLLATE NOCASE, playlist_id").fetchall()
+        finally:
+            conn.close()
+
+        return [{'playlist_id': row[0], 'title': row[1], 'track_count': row[2], 'fetched_at': row[3]}
+                for row in rows]
+
+    def load_tracks(self, playlist_id: str) -> Optional[List[Track]]:
+        """
+        Load the cached tracks of a playlist in playlist order.
+
+        Returns:
+            Track records as built by make_track(), or None if the playlist is not cached
+        """
+        conn = self._connect()
+        try:
+            if conn.execute("SELECT 1 FROM playlists WHERE playlist_id = ?",
+                            (playlist_id,)).fetchone() is None:
+                return None
+            rows = conn.execute(
+                "SELECT position, artist, title, video_id, set_video_id FROM tracks "
+                "WHERE playlist_id = ? ORDER BY position", (playlist_id,)).fetchall()
+        finally:
+            conn.close()
+
+        return [make_track(*row) for row in rows]
+
+    def iter_tracks(self, playlist_id: str) -> Iterator[Track]:
+        """Stream the cached tracks of a playlist in playlist order, without loading them all at once"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "SELECT position, artist, title, video_id, set_video_id FROM tracks "
+                "WHERE playlist_id = ? ORDER BY position", (playlist_id,))
+            while True:
+                rows = cursor.fetchmany(READ_BATCH)
+                if not rows:
+                    break
+                for row in rows:
+                    yield make_track(*row)
+        finally:
+            conn.close()
+
+    def save_tracks(self, playlist_id: str, tracks: Iterable[Track],
+                    title: Optional[str] = None, fetched_at: Optional[float] = None):
+        """Replace the cached contents of a playlist with freshly fetched tracks"""
+        rows = [(playlist_id, track.position, track.artist, track.title,
+                 track.video_id, track.set_video_id) for track in tracks]
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM tracks WHERE playlist_id = ?", (playlist_id,))
+                conn.executemany(
+                    "INSERT INTO tracks (playlist_id, position, artist, title, video_id, set_video_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO playlists (playlist_id, title, track_count, fetched_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (playlist_id, title, len(rows), fetched_at if fetched_at is not None else time.time()))
+        finally:
+            conn.close()
+
+    def begin_staged_tracks(self, playlist_id: str) -> str:
+        """
+        Start writing a playlist page by page, for fetches that don't keep every track in memory.
+
+        Pages are added with append_staged_tracks() and only replace the
+        cached playlist when commit_staged_tracks() is called.
+
+        Returns:
+            Staging ID to pass to the other staged calls
+        """
+        staging_id = f"{STAGING_PREFIX}{os.getpid()}:{uuid.uuid4().hex}:{playlist_id}"
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("INSERT INTO staging (staging_id, touched_at) VALUES (?, ?)",
+                             (staging_id, time.time()))
+        finally:
+            conn.close()
+        return staging_id
+
+    def append_staged_tracks(self, staging_id: str, tracks: Iterable[Track]):
+        """Add a page of freshly fetched tracks to a staged playlist"""
+        rows = [(staging_id, track.position, track.artist, track.title,
+                 track.video_id, track.set_video_id) for track in tracks]
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO tracks (playlist_id, position, artist, title, video_id, set_video_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("UPDATE staging SET touched_at = ? WHERE staging_id = ?",
+                             (time.time(), staging_id))
+        finally:
+            conn.close()
+
+    def commit_staged_tracks(self, staging_id: str, playlist_id: str, title: Optional[str] = None,
+                             fetched_at: Optional[float] = None):
+        """Replace the cached contents of a playlist with the tracks staged for it"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM tracks WHERE playlist_id = ?", (playlist_id,))
+                conn.execute("UPDATE tracks SET playlist_id = ? WHERE playlist_id = ?",
+                             (playlist_id, staging_id))
+                conn.execute("DELETE FROM staging WHERE staging_id = ?", (staging_id,))
+                count = conn.execute("SELECT COUNT(*) FROM tracks WHERE playlist_id = ?",
+                                     (playlist_id,)).fetchone()[0]
+                conn.execute(
+                    "INSERT OR REPLACE INTO playlists (playlist_id, title, track_count, fetched_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (playlist_id, title, count, fetched_at if fetched_at is not None else time.time()))
+        finally:
+            conn.close()
+
+    def discard_staged_tracks(self, staging_id: str):
+        """Drop the tracks of a staged playlist whose fetch did not complete"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM tracks WHERE playlist_id = ?", (staging_id,))
+                conn.execute("DELETE FROM staging WHERE staging_id = ?", (staging_id,))
+        finally:
+            conn.close()
+
+    def remove_tracks(self, playlist_id: str, set_video_ids: Iterable[str]):
+        """Drop tracks that were removed from the playlist on the server"""
+        ids = [(playlist_id, set_video_id) for set_video_id in set_video_ids if set_video_id]
+        if not ids:
+            return
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "DELETE FROM tracks WHERE playlist_id = ? AND set_video_id = ?", ids)
+                conn.execute(
+                    "UPDATE playlists SET track_count = "
+                    "(SELECT COUNT(*) FROM tracks WHERE playlist_id = ?) WHERE playlist_id = ?",
+                    (playlist_id, playlist_id))
+        finally:
+            conn.close()
+
+    def delete(self, playlist_id: str):
+        """Remove a playlist from the cache"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM tracks WHERE playlist_id = ?", (playlist_id,))
+                conn.execute("DELETE FROM playlists WHERE playlist_id = ?", (playlist_id,))
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Remove every cached playlist"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM tracks")
+                conn.execute("DELETE FROM playlists")
+        finally:
+            conn.close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Server-side playlist edits for YouTube Music
+Removes many tracks with a few batched remove_playlist_items requests and
+reports the outcome per track
+"""
+
+from typing import Dict, List, Any, Tuple
+
+import requests
+
+# Number of tracks sent in a single remove_playlist_items request
+REMOVE_BATCH_SIZE = 100
+
+
+def _removal_succeeded(result: Any) -> bool:
+    """Interpret the return value of YTMusic.remove_playlist_items"""
+    if isinstance(result, str):
+        return result == "STATUS_SUCCEEDED"
+    return bool(result)
+
+
+def remove_playlist_tracks(ytmusic, playlist_id: str, tracks: List[Dict[str, Any]],
+                           batch_size: int = REMOVE_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Remove tracks from a playlist on the server in batches.
+
+    Tracks are sent batch_size at a time. When the server rejects a batch,
+    it is split in halves and retried so that the failure can be pinned
+    to the individual tracks that caused it; connection problems fail all
+    remaining tracks at once instead.
+
+    Args:
+        ytmusic: Authenticated YTMusic instance
+        playlist_id: Playlist to remove the tracks from
+        tracks: Track records with video_id and set_video_id
+        batch_size: Maximum number of tracks per request
+
+    Returns:
+        Dictionary with:
+        - removed: tracks that were removed on the server
+        - failed: list of (track, error message) tuples
+    """
+    removed: List[Dict[str, Any]] = []
+    failed: List[Tuple[Dict[str, Any], str]] = []
+
+    removable = []
+    for track in tracks:
+        if track.get('video_id') and track.get('set_video_id'):
+            removable.append(track)
+        else:
+            failed.append((track, "Missing setVideoId - the playlist may not be yours"))
+
+    # Work queue of batches; failed batches are split and pushed back in front
+    pending = [removable[i:i + batch_size] for i in range(0, len(removable), batch_size)]
+    while pending:
+        batch = pending.pop(0)
+        videos = [{'videoId': track['video_id'], 'setVideoId': track['set_video_id']}
+                  for track in batch]
+
+        try:
+            result = ytmusic.remove_playlist_items(playlist_id, videos)
+            error = None if _removal_succeeded(result) else f"Server returned {result}"
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # Nothing more will get through; don't hammer the server with retries
+            for track in batch + [track for rest in pending for track in rest]:
+                failed.append((track, f"Connection error: {e}"))
+            break
+        except Exception as e:
+            error = str(e)
+
+        if error is None:
+            removed.extend(batch)
+        elif len(batch) == 1:
+            failed.append((batch[0], error))
+        else:
+            middle = len(batch) // 2
+            pending[0:0] = [batch[:middle], batch[middle:]]
+
+    return {'removed': removed, 'failed': failed}
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Page-by-page playlist retrieval for YouTube Music
+Walks a playlist's (or the library's) continuation pages one request at a
+time so callers can show results as soon as the first page arrives instead
+of waiting for ytmusicapi to download everything
+"""
+
+from typing import Optional, Dict, List, Any, Iterator
+
+try:
+    from ytmusicapi.continuations import get_continuation_token, CONTINUATION_ITEMS
+    from ytmusicapi.navigation import (
+        nav, TWO_COLUMN_RENDERER, TAB_CONTENT, SECTION, SECTION_LIST_ITEM, CONTENT,
+        HEADER, RESPONSIVE_HEADER, EDITABLE_PLAYLIST_DETAIL_HEADER
+    )
+    from ytmusicapi.parsers.playlists import parse_playlist_items, parse_playlist_header_meta
+    from ytmusicapi.continuations import get_continuation_params, get_continuation_contents
+    from ytmusicapi.navigation import GRID
+    from ytmusicapi.parsers.browsing import parse_content_list, parse_playlist
+    from ytmusicapi.parsers.library import get_library_contents
+    PAGED_FETCH_AVAILABLE = True
+except ImportError:
+    # Older ytmusicapi releases use a different continuation layout;
+    # fall back to fetching the whole playlist as a single page
+    PAGED_FETCH_AVAILABLE = False
+
+
+def _make_page(tracks, continuation: Optional[str], track_count: Optional[int] = None,
+               title: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        'tracks': tracks,
+        'continuation': continuation,  # Token for the *next* page, None on the last page
+        'track_count': track_count,
+        'title': title,
+    }
+
+
+def _parse_header(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract title and reported track count from the first playlist response"""
+    try:
+        header_data = nav(response, [*TWO_COLUMN_RENDERER, *TAB_CONTENT, *SECTION_LIST_ITEM])
+        if EDITABLE_PLAYLIST_DETAIL_HEADER[0] in header_data:
+            header = nav(header_data, [*EDITABLE_PLAYLIST_DETAIL_HEADER, *HEADER, *RESPONSIVE_HEADER])
+        else:
+            header = nav(header_data, RESPONSIVE_HEADER)
+        return parse_playlist_header_meta(header)
+    except (KeyError, IndexError, TypeError):
+        # Header layout differs (e.g. album audio playlists); the count is optional
+        return {}
+
+
+def iter_playlist_pages(ytmusic, playlist_id: str,
+                        continuation: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the pages of a playlist, one network request per page.
+
+    Each page is a dictionary with:
+    - tracks: raw ytmusicapi playlist items of this page
+    - continuation: token to pass back in to resume after this page, or None
+    - track_count: track count reported by the playlist header (first page only)
+    - title: playlist title (first page only)
+
+    Args:
+        ytmusic: YTMusic instance to fetch with
+        playlist_id: Playlist ID (with or without the "VL" browse prefix)
+        continuation: Token of the page to start from, as returned with an
+            earlier page. None starts from the beginning of the playlist.
+
+    Yields:
+        Page dictionaries in playlist order
+    """
+    if not PAGED_FETCH_AVAILABLE:
+        if continuation:
+            return
+        playlist_data = ytmusic.get_playlist(playlist_id, limit=None)
+        if not playlist_data:
+            return
+        yield _make_page(playlist_data.get('tracks', []), None,
+                         playlist_data.get('trackCount'), playlist_data.get('title'))
+        return
+
+    if continuation is None:
+        browse_id = playlist_id if playlist_id.startswith("VL") else "VL" + playlist_id
+        response = ytmusic._send_request("browse", {"browseId": browse_id})
+
+        content_data = nav(response, [*TWO_COLUMN_RENDERER, "secondaryContents", *SECTION,
+                                      *CONTENT, "musicPlaylistShelfRenderer"], True)
+        if content_data is None:
+            # Unknown response layout - let ytmusicapi handle the whole playlist
+            playlist_data = ytmusic.get_playlist(playlist_id, limit=None)
+            if playlist_data:
+                yield _make_page(playlist_data.get('tracks', []), None,
+                                 playlist_data.get('trackCount'), playlist_data.get('title'))
+            return
+
+        contents = content_data.get('contents', [])
+        continuation = get_continuation_token(contents) if contents else None
+        header = _parse_header(response)
+        yield _make_page(parse_playlist_items(contents), continuation,
+                         header.get('trackCount'), header.get('title'))
+
+    while continuation:
+        response = ytmusic._send_request("browse", {"continuation": continuation})
+        items = nav(response, CONTINUATION_ITEMS, True)
+        if not items:
+            return
+
+        tracks = parse_playlist_items(items)
+        if not tracks:
+            return
+
+        continuation = get_continuation_token(items)
+        yield _make_page(tracks, continuation)
+
+
+def iter_library_playlist_pages(ytmusic) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Iterate over the playlists in the user's library, one network request per page.
+
+    Unlike get_library_playlists(), there is no limit: every continuation
+    page is followed until the library is exhausted.
+
+    Args:
+        ytmusic: Authenticated YTMusic instance
+
+    Yields:
+        Lists of raw ytmusicapi library playlist items, in library order
+    """
+    if not PAGED_FETCH_AVAILABLE:
+        yield ytmusic.get_library_playlists(limit=None)
+        return
+
+    ytmusic._check_auth()
+    body = {"browseId": "FEmusic_liked_playlists"}
+    response = ytmusic._send_request("browse", body)
+
+    results = get_library_contents(response, GRID)
+    if results is None:
+        return
+    # The first grid item is the "New playlist" button
+    yield parse_content_list(results['items'][1:], parse_playlist)
+
+    while 'continuations' in results:
+        response = ytmusic._send_request("browse", body, get_continuation_params(results))
+        if 'continuationContents' not in response:
+            return
+        results = response['continuationContents']['gridContinuation']
+
+        playlists = get_continuation_contents(results, lambda items: parse_content_list(items, parse_playlist))
+        if not playlists:
+            return
+        yield playlists
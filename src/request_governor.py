@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Central throttling for YouTube Music requests
+Every HTTP request sent through http_session passes through one governor
+that paces requests with a token bucket, adapts the number of requests in
+flight (AIMD), retries throttled and failed requests with jittered
+exponential backoff and stops sending altogether for a while when the server
+keeps refusing (circuit breaker)
+"""
+
+import time
+import random
+import threading
+from typing import Callable, Optional, Dict, Any
+
+import requests
+
+import tracing
+
+# Token bucket: sustained requests per second and burst size
+RATE_PER_SECOND = 5.0
+BURST = 10
+# AIMD concurrency window
+INITIAL_CONCURRENCY = 4
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 8
+# Retries of a throttled or failed request, and their backoff in seconds.
+# Connection errors get fewer: when the network is down, the user should hear
+# about it soon
+MAX_RETRIES = 4
+MAX_CONNECTION_RETRIES = 2
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+# Consecutive throttled/failed requests that open the circuit, and for how long
+BREAKER_THRESHOLD = 8
+BREAKER_COOLDOWN = 60.0
+
+# Status codes that mean "slow down / try again later"; 401 and 403 are
+# authentication problems and are handed straight back to the caller
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# InnerTube endpoints that only read and can safely be sent again after a
+# timeout or server error. Anything else (e.g. browse/edit_playlist) may
+# already have been applied when the error came back.
+READ_ENDPOINTS = ('browse', 'search', 'next', 'player', 'account/account_menu',
+                  'music/get_search_suggestions')
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending while the circuit breaker is open"""
+
+
+def is_idempotent(method: str, endpoint: str) -> bool:
+    """Whether a request to an InnerTube endpoint can be retried after an ambiguous failure"""
+    return method.upper() in IDEMPOTENT_METHODS or endpoint in READ_ENDPOINTS
+
+
+class RequestGovernor:
+    """Rate limit, concurrency window, retries and circuit breaker for HTTP requests
+
+    Thread-safe; one instance is shared by every session in the process
+    (see get_governor()).
+    """
+
+    def __init__(self, rate: float = RATE_PER_SECOND, burst: int = BURST,
+                 concurrency: int = INITIAL_CONCURRENCY, min_concurrency: int = MIN_CONCURRENCY,
+                 max_concurrency: int = MAX_CONCURRENCY, max_retries: int = MAX_RETRIES,
+                 breaker_threshold: int = BREAKER_THRESHOLD, breaker_cooldown: float = BREAKER_COOLDOWN):
+        self.rate = rate
+        self.burst = burst
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+
+        self._condition = threading.Condition()
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._concurrency = float(concurrency)
+        self._in_flight = 0
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+        self._probing = False
+
+        self.sent = 0
+        self.throttled = 0
+        self.retried = 0
+
+    def _take_token(self) -> float:
+        """Take a token if one is available; otherwise return seconds until the next one"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _acquire(self):
+        """Wait for the circuit, a concurrency slot and a rate token"""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if now < self._open_until:
+                    raise CircuitOpenError(
+                        f"Too many throttled or failed requests (rate limit); "
+                        f"pausing requests for {int(self._open_until - now) + 1}s")
+                if self._open_until and self._probing:
+                    # Half-open: a single probe request decides whether to close the circuit
+                    self._condition.wait(0.5)
+                    continue
+                if self._in_flight >= int(self._concurrency):
+                    self._condition.wait()
+                    continue
+                delay = self._take_token()
+                if delay == 0.0:
+                    break
+                self._condition.wait(delay)
+
+            if self._open_until:
+                self._probing = True
+            self._in_flight += 1
+            self.sent += 1
+
+    def _release(self, outcome: str):
+        """Free the slot and adapt to the outcome: 'ok', 'throttled', 'failed' or 'neutral'"""
+        with self._condition:
+            self._in_flight -= 1
+            if outcome == 'ok':
+                # Additive increase: one more slot per window's worth of successes
+                self._concurrency = min(self.max_concurrency,
+                                        self._concurrency + 1.0 / max(1.0, self._concurrency))
+                self._consecutive_failures = 0
+                self._open_until = 0.0
+                self._probing = False
+            elif outcome in ('throttled', 'failed'):
+                if outcome == 'throttled':
+                    self.throttled += 1
+                    # Multiplicative decrease
+                    self._concurrency = max(self.min_concurrency, self._concurrency / 2)
+                    self._tokens = 0.0
+                self._consecutive_failures += 1
+                if self._probing or self._consecutive_failures >= self.breaker_threshold:
+                    self._open_until = time.monotonic() + self.breaker_cooldown
+                    self._probing = False
+                    print(f"⛔ Pausing YouTube Music requests for {int(self.breaker_cooldown)}s "
+                          f"after {self._consecutive_failures} failed requests")
+            else:
+                self._probing = False
+            self._condition.notify_all()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, at least as long as the server's Retry-After"""
+        delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        if retry_after:
+            try:
+                delay = max(delay, min(BACKOFF_CAP, float(retry_after)))
+            except ValueError:
+                pass
+        return delay
+
+    def send(self, request: Callable[[], requests.Response], idempotent: bool = True) -> requests.Response:
+        """
+        Send a request under the governor's control.
+
+        Throttled (429) responses are retried with backoff. Server errors,
+        timeouts and connection errors are retried only for idempotent
+        requests: a write may have been applied before the error came back,
+        so it is only sent again when it provably never arrived (a connect
+        timeout). When retries run out, the last response is returned (or
+        the last error raised) for the caller to handle.
+
+        Args:
+            request: Callable that performs the request and returns the response
+            idempotent: Whether sending the request twice is harmless, see is_idempotent()
+
+        Raises:
+            CircuitOpenError: If requests are paused after repeated failures
+        """
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                response = request()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._release('failed')
+                if not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                    raise
+                if attempt >= min(self.max_retries, MAX_CONNECTION_RETRIES):
+                    raise
+                delay = self._backoff(attempt)
+            except Exception:
+                self._release('neutral')
+                raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    # Success, or a client/auth error that retrying won't fix
+                    self._release('ok' if response.status_code < 400 else 'neutral')
+                    return response
+                self._release('throttled' if response.status_code == 429 else 'failed')
+                if attempt >= self.max_retries or not (idempotent or response.status_code == 429):
+                    return response
+                delay = self._backoff(attempt, response.headers.get('Retry-After'))
+
+            attempt += 1
+            with self._condition:
+                self.retried += 1
+            with tracing.span("Retry backoff", "network", attempt=attempt, seconds=round(delay, 3)):
+                time.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters and the current concurrency window"""
+        with self._condition:
+            return {
+                'sent': self.sent,
+                'throttled': self.throttled,
+                'retried': self.retried,
+                'concurrency': int(self._concurrency),
+                'in_flight': self._in_flight,
+                'circuit_open': time.monotonic() < self._open_until,
+            }
+
+
+_governor: Optional[RequestGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> RequestGovernor:
+    """Get the process-wide request governor"""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = RequestGovernor()
+        return _governor
+
+
+def set_governor(governor: Optional[RequestGovernor]) -> RequestGovernor:
+    """
+    Replace the process-wide request governor.
+
+    Args:
+        governor: Governor to use from now on; None builds a default one on next use
+
+    Returns:
+        The governor that was in use before
+    """
+    global _governor
+    with _governor_lock:
+        previous = _governor
+        _governor = governor
+        return previous
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+HTTP response cache for YouTube Music API traffic
+Keeps recent InnerTube responses in memory and in an SQLite file in the user
+config directory, so repeated reads of the same playlist or library page
+within a few minutes are answered locally instead of re-downloading the JSON
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils import get_config_dir
+
+# Seconds a response stays fresh, per InnerTube endpoint. Endpoints not
+# listed are never cached.
+ENDPOINT_TTLS = {
+    'browse': 300,
+    'search': 600,
+    'music/get_search_suggestions': 600,
+}
+# InnerTube endpoints (or endpoint prefixes ending in '/') that change the
+# account's data. A request to one of them drops every cached response, since
+# any of them may be stale now; other uncached requests (e.g. next, log or
+# account/account_menu) leave the cache alone.
+WRITE_ENDPOINTS = (
+    'browse/edit_playlist',
+    'playlist/create',
+    'playlist/delete',
+    'like/',
+    'feedback',
+    'subscription/',
+    'music/delete_privately_owned_entity',
+)
+# Bytes of response bodies kept in memory and on disk
+MEMORY_MAX_BYTES = 16 * 1024 * 1024
+DISK_MAX_BYTES = 128 * 1024 * 1024
+
+_local = threading.local()
+
+
+@contextmanager
+def revalidating(enabled: bool = True) -> Iterator[None]:
+    """
+    Treat cached responses as stale for requests made by this thread in the with block.
+
+    Cached responses with an ETag or Last-Modified are revalidated with a
+    conditional request; others are fetched again. Used for explicit refreshes.
+    """
+    previous = getattr(_local, 'revalidate', False)
+    _local.revalidate = enabled or previous
+    try:
+        yield
+    finally:
+        _local.revalidate = previous
+
+
+def endpoint_of(url: str) -> str:
+    """Get the InnerTube endpoint of an API URL, e.g. 'browse'"""
+    path = urlsplit(url).path
+    marker = '/youtubei/v1/'
+    return path.split(marker, 1)[1] if marker in path else path.lstrip('/')
+
+
+def is_write_endpoint(endpoint: str) -> bool:
+    """Whether requests to an InnerTube endpoint change the account's data"""
+    return any(endpoint == write or (write.endswith('/') and endpoint.startswith(write))
+               for write in WRITE_ENDPOINTS)
+
+
+class ResponseCache:
+    """LRU cache of HTTP responses, bounded by bytes, backed by SQLite
+
+    Entries are keyed by URL, request body and the account the request was
+    made for (cookie and X-Goog-AuthUser), never by the per-request
+    Authorization hash, so refreshed tokens keep hitting the cache.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            endpoint TEXT NOT NULL,
+            stored_at REAL NOT NULL,
+            last_used REAL NOT NULL,
+            status INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            content BLOB NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None,
+                 memory_max_bytes: int = MEMORY_MAX_BYTES, disk_max_bytes: int = DISK_MAX_BYTES):
+        self.db_path = db_path or os.path.join(get_config_dir(), "http_cache.sqlite3")
+        self.ttls = dict(ENDPOINT_TTLS if ttls is None else ttls)
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.bytes_saved = 0
+
+        conn = self._connect()
+        try:
+            conn.executescript(self.SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def make_key(url: str, body: Any, headers: Dict[str, str]) -> str:
+        """Build the cache key of a request"""
+        headers = CaseInsensitiveDict(headers)
+        account = f"{headers.get('Cookie', '')}|{headers.get('X-Goog-AuthUser', '')}"
+        payload = json.dumps([url, body, account], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        """Get how long responses from this URL stay fresh (0: not cached)"""
+        return self.ttls.get(endpoint_of(url), 0)
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        """Put an entry at the front of the memory LRU, evicting by size"""
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old['size']
+        self._memory[key] = entry
+        self._memory_bytes += entry['size']
+        while self._memory_bytes > self.memory_max_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted['size']
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a stored response in memory, then on disk"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                # Written to disk only when the disk store needs evicting
+                entry['last_used'] = time.time()
+                return entry
+
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT endpoint, stored_at, status, headers, content, size FROM responses WHERE key = ?",
+                (key,)).fetchone()
+            if row is not None:
+                with conn:
+                    conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        finally:
+            conn.close()
+        if row is None:
+            return None
+
+        entry = {'endpoint': row[0], 'stored_at': row[1], 'last_used': time.time(), 'status': row[2],
+                 'headers': json.loads(row[3]), 'content': row[4], 'size': row[5]}
+        with self._lock:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, url: str, response: requests.Response):
+        """Store a successful response"""
+        content = response.content
+        # The body is stored decoded, so transfer details no longer apply
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+        now = time.time()
+        entry = {'endpoint': endpoint_of(url), 'stored_at': now, 'last_used': now,
+                 'status': response.status_code, 'headers': headers, 'content': content,
+                 'size': len(content)}
+        if entry['size'] > self.memory_max_bytes:
+            return
+
+        with self._lock:
+            self._remember(key, entry)
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, endpoint, stored_at, last_used, status, headers, content, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, entry['endpoint'], entry['stored_at'], entry['stored_at'], entry['status'],
+                     json.dumps(entry['headers']), sqlite3.Binary(content), entry['size']))
+                self._evict_disk(conn)
+        finally:
+            conn.close()
+
+    def _evict_disk(self, conn: sqlite3.Connection):
+        """Drop least recently used responses until the store fits its budget"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.disk_max_bytes:
+            return
+        # Hits served from memory don't touch the database; record them first
+        with self._lock:
+            recent = [(entry['last_used'], key) for key, entry in self._memory.items()]
+        conn.executemany("UPDATE responses SET last_used = MAX(last_used, ?) WHERE key = ?", recent)
+        for key, size in conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.disk_max_bytes:
+                break
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM responses")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_response(entry: Dict[str, Any], url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['content']
+        response.url = url
+        response.encoding = 'utf-8'
+        return response
+
+    def send(self, method: str, url: str, body: Any, headers: Dict[str, str],
+             send_request) -> requests.Response:
+        """
+        Answer a request from the cache or send it and remember the response.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            body: JSON body of the request, part of the cache key
+            headers: Effective request headers, used for the account part of the key
+            send_request: Callable(extra_headers) that sends the request for real
+
+        Returns:
+            The cached or fresh response
+        """
+        ttl = self.ttl_for(url)
+        if method.upper() != 'POST' or ttl <= 0:
+            if not is_write_endpoint(endpoint_of(url)):
+                return send_request({})
+            # Writes may change anything we have cached. Unless the server
+            # rejected the request, assume it was applied, even on an error.
+            try:
+                response = send_request({})
+            except requests.RequestException:
+                self.clear()
+                raise
+            if not 400 <= response.status_code < 500:
+                self.clear()
+            return response
+
+        key = self.make_key(url, body, headers)
+        entry = self.get(key)
+        revalidate = getattr(_local, 'revalidate', False)
+
+        if entry is not None and not revalidate and time.time() - entry['stored_at'] < ttl:
+            with self._lock:
+                self.hits += 1
+                self.bytes_saved += entry['size']
+            return self._to_response(entry, url)
+
+        conditional = {}
+        if entry is not None:
+            stored = CaseInsensitiveDict(entry['headers'])
+            if stored.get('ETag'):
+                conditional['If-None-Match'] = stored['ETag']
+            if stored.get('Last-Modified'):
+                conditional['If-Modified-Since'] = stored['Last-Modified']
+
+        response = send_request(conditional)
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.revalidated += 1
+                self.bytes_saved += entry['size']
+            now = time.time()
+            entry = dict(entry, stored_at=now, last_used=now)
+            with self._lock:
+                self._remember(key, entry)
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("UPDATE responses SET stored_at = ?, last_used = ? WHERE key = ?",
+                                 (entry['stored_at'], entry['stored_at'], key))
+            finally:
+                conn.close()
+            return self._to_response(entry, url)
+
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200:
+            self.put(key, url, response)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the bytes served from the cache"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidated': self.revalidated,
+                'bytes_saved': self.bytes_saved,
+                'memory_bytes': self._memory_bytes,
+                'memory_entries': len(self._memory),
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide response cache, or None if it can't be opened"""
+    global _cache, _cache_failed
+    with _cache_lock:
+        if _cache is None and not _cache_failed:
+            try:
+                _cache = ResponseCache()
+            except Exception as e:
+                print(f"⚠️  HTTP response cache unavailable: {e}")
+                _cache_failed = True
+        return _cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> Optional[ResponseCache]:
+    """
+    Replace the process-wide response cache.
+
+    Args:
+        cache: Cache to use from now on; None opens the default one on next use
+
+    Returns:
+        The cache that was in use before
+    """
+    global _cache, _cache_failed
+    with _cache_lock:
+        previous = _cache
+        _cache = cache
+        _cache_failed = False
+        return previous
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Lightweight tracing of where PlaylistCat spends its time
+Records spans (network requests, page processing, table updates, auth
+refreshes) and saves them in the Chrome trace event format, which opens in
+chrome://tracing and https://ui.perfetto.dev. Recording starts at launch when
+PLAYLISTCAT_TRACE is set to an output path, or on demand; while it is off,
+every hook costs one flag check
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Callable
+
+from utils import get_config_dir
+
+# Environment variable naming the file to record a trace of the whole session to
+TRACE_ENV_VAR = "PLAYLISTCAT_TRACE"
+# Events kept per recording; later ones are dropped and counted (about 100 bytes each)
+MAX_EVENTS = 500000
+
+_enabled = False
+_lock = threading.Lock()
+_events: List[Dict[str, Any]] = []
+_thread_names: Dict[int, str] = {}
+_output_path: Optional[str] = None
+_dropped = 0
+
+
+def is_enabled() -> bool:
+    """Whether spans are being recorded"""
+    return _enabled
+
+
+def default_trace_path() -> str:
+    """Path traces started from the UI are saved to"""
+    return os.path.join(get_config_dir(), f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+
+
+def start(path: Optional[str] = None):
+    """
+    Start recording spans, discarding any earlier recording.
+
+    Args:
+        path: File stop() saves the trace to; default_trace_path() if None
+    """
+    global _enabled, _output_path, _dropped
+    with _lock:
+        _events.clear()
+        _thread_names.clear()
+        _dropped = 0
+        _output_path = path or default_trace_path()
+        _enabled = True
+    print(f"⏺️  Tracing to {_output_path}")
+
+
+def stop() -> Optional[str]:
+    """
+    Stop recording and save the trace.
+
+    Returns:
+        Path of the saved trace, or None if nothing was being recorded
+    """
+    global _enabled
+    with _lock:
+        if not _enabled:
+            return None
+        _enabled = False
+        events = list(_events)
+        names = dict(_thread_names)
+        path = _output_path
+        dropped = _dropped
+
+    pid = os.getpid()
+    metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                for tid, name in names.items()]
+    trace = {
+        'traceEvents': metadata + events,
+        'displayTimeUnit': 'ms',
+        'otherData': {'application': 'PlaylistCat', 'dropped_events': dropped},
+    }
+    with open(path, 'w') as f:
+        json.dump(trace, f)
+    print(f"⏹️  Saved trace of {len(events)} spans to {path}")
+    return path
+
+
+def start_from_environment() -> bool:
+    """Start recording if PLAYLISTCAT_TRACE names an output file"""
+    path = os.environ.get(TRACE_ENV_VAR)
+    if path:
+        start(path)
+        return True
+    return False
+
+
+def _record(name: str, category: str, start_us: float, end_us: float, args: Dict[str, Any]):
+    global _dropped
+    thread = threading.current_thread()
+    event = {'name': name, 'cat': category, 'ph': 'X', 'ts': start_us, 'dur': end_us - start_us,
+             'pid': os.getpid(), 'tid': thread.ident}
+    if args:
+        event['args'] = args
+    with _lock:
+        if not _enabled:
+            return
+        if len(_events) >= MAX_EVENTS:
+            _dropped += 1
+            return
+        _events.append(event)
+        if thread.ident not in _thread_names:
+            # Threads started by Qt are only known to Python as "Dummy-N"
+            _thread_names[thread.ident] = thread.name.replace("Dummy", "Worker", 1)
+
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000.0
+
+
+class _NullSpan:
+    """Span used while tracing is off; details written to it are ignored"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setitem__(self, key, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+_END = object()
+
+
+@contextmanager
+def _span(name: str, category: str, args: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    start_us = _now_us()
+    try:
+        yield args
+    finally:
+        _record(name, category, start_us, _now_us(), args)
+
+
+def span(name: str, category: str = "app", **args):
+    """
+    Time a with block as one span.
+
+    The with target is the span's args dictionary, so details learned
+    inside the block (e.g. a status code) can be added to it.
+
+    Args:
+        name: Span name shown in the trace viewer
+        category: Span category, e.g. "network", "processing", "ui", "auth"
+        **args: Details shown with the span
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _span(name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = "app") -> Callable:
+    """Decorator that records every call of a function as a span"""
+    def decorator(function: Callable) -> Callable:
+        span_name = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _span(span_name, category, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_iter(iterable: Iterable, name: str, category: str = "app") -> Iterator:
+    """
+    Record the time spent producing each item of an iterable as a span.
+
+    Useful for generators that do their work lazily, such as the page
+    iterators that send one request per page.
+    """
+    iterator = iter(iterable)
+    index = 0
+    while True:
+        if not _enabled:
+            item = next(iterator, _END)
+        else:
+            with _span(name, category, {'index': index}):
+                item = next(iterator, _END)
+        if item is _END:
+            return
+        yield item
+        index += 1
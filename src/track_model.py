@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+"""
+Table model for displaying playlist tracks
+Backs a QTableView directly with the fetched track data so that Qt only
+materializes the rows it actually paints
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex, QPersistentModelIndex,
+    QRect, QEvent, pyqtSignal
+)
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionViewItem
+
+from utils import Track, track_key, diff_tracks
+
+# Custom data role carrying the stable identity of the track shown in a row
+TrackKeyRole = Qt.ItemDataRole.UserRole + 1
+
+
+def contiguous_runs(rows: List[int]) -> List[Tuple[int, int]]:
+    """Split sorted, distinct rows into (first, last) runs of consecutive rows"""
+    runs: List[Tuple[int, int]] = []
+    start = 0
+    for index in range(1, len(rows) + 1):
+        if index == len(rows) or rows[index] != rows[index - 1] + 1:
+            runs.append((rows[start], rows[index - 1]))
+            start = index
+    return runs
+
+
+class TrackTableModel(QAbstractTableModel):
+    """Read-only table model over a list of normalized Track records"""
+
+    COLUMN_POSITION = 0
+    COLUMN_ARTIST = 1
+    COLUMN_TITLE = 2
+    COLUMN_LINK = 3
+    COLUMN_REMOVE = 4
+
+    HEADERS = ["Position", "Artist", "Track Name", "YouTube Music Link", "Remove"]
+
+    # Emitted around the row removals of remove_tracks() with the sorted
+    # source rows, so proxies can update their mapping once per batch
+    removal_batch_started = pyqtSignal(list)
+    removal_batch_finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tracks: List[Track] = []
+        self._rows_by_key: Optional[Dict[str, int]] = None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._tracks)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self.HEADERS):
+                return self.HEADERS[section]
+            return None
+        return section + 1
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        if row < 0 or row >= len(self._tracks):
+            return None
+
+        track = self._tracks[row]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.COLUMN_POSITION:
+                return str(track.position)
+            if column == self.COLUMN_ARTIST:
+                return track.artist
+            if column == self.COLUMN_TITLE:
+                return track.title
+            if column == self.COLUMN_LINK:
+                return "🎵 Open" if track.url else "N/A"
+            if column == self.COLUMN_REMOVE:
+                return "🗑️ Remove"
+
+        elif role == Qt.ItemDataRole.UserRole:
+            # Raw values, matching what the old QTableWidgetItems carried
+            if column == self.COLUMN_POSITION:
+                return track.position
+            if column == self.COLUMN_ARTIST:
+                return track.artist
+            if column == self.COLUMN_TITLE:
+                return track.title
+            if column == self.COLUMN_LINK:
+                return track.url
+
+        elif role == TrackKeyRole:
+            return track_key(track)
+
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if column in (self.COLUMN_POSITION, self.COLUMN_LINK, self.COLUMN_REMOVE):
+                return Qt.AlignmentFlag.AlignCenter
+
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            if column == self.COLUMN_LINK and track.url:
+                return f"Double-click to open: {track.url}"
+            if column == self.COLUMN_REMOVE:
+                return f"Remove '{track.title}' from the list"
+
+        return None
+
+    def set_tracks(self, tracks: List[Track]):
+        """Replace the model contents with a new list of tracks"""
+        self.beginResetModel()
+        self._tracks = tracks
+        self._rows_by_key = None
+        self.endResetModel()
+
+    def append_tracks(self, tracks: List[Track]):
+        """Append tracks to the end of the model, e.g. as playlist pages arrive"""
+        if not tracks:
+            return
+
+        first = len(self._tracks)
+        self.beginInsertRows(QModelIndex(), first, first + len(tracks) - 1)
+        self._tracks.extend(tracks)
+        if self._rows_by_key is not None:
+            for row, track in enumerate(tracks, first):
+                self._rows_by_key[track_key(track)] = row
+        self.endInsertRows()
+
+    def update_tracks(self, tracks: List[Track]) -> Dict[str, Any]:
+        """
+        Bring the model up to date with a freshly fetched version of the playlist.
+
+        Only the affected rows change: removed tracks are taken out, changed
+        tracks are replaced and moved to their new positions, and new tracks
+        are inserted where they belong. The rows stay in playlist order, and
+        views and proxies keep their scroll position, selection and sort order.
+
+        Returns:
+            The diff that was applied, see utils.diff_tracks()
+        """
+        diff = diff_tracks(self._tracks, tracks)
+
+        self.remove_tracks(diff['removed'])
+
+        # Replace changed tracks and, if their positions moved, put the rows
+        # back into playlist order as a single layout change
+        if diff['updated']:
+            self.layoutAboutToBeChanged.emit()
+            for track in diff['updated']:
+                self._tracks[self.row_for_key(track_key(track))] = track
+            if any(earlier.position > later.position
+                   for earlier, later in zip(self._tracks, self._tracks[1:])):
+                self._sort_by_position()
+            self.layoutChanged.emit()
+
+        self.restore_tracks(diff['added'])
+        return diff
+
+    def _sort_by_position(self):
+        """Reorder the rows by playlist position in place, keeping persistent indexes"""
+        persistent = self.persistentIndexList()
+        keys = [track_key(self._tracks[index.row()]) for index in persistent]
+        # In place: the list object is shared with the owner of the tracks
+        self._tracks.sort(key=lambda track: track.position)
+        self._rows_by_key = None
+        self.changePersistentIndexList(
+            persistent, [self.index(self.row_for_key(key), index.column())
+                         for key, index in zip(keys, persistent)])
+
+    def tracks(self) -> List[Track]:
+        """Get the list of tracks backing the model"""
+        return self._tracks
+
+    def track(self, row: int) -> Optional[Track]:
+        """Get the track shown at the given row, or None if out of range"""
+        if 0 <= row < len(self._tracks):
+            return self._tracks[row]
+        return None
+
+    def sort_key(self, row: int, column: int) -> Tuple:
+        """
+        Get the sort key of a row for the given column.
+
+        Artist and title sorts fall back to the other text column and then
+        to the original position, so ordering is total and stable.
+        """
+        track = self._tracks[row]
+        if column == self.COLUMN_ARTIST:
+            return (track.artist_key, track.title_key, track.position)
+        if column == self.COLUMN_TITLE:
+            return (track.title_key, track.artist_key, track.position)
+        return (track.position,)
+
+    def row_for_key(self, key: str) -> int:
+        """Get the row of the track with the given key, or -1 if not present"""
+        if self._rows_by_key is None:
+            # Rebuilt lazily: a single removal shifts every following row,
+            # so it is cheaper to invalidate than to patch the index
+            self._rows_by_key = {track_key(track): row for row, track in enumerate(self._tracks)}
+        return self._rows_by_key.get(key, -1)
+
+    def track_for_key(self, key: str) -> Optional[Track]:
+        """Get the track with the given key, or None if not present"""
+        return self.track(self.row_for_key(key))
+
+    def remove_track(self, key: str) -> Optional[Track]:
+        """
+        Remove the track with the given key.
+
+        Emits a single rowsRemoved notification for the affected row.
+
+        Returns:
+            The removed track, or None if no track has that key
+        """
+        removed = self.remove_tracks([key])
+        return removed[0] if removed else None
+
+    def remove_tracks(self, keys: Iterable[str]) -> List[Track]:
+        """
+        Remove the tracks with the given keys.
+
+        Rows are taken out one contiguous run at a time from the bottom, so
+        removing a block of selected tracks emits a single rowsRemoved
+        notification. The runs are bracketed by removal_batch_started and
+        removal_batch_finished. Keys that are not present are ignored.
+
+        Returns:
+            The removed tracks in playlist row order
+        """
+        rows = sorted({row for row in (self.row_for_key(key) for key in keys) if row >= 0})
+        if not rows:
+            return []
+
+        removed = [self._tracks[row] for row in rows]
+        self.removal_batch_started.emit(rows)
+        for first, last in reversed(contiguous_runs(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._tracks[first:last + 1]
+            self._rows_by_key = None
+            self.endRemoveRows()
+        self.removal_batch_finished.emit()
+        return removed
+
+    def restore_tracks(self, tracks: Iterable[Track]):
+        """
+        Put tracks back at their playlist positions.
+
+        Used to roll back a removal the server rejected and to insert the
+        new tracks of a refresh. Each track goes before the first row with a
+        later position; tracks whose key is already present are skipped.
+        """
+        positions = [track.position for track in self._tracks]
+        by_row: Dict[int, List[Track]] = {}
+        for track in sorted(tracks, key=lambda track: track.position):
+            if self.row_for_key(track_key(track)) < 0:
+                by_row.setdefault(bisect_right(positions, track.position), []).append(track)
+
+        # Insert from the bottom up so the computed rows stay valid
+        for row in sorted(by_row, reverse=True):
+            group = by_row[row]
+            self.beginInsertRows(QModelIndex(), row, row + len(group) - 1)
+            self._tracks[row:row] = group
+            self._rows_by_key = None
+            self.endInsertRows()
+
+
+class TrackSortProxyModel(QAbstractProxyModel):
+    """
+    Sorting proxy over a TrackTableModel.
+
+    Sorting uses the precomputed keys from TrackTableModel.sort_key() and
+    Python's sort, so a header click only permutes an index list and emits
+    a layout change; the source model and the view's rows are never rebuilt.
+    Row removals and insertions in the source are patched into the mapping
+    without re-sorting. The initial order is by playlist position.
+    """
+
+    SORTABLE_COLUMNS = (
+        TrackTableModel.COLUMN_POSITION,
+        TrackTableModel.COLUMN_ARTIST,
+        TrackTableModel.COLUMN_TITLE,
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._proxy_to_source: List[int] = []
+        self._source_to_proxy: List[int] = []
+        self._sort_column = TrackTableModel.COLUMN_POSITION  # -1 keeps the source order
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._layout_persistent: List[QModelIndex] = []
+        self._layout_sources: List[QPersistentModelIndex] = []
+        # Source rows of a removal batch in progress, see TrackTableModel.remove_tracks()
+        self._batch_rows: Optional[List[int]] = None
+
+    def setSourceModel(self, source_model: TrackTableModel):
+        old_model = self.sourceModel()
+        if old_model is not None:
+            old_model.modelAboutToBeReset.disconnect(self._on_source_about_to_be_reset)
+            old_model.modelReset.disconnect(self._on_source_reset)
+            old_model.removal_batch_started.disconnect(self._on_source_removal_batch_started)
+            old_model.removal_batch_finished.disconnect(self._on_source_removal_batch_finished)
+            old_model.rowsAboutToBeRemoved.disconnect(self._on_source_rows_about_to_be_removed)
+            old_model.rowsRemoved.disconnect(self._on_source_rows_removed)
+            old_model.rowsInserted.disconnect(self._on_source_rows_inserted)
+            old_model.dataChanged.disconnect(self._on_source_data_changed)
+            old_model.layoutAboutToBeChanged.disconnect(self._on_source_layout_about_to_be_changed)
+            old_model.layoutChanged.disconnect(self._on_source_layout_changed)
+
+        self.beginResetModel()
+        super().setSourceModel(source_model)
+        if source_model is not None:
+            source_model.modelAboutToBeReset.connect(self._on_source_about_to_be_reset)
+            source_model.modelReset.connect(self._on_source_reset)
+            source_model.removal_batch_started.connect(self._on_source_removal_batch_started)
+            source_model.removal_batch_finished.connect(self._on_source_removal_batch_finished)
+            source_model.rowsAboutToBeRemoved.connect(self._on_source_rows_about_to_be_removed)
+            source_model.rowsRemoved.connect(self._on_source_rows_removed)
+            source_model.rowsInserted.connect(self._on_source_rows_inserted)
+            source_model.dataChanged.connect(self._on_source_data_changed)
+            source_model.layoutAboutToBeChanged.connect(self._on_source_layout_about_to_be_changed)
+            source_model.layoutChanged.connect(self._on_source_layout_changed)
+        self._rebuild_mapping()
+        self.endResetModel()
+
+    # QAbstractItemModel interface
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or row < 0 or row >= len(self._proxy_to_source):
+            return QModelIndex()
+        if column < 0 or column >= self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._proxy_to_source)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        source_model = self.sourceModel()
+        if parent.isValid() or source_model is None:
+            return 0
+        return source_model.columnCount()
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        source_model = self.sourceModel()
+        if source_model is None:
+            return None
+        if orientation == Qt.Orientation.Vertical:
+            # Row numbers follow the displayed order
+            return section + 1 if role == Qt.ItemDataRole.DisplayRole else None
+        return source_model.headerData(section, orientation, role)
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        source_model = self.sourceModel()
+        if source_model is None or not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row()
+        if row >= len(self._proxy_to_source):
+            return QModelIndex()
+        return source_model.index(self._proxy_to_source[row], proxy_index.column())
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if row >= len(self._source_to_proxy):
+            return QModelIndex()
+        return self.index(self._source_to_proxy[row], source_index.column())
+
+    # Sorting
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """Sort by one of the sortable columns, or restore source order with column -1"""
+        if column != -1 and column not in self.SORTABLE_COLUMNS:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        source_indexes = [self.mapToSource(index) for index in persistent]
+
+        self._sort_column = column
+        self._sort_order = order
+        self._rebuild_mapping()
+
+        self.changePersistentIndexList(
+            persistent, [self.mapFromSource(index) for index in source_indexes])
+        self.layoutChanged.emit()
+
+    def sort_column(self) -> int:
+        """Get the column currently sorted on, or -1 for source order"""
+        return self._sort_column
+
+    def sort_order(self) -> Qt.SortOrder:
+        """Get the current sort order"""
+        return self._sort_order
+
+    def _rebuild_mapping(self):
+        source_model = self.sourceModel()
+        count = source_model.rowCount() if source_model is not None else 0
+
+        if self._sort_column == -1:
+            self._proxy_to_source = list(range(count))
+        else:
+            column = self._sort_column
+            keys = [source_model.sort_key(row, column) for row in range(count)]
+            self._proxy_to_source = sorted(
+                range(count), key=keys.__getitem__,
+                reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+
+        self._rebuild_source_to_proxy()
+
+    def _rebuild_source_to_proxy(self):
+        source_to_proxy = [0] * len(self._proxy_to_source)
+        for proxy_row, source_row in enumerate(self._proxy_to_source):
+            source_to_proxy[source_row] = proxy_row
+        self._source_to_proxy = source_to_proxy
+
+    def _insertion_row(self, key: Tuple) -> int:
+        """Binary search for where a row with the given sort key belongs"""
+        source_model = self.sourceModel()
+        column = self._sort_column
+        descending = self._sort_order == Qt.SortOrder.DescendingOrder
+        low, high = 0, len(self._proxy_to_source)
+        while low < high:
+            middle = (low + high) // 2
+            other = source_model.sort_key(self._proxy_to_source[middle], column)
+            if (other > key) if descending else (other < key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    # Source model change handling
+
+    def _on_source_about_to_be_reset(self):
+        self.beginResetModel()
+
+    def _on_source_reset(self):
+        self._rebuild_mapping()
+        self.endResetModel()
+
+    def _remove_proxy_rows(self, proxy_rows: List[int]):
+        """Remove proxy rows one contiguous run at a time, highest rows first"""
+        for first, last in reversed(contiguous_runs(sorted(proxy_rows))):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._proxy_to_source[first:last + 1]
+            self.endRemoveRows()
+
+    def _remap_removed(self, removed: List[int]):
+        """Shift the source rows in the mapping down past the sorted removed rows"""
+        self._proxy_to_source = [row - bisect_left(removed, row) for row in self._proxy_to_source]
+        self._rebuild_source_to_proxy()
+
+    def _on_source_removal_batch_started(self, rows: List[int]):
+        # Take every affected proxy row out while the mapping is still valid;
+        # the per-run notifications that follow are then ignored and the
+        # mapping is shifted once when the batch is finished
+        self._remove_proxy_rows([self._source_to_proxy[row] for row in rows])
+        self._batch_rows = rows
+
+    def _on_source_removal_batch_finished(self):
+        rows, self._batch_rows = self._batch_rows, None
+        self._remap_removed(rows)
+
+    def _on_source_rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int):
+        if self._batch_rows is None:
+            self._remove_proxy_rows([self._source_to_proxy[row] for row in range(first, last + 1)])
+
+    def _on_source_rows_removed(self, parent: QModelIndex, first: int, last: int):
+        if self._batch_rows is None:
+            self._remap_removed(list(range(first, last + 1)))
+
+    def _on_source_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        count = last - first + 1
+        self._proxy_to_source = [row + count if row >= first else row
+                                 for row in self._proxy_to_source]
+
+        if self._sort_column == -1:
+            # Unsorted: keep the proxy in source order with a single insertion
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._proxy_to_source[first:first] = range(first, last + 1)
+            self.endInsertRows()
+        else:
+            source_model = self.sourceModel()
+            column = self._sort_column
+            keys = [source_model.sort_key(row, column) for row in range(first, last + 1)]
+            descending = self._sort_order == Qt.SortOrder.DescendingOrder
+
+            # Fast path for pages arriving in sort order, e.g. appending
+            # playlist pages while sorted by position
+            in_order = keys == sorted(keys, reverse=descending)
+            if in_order and self._proxy_to_source:
+                boundary = source_model.sort_key(self._proxy_to_source[-1], column)
+                in_order = (keys[0] < boundary) if descending else (keys[0] > boundary)
+
+            if in_order:
+                proxy_first = len(self._proxy_to_source)
+                self.beginInsertRows(QModelIndex(), proxy_first, proxy_first + count - 1)
+                self._proxy_to_source.extend(range(first, last + 1))
+                self.endInsertRows()
+            else:
+                for source_row, key in zip(range(first, last + 1), keys):
+                    proxy_row = self._insertion_row(key)
+                    self.beginInsertRows(QModelIndex(), proxy_row, proxy_row)
+                    self._proxy_to_source.insert(proxy_row, source_row)
+                    self.endInsertRows()
+
+        self._rebuild_source_to_proxy()
+
+    def _on_source_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=None):
+        roles = roles or []
+        for source_row in range(top_left.row(), bottom_right.row() + 1):
+            proxy_row = self._source_to_proxy[source_row]
+            self.dataChanged.emit(self.index(proxy_row, top_left.column()),
+                                  self.index(proxy_row, bottom_right.column()), roles)
+
+    def _on_source_layout_about_to_be_changed(self):
+        # Source rows may be reordered: remember the source row behind each
+        # persistent proxy index so it can be found again afterwards
+        self.layoutAboutToBeChanged.emit()
+        self._layout_persistent = self.persistentIndexList()
+        self._layout_sources = [QPersistentModelIndex(self.mapToSource(index))
+                                for index in self._layout_persistent]
+
+    def _on_source_layout_changed(self):
+        self._rebuild_mapping()
+        self.changePersistentIndexList(
+            self._layout_persistent,
+            [self.mapFromSource(QModelIndex(index)) for index in self._layout_sources])
+        self._layout_persistent = []
+        self._layout_sources = []
+        self.layoutChanged.emit()
+
+
+class RemoveButtonDelegate(QStyledItemDelegate):
+    """Paints a Remove button in each cell and reports clicks on it by track key"""
+
+    remove_requested = pyqtSignal(str)
+
+    BUTTON_TEXT = "🗑️ Remove"
+    BUTTON_COLOR = QColor("#ff6b6b")
+    BUTTON_HOVER_COLOR = QColor("#ff5252")
+    BUTTON_MARGIN = 3
+
+    def button_rect(self, cell_rect: QRect) -> QRect:
+        """Get the area of the painted button inside a cell"""
+        margin = self.BUTTON_MARGIN
+        return cell_rect.adjusted(margin, margin, -margin, -margin)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        # Let the style draw the selection/alternating background first
+        background = QStyleOptionViewItem(option)
+        self.initStyleOption(background, index)
+        background.text = ""
+        style = background.widget.style() if background.widget else None
+        if style:
+            style.drawControl(QStyle.ControlElement.CE_ItemViewItem, background, painter, background.widget)
+
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        rect = self.button_rect(option.rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.BUTTON_HOVER_COLOR if hovered else self.BUTTON_COLOR)
+        painter.drawRoundedRect(rect, 3, 3)
+
+        font = painter.font()
+        font.setPointSizeF(max(font.pointSizeF() - 1, 7))
+        painter.setFont(font)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, self.BUTTON_TEXT)
+        painter.restore()
+
+    def editorEvent(self, event, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            if self.button_rect(option.rect).contains(event.position().toPoint()):
+                key = index.data(TrackKeyRole)
+                if key:
+                    self.remove_requested.emit(key)
+                return True
+        return super().editorEvent(event, model, option, index)
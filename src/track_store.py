@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Disk-backed track list for low-memory mode
+Keeps normalized tracks in a memory-mapped temporary file and only 8 bytes
+of offset per row in RAM, so the table of a huge playlist decodes just the
+rows it paints and resident memory stays roughly flat as the playlist grows
+"""
+
+import mmap
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableSequence
+from typing import Optional, List, Iterable, Iterator, Union, Callable, Any
+
+from utils import Track
+
+# Position, then the byte lengths of the six string fields
+_HEADER = struct.Struct('<q6I')
+# Tracks written to the file per write call while extending
+WRITE_BATCH = 1000
+# Decoded tracks kept per list, enough for several screens of rows
+CACHE_ROWS = 1024
+
+
+def _encode(text: str) -> bytes:
+    # Collation keys may contain lone surrogates
+    return text.encode('utf-8', 'surrogatepass')
+
+
+class MappedTrackStore:
+    """Append-only file of packed track records, read through mmap
+
+    Records are never rewritten or freed; the file lives until the store
+    is closed or garbage collected and is deleted by the OS afterwards.
+    Not thread-safe: a store belongs to the thread that created it.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._file = tempfile.TemporaryFile(prefix="playlistcat-tracks-", dir=directory)
+        self._size = 0
+        self._map: Optional[mmap.mmap] = None
+
+    @property
+    def size(self) -> int:
+        """Bytes written to the store so far"""
+        return self._size
+
+    def append(self, tracks: Iterable[Track]) -> array:
+        """
+        Write tracks to the end of the store.
+
+        Returns:
+            array('Q') with the offset of every written record, in order
+        """
+        offsets = array('Q')
+        chunk = bytearray()
+        for track in tracks:
+            fields = [_encode(track.artist), _encode(track.title), _encode(track.video_id),
+                      _encode(track.set_video_id), _encode(track.artist_key), _encode(track.title_key)]
+            offsets.append(self._size + len(chunk))
+            chunk += _HEADER.pack(track.position, *(len(field) for field in fields))
+            for field in fields:
+                chunk += field
+        if chunk:
+            self._file.write(chunk)
+            self._size += len(chunk)
+        return offsets
+
+    def read(self, offset: int) -> Track:
+        """Decode the record written at the given offset"""
+        # Records are written whole, so a mapping that covers the header covers the record
+        if self._map is None or offset + _HEADER.size > len(self._map):
+            self._remap()
+        header = _HEADER.unpack_from(self._map, offset)
+        start = offset + _HEADER.size
+        fields = []
+        for length in header[1:]:
+            fields.append(self._map[start:start + length].decode('utf-8', 'surrogatepass'))
+            start += length
+        artist, title, video_id, set_video_id, artist_key, title_key = fields
+        return Track.from_fields(header[0], artist, title, video_id, set_video_id, artist_key, title_key)
+
+    def _remap(self):
+        """Map the whole file again after it has grown"""
+        self._file.flush()
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """Release the mapping and delete the file"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class MappedTrackList(MutableSequence):
+    """List of tracks kept in a MappedTrackStore
+
+    Supports everything TrackTableModel does with its track list
+    (indexing, slicing, slice assignment, deletion, insertion, extend,
+    sort),
+    holding only record offsets in memory. Tracks are decoded when read
+    and the most recently read ones are cached, so repainting the visible
+    rows does not touch the file. Reading returns equal, not identical,
+    Track objects; replaced or re-inserted tracks are appended to the
+    store again.
+    """
+
+    def __init__(self, tracks: Iterable[Track] = (), store: Optional[MappedTrackStore] = None):
+        self._store = store or MappedTrackStore()
+        self._offsets = array('Q')
+        self._cache: "OrderedDict[int, Track]" = OrderedDict()
+        self.extend(tracks)
+
+    def _load(self, offset: int) -> Track:
+        track = self._cache.get(offset)
+        if track is not None:
+            self._cache.move_to_end(offset)
+            return track
+        track = self._cache[offset] = self._store.read(offset)
+        if len(self._cache) > CACHE_ROWS:
+            self._cache.popitem(last=False)
+        return track
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Track, List[Track]]:
+        if isinstance(index, slice):
+            return [self._load(offset) for offset in self._offsets[index]]
+        return self._load(self._offsets[index])
+
+    def __setitem__(self, index: Union[int, slice], value):
+        if isinstance(index, slice):
+            self._offsets[index] = self._store.append(value)
+        else:
+            self._offsets[index] = self._store.append([value])[0]
+
+    def __delitem__(self, index: Union[int, slice]):
+        del self._offsets[index]
+
+    def insert(self, index: int, track: Track):
+        self._offsets.insert(index, self._store.append([track])[0])
+
+    def extend(self, tracks: Iterable[Track]):
+        batch = []
+        for track in tracks:
+            batch.append(track)
+            if len(batch) >= WRITE_BATCH:
+                self._offsets.extend(self._store.append(batch))
+                batch = []
+        self._offsets.extend(self._store.append(batch))
+
+    def sort(self, *, key: Callable[[Track], Any], reverse: bool = False):
+        """Sort in place like list.sort(), reordering offsets without rewriting records"""
+        keys = [key(track) for track in self]
+        order = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+        self._offsets = array('Q', (self._offsets[index] for index in order))
+
+    def __iter__(self) -> Iterator[Track]:
+        # Full scans (sorting, diffing, saving) bypass the cache so they
+        # don't evict the rows on screen
+        read = self._store.read
+        for offset in self._offsets:
+            yield self._cache.get(offset) or read(offset)
+
+    def close(self):
+        """Delete the backing file; the list must not be used afterwards"""
+        self._cache.clear()
+        self._store.close()
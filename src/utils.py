@@ -3,8 +3,12 @@
 Utility functions for YouTube Music Playlist Viewer
 """
 
+import os
 import re
-from typing import Optional
+import sys
+import bisect
+import locale
+from typing import Optional, Dict, Any, List, Tuple
 
 
 def extract_playlist_id(input_string: str) -> Optional[str]:
@@ -71,6 +75,25 @@ def format_duration(duration_seconds: int) -> str:
         return f"{minutes}:{seconds:02d}"
 
 
+def format_age(age_seconds: float) -> str:
+    """
+    Format how long ago something happened, e.g. "5 min ago".
+
+    Args:
+        age_seconds: Elapsed time in seconds
+
+    Returns:
+        Short human readable age string
+    """
+    if age_seconds < 60:
+        return "just now"
+    if age_seconds < 3600:
+        return f"{int(age_seconds // 60)} min ago"
+    if age_seconds < 86400:
+        return f"{int(age_seconds // 3600)} h ago"
+    return f"{int(age_seconds // 86400)} days ago"
+
+
 def validate_playlist_id(playlist_id: str) -> bool:
     """
     Validate if a string looks like a valid YouTube playlist ID.
@@ -89,6 +112,286 @@ def validate_playlist_id(playlist_id: str) -> bool:
     return bool(re.match(r'^PL[a-zA-Z0-9_-]{10,}$', playlist_id))
 
 
+def collation_key(text: str) -> str:
+    """
+    Build a locale-aware, case-insensitive sort key for a string.
+
+    Keys are meant to be computed once per track and compared directly,
+    so sorting never has to re-normalize strings. The current LC_COLLATE
+    setting is used; in the default "C" locale this degrades to plain
+    case-insensitive ordering.
+
+    Args:
+        text: The string to build a key for
+
+    Returns:
+        A string whose ordering matches the locale's collation order
+    """
+    folded = (text or "").casefold()
+    try:
+        return locale.strxfrm(folded)
+    except (ValueError, OSError):
+        # strxfrm rejects embedded NUL characters on some platforms
+        return folded
+
+
+# Display string -> (shared string, collation key) of every artist seen so
+# far; thousands of rows by the same artist share one copy of both
+_artist_cache: Dict[str, Tuple[str, str]] = {}
+# Distinct artists remembered before the cache is started over
+ARTIST_CACHE_SIZE = 200000
+
+
+def _intern_artist(artist: str) -> Tuple[str, str]:
+    cached = _artist_cache.get(artist)
+    if cached is None:
+        if len(_artist_cache) >= ARTIST_CACHE_SIZE:
+            _artist_cache.clear()
+        cached = _artist_cache[artist] = (artist, collation_key(artist))
+    return cached
+
+
+class Track:
+    """Compact track record used throughout the app
+
+    A slotted object instead of a dict: artist strings and their sort
+    keys are shared between tracks and the URL is derived from the video
+    ID on demand, so a 100k-track playlist takes a fraction of the
+    memory. Records are read like the dicts they replace (track['title'],
+    track.get('url')), and dict(track) gives a plain copy.
+    """
+
+    __slots__ = ('position', 'artist', 'title', 'video_id', 'set_video_id', 'artist_key', 'title_key')
+
+    FIELDS = ('position', 'artist', 'title', 'url', 'video_id', 'set_video_id', 'artist_key', 'title_key')
+
+    def __init__(self, position: int, artist: str, title: str, video_id: str, set_video_id: str):
+        self.position = position
+        self.artist, self.artist_key = _intern_artist(artist)
+        self.title = title
+        self.title_key = collation_key(title)
+        self.video_id = video_id
+        self.set_video_id = set_video_id
+
+    @classmethod
+    def from_fields(cls, position: int, artist: str, title: str, video_id: str, set_video_id: str,
+                    artist_key: str, title_key: str) -> 'Track':
+        """Rebuild a stored track, reusing its sort keys instead of collating again"""
+        track = cls.__new__(cls)
+        track.position = position
+        track.artist = artist
+        track.title = title
+        track.video_id = video_id
+        track.set_video_id = set_video_id
+        track.artist_key = artist_key
+        track.title_key = title_key
+        return track
+
+    @property
+    def url(self) -> str:
+        """YouTube Music URL of the track, or an empty string without a video ID"""
+        return f"https://music.youtube.com/watch?v={self.video_id}" if self.video_id else ""
+
+    def __getitem__(self, field: str) -> Any:
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        return getattr(self, field) if field in self.FIELDS else default
+
+    def __contains__(self, field: object) -> bool:
+        return field in self.FIELDS
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.FIELDS
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Track):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"Track(position={self.position!r}, artist={self.artist!r}, title={self.title!r}, "
+                f"video_id={self.video_id!r}, set_video_id={self.set_video_id!r})")
+
+
+def make_track(position: int, artist: str, title: str, video_id: str,
+               set_video_id: str) -> Track:
+    """
+    Build the track record used throughout the app.
+
+    Args:
+        position: 1-based position of the track in the original playlist
+        artist: Display string of the track's artists
+        title: Track title
+        video_id: YouTube video ID, or an empty string
+        set_video_id: Playlist entry ID, or an empty string
+
+    Returns:
+        Track with display fields, IDs and precomputed sort keys
+    """
+    return Track(position, artist, title, video_id, set_video_id)
+
+
+def normalize_track(track: Dict[str, Any], position: int) -> Track:
+    """
+    Convert a ytmusicapi playlist item into the track record used by the app.
+
+    Args:
+        track: Playlist item as returned by ytmusicapi
+        position: 1-based position of the item in the original playlist
+
+    Returns:
+        Track as built by make_track()
+    """
+    title = track.get('title') or 'Unknown Title'
+    artists: List[str] = []
+
+    # Handle artists list
+    if track.get('artists'):
+        artists = [artist.get('name', '') for artist in track['artists'] if artist]
+
+    artist_str = ', '.join(artists) if artists else 'Unknown Artist'
+
+    return make_track(position, artist_str, title,
+                      track.get('videoId') or '', track.get('setVideoId') or '')
+
+
+def format_playlist(playlist: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a ytmusicapi library playlist item into the playlist record used by the app.
+
+    Args:
+        playlist: Library playlist item as returned by ytmusicapi
+
+    Returns:
+        Dictionary with id, title, description, count and thumbnails
+    """
+    return {
+        'id': playlist.get('playlistId', ''),
+        'title': playlist.get('title', 'Unknown Playlist'),
+        'description': playlist.get('description', ''),
+        'count': playlist.get('count', 0),
+        'thumbnails': playlist.get('thumbnails', [])
+    }
+
+
+def is_auth_error(error: Any) -> bool:
+    """
+    Check whether an error from YouTube Music looks like missing or expired credentials.
+
+    Args:
+        error: Exception or error message
+
+    Returns:
+        True if the message mentions an authentication failure; throttling
+        errors never count, since refreshing tokens doesn't help with those
+    """
+    if is_rate_limit_error(error):
+        return False
+    message = str(error).lower()
+    return any(term in message for term in
+               ["authentication", "401", "unauthorized", "403", "forbidden", "invalid", "expired"])
+
+
+def is_rate_limit_error(error: Any) -> bool:
+    """
+    Check whether an error from YouTube Music means requests are being throttled.
+
+    Args:
+        error: Exception or error message
+
+    Returns:
+        True if the server answered with HTTP 429 or reported a rate limit
+    """
+    message = str(error).lower()
+    return "429" in message or "too many requests" in message or "rate limit" in message
+
+
+def track_key(track: Track) -> str:
+    """
+    Get the stable identity of a track within its playlist.
+
+    The setVideoId uniquely identifies a playlist entry (the same video can
+    appear more than once). Tracks without one, e.g. from some public
+    playlists, fall back to their original playlist position.
+    """
+    return track.set_video_id or f"pos:{track.position}"
+
+
+def diff_tracks(old_tracks: List[Track], new_tracks: List[Track]) -> Dict[str, Any]:
+    """
+    Compare two versions of a playlist by track identity.
+
+    Args:
+        old_tracks: Tracks currently known, in any order
+        new_tracks: Freshly fetched tracks
+
+    Returns:
+        Dictionary with:
+        - added: new track records whose key was not present before
+        - removed: keys of tracks that are gone
+        - updated: new track records whose position or details changed
+        - moved: number of surviving tracks whose relative order changed
+    """
+    old_by_key = {track_key(track): track for track in old_tracks}
+    new_keys = set()
+    added = []
+    updated = []
+
+    for track in new_tracks:
+        key = track_key(track)
+        new_keys.add(key)
+        old = old_by_key.get(key)
+        if old is None:
+            added.append(track)
+        elif (old.position, old.artist, old.title, old.video_id) != \
+                (track.position, track.artist, track.title, track.video_id):
+            updated.append(track)
+
+    removed = [key for key in old_by_key if key not in new_keys]
+
+    # Tracks that kept their relative order form the longest increasing run
+    # of old positions when read in new order; everything else has moved
+    old_positions = [old_by_key[key].position for key in
+                     (track_key(track) for track in new_tracks) if key in old_by_key]
+    tails: List[int] = []
+    for position in old_positions:
+        index = bisect.bisect_left(tails, position)
+        if index == len(tails):
+            tails.append(position)
+        else:
+            tails[index] = position
+
+    return {
+        'added': added,
+        'removed': removed,
+        'updated': updated,
+        'moved': len(old_positions) - len(tails),
+    }
+
+
+def get_config_dir() -> str:
+    """
+    Get the per-user configuration directory for PlaylistCat, creating it if needed.
+
+    Returns:
+        %APPDATA%/PlaylistCat on Windows, $XDG_CONFIG_HOME/playlistcat
+        (default ~/.config/playlistcat) elsewhere
+    """
+    if sys.platform == "win32" and os.environ.get("APPDATA"):
+        config_dir = os.path.join(os.environ["APPDATA"], "PlaylistCat")
+    else:
+        base_dir = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+        config_dir = os.path.join(base_dir, "playlistcat")
+
+    os.makedirs(config_dir, exist_ok=True)
+    return config_dir
+
+
 if __name__ == "__main__":
     # Test the utility functions
     test_urls = [
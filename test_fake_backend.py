@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+
+"""
+Offline tests against the stand-in YouTube Music backend: playlist paging,
+library listing, authentication, track removal, throttling, export and the
+command line, without network
+"""
+
+import os
+import sys
+import json
+import asyncio
+import tempfile
+import subprocess
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from PyQt6.QtCore import Qt, QCoreApplication
+
+import fake_backend
+from client_pool import YTMusicClientPool, build_client
+from playlist_edits import remove_playlist_tracks
+from library_crawl import crawl_playlists
+from core import PlaylistService, sapisid_authorization
+from main import PlaylistFetcher, PersonalPlaylistFetcher, TrackRemover
+from track_model import TrackTableModel, TrackSortProxyModel
+from utils import track_key
+from auth import AuthenticationManager
+from exporters import EXPORT_FIELDS, TrackWriter, open_writer
+from playlist_cache import PlaylistCache
+from request_governor import RequestGovernor, set_governor
+from response_cache import get_response_cache
+import cli
+
+app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+
+def signed_in_pool() -> YTMusicClientPool:
+    """Client pool signed in to the fake account"""
+    auth = json.dumps(fake_backend.fake_browser_headers())
+    return YTMusicClientPool(lambda: build_client(auth=auth))
+
+
+def signed_in_service() -> PlaylistService:
+    """Playlist service signed in to the fake account"""
+    return PlaylistService(signed_in_pool())
+
+
+def test_playlist_fetch():
+    """PlaylistFetcher pages through a playlist and reports progress"""
+    backend = fake_backend.install(tracks=250, page_size=100)
+    try:
+        playlist_id = backend.playlist_ids[0]
+        fetcher = PlaylistFetcher(signed_in_service(), playlist_id)
+        pages, results, errors = [], [], []
+        fetcher.tracks_ready.connect(pages.append)
+        fetcher.data_ready.connect(results.append)
+        fetcher.error_occurred.connect(errors.append)
+        fetcher.run()
+
+        assert not errors, errors
+        assert [len(page) for page in pages] == [100, 100, 50]
+        tracks = results[0]
+        assert len(tracks) == 250 and fetcher.total == 250
+        assert [track['position'] for track in tracks] == list(range(1, 251))
+        assert tracks[0]['set_video_id'] == "set0000000"
+        print(f"✓ Fetched {len(tracks)} tracks in {backend.stats()['endpoints']['browse']} pages")
+    finally:
+        fake_backend.uninstall()
+
+
+def test_library_and_auth():
+    """Authentication and the library listing work against the fake account"""
+    backend = fake_backend.install(playlists=60, tracks=5, library_page_size=25)
+    try:
+        auth_manager = AuthenticationManager()
+        auth_manager.auth_file_path = os.path.join(tempfile.mkdtemp(), "auth.json")
+        assert auth_manager.authenticate_with_headers(fake_backend.fake_browser_headers())
+        assert auth_manager.is_authenticated
+
+        fetcher = PersonalPlaylistFetcher(auth_manager.get_service())
+        results, errors = [], []
+        fetcher.playlists_ready.connect(results.append)
+        fetcher.error_occurred.connect(errors.append)
+        fetcher.run()
+        assert not errors, errors
+        assert [playlist['id'] for playlist in results[0]] == backend.playlist_ids
+        print(f"✓ Listed {len(results[0])} library playlists")
+
+        # Expired cookies are reported as an authentication problem
+        backend.auth_valid = False
+        fetcher = PersonalPlaylistFetcher(auth_manager.get_service(), revalidate=True)
+        fetcher.error_occurred.connect(errors.append)
+        fetcher.run()
+        assert errors and fetcher.auth_error
+        auth_manager.auth_check_timer.stop()
+        print("✓ Expired credentials detected")
+    finally:
+        fake_backend.uninstall()
+
+
+def test_deferred_startup():
+    """The window module loads without the network stack; saved logins are checked in the background"""
+    imported = subprocess.run(
+        [sys.executable, "-c", "import main, sys; "
+         "print(sorted(m for m in ('ytmusicapi', 'requests', 'pyarrow', 'auth') if m in sys.modules))"],
+        cwd=Path(__file__).parent / "src", capture_output=True, text=True, check=True).stdout
+    assert imported.strip() == "[]", imported
+
+    fake_backend.install(playlists=2, tracks=5)
+    try:
+        auth_dir = tempfile.mkdtemp()
+        auth_manager = saved_auth_manager(auth_dir)
+        statuses = []
+        auth_manager.auth_status_changed.connect(statuses.append)
+
+        # Saved credentials count as valid at once and are checked in the background
+        assert auth_manager.load_saved_auth()
+        assert auth_manager.is_authenticated and statuses == [True]
+        auth_manager.auth_validator.wait()
+        QCoreApplication.processEvents()
+        assert auth_manager.is_authenticated and auth_manager.last_auth_time is not None
+        assert len(auth_manager.get_service().list_library()) == 2
+
+        # Recently verified credentials are not checked again
+        auth_manager = saved_auth_manager(auth_dir)
+        assert auth_manager.load_saved_auth() and auth_manager.auth_validator is None
+        print("✓ Startup skipped the network stack and checked the saved login in the background")
+    finally:
+        fake_backend.uninstall()
+
+
+def saved_auth_manager(auth_dir: str) -> AuthenticationManager:
+    """Authentication manager whose saved login and its state live in auth_dir"""
+    auth_manager = AuthenticationManager()
+    auth_manager.auth_file_path = os.path.join(auth_dir, "auth.json")
+    auth_manager.auth_state_path = os.path.join(auth_dir, "auth_state.json")
+    if not os.path.exists(auth_manager.auth_file_path):
+        with open(auth_manager.auth_file_path, 'w') as f:
+            json.dump(fake_backend.fake_browser_headers(), f)
+    return auth_manager
+
+
+def test_saved_auth_check_failures():
+    """Only a confirmed authentication error discards a saved login"""
+    backend = fake_backend.install(playlists=1, tracks=5)
+    previous_governor = set_governor(RequestGovernor(max_retries=0))
+    try:
+        auth_dir = tempfile.mkdtemp()
+
+        # Offline: the login is kept, still unverified
+        backend.offline = True
+        auth_manager = saved_auth_manager(auth_dir)
+        assert auth_manager.load_saved_auth()
+        auth_manager.auth_validator.wait()
+        QCoreApplication.processEvents()
+        assert auth_manager.is_authenticated and auth_manager.last_auth_time is None
+        assert os.path.exists(auth_manager.auth_file_path)
+
+        # Expired cookies: logged out and the file is removed
+        backend.offline = False
+        backend.auth_valid = False
+        auth_manager = saved_auth_manager(auth_dir)
+        assert auth_manager.load_saved_auth()
+        auth_manager.auth_validator.wait()
+        QCoreApplication.processEvents()
+        assert not auth_manager.is_authenticated
+        assert not os.path.exists(auth_manager.auth_file_path)
+        print("✓ Saved login survived a failed connection and was dropped once rejected")
+    finally:
+        set_governor(previous_governor)
+        fake_backend.uninstall()
+
+
+def test_background_token_refresh():
+    """Token checks and refreshes run off the calling thread and report back by signal"""
+    backend = fake_backend.install(playlists=2, tracks=5)
+    previous_governor = set_governor(RequestGovernor(max_retries=0))
+    try:
+        auth_manager = AuthenticationManager()
+        auth_manager.auth_file_path = os.path.join(tempfile.mkdtemp(), "auth.json")
+        auth_manager.auth_state_path = os.path.join(os.path.dirname(auth_manager.auth_file_path), "state.json")
+        assert auth_manager.authenticate_with_headers(fake_backend.fake_browser_headers())
+        auth_manager.auth_check_timer.stop()
+        outcomes = []
+        auth_manager.token_refresh_finished.connect(outcomes.append)
+
+        def finish():
+            auth_manager.token_refresher.wait()
+            QCoreApplication.processEvents()
+
+        # Working tokens pass the check; a forced refresh installs a new client
+        assert auth_manager.start_token_refresh(check_first=True)
+        finish()
+        generation = auth_manager._credentials_generation
+        assert auth_manager.start_token_refresh()
+        finish()
+        assert outcomes == [True, True] and auth_manager._credentials_generation == generation + 1
+
+        # Offline: the check learns nothing and the login is kept
+        backend.offline = True
+        assert auth_manager.start_token_refresh(check_first=True)
+        finish()
+        assert outcomes[-1] is True and auth_manager.is_authenticated
+
+        # Expired cookies: every candidate fails and the login is dropped
+        backend.offline = False
+        backend.auth_valid = False
+        assert auth_manager.start_token_refresh(check_first=True)
+        finish()
+        assert outcomes[-1] is False and not auth_manager.is_authenticated
+        assert not auth_manager.start_token_refresh(check_first=True)
+        print("✓ Tokens checked and refreshed in the background")
+    finally:
+        set_governor(previous_governor)
+        fake_backend.uninstall()
+
+
+def test_playlist_service():
+    """PlaylistService fetches, lists and edits without Qt, also from asyncio"""
+    backend = fake_backend.install(playlists=3, tracks=150, page_size=100)
+    try:
+        service = signed_in_service()
+        playlist_id = backend.playlist_ids[0]
+        playlist = service.get_playlist(playlist_id)
+        assert playlist['track_count'] == 150 and len(playlist['tracks']) == 150
+        assert [item['id'] for item in service.list_library()] == backend.playlist_ids
+
+        async def fetch_and_remove():
+            pages = [page async for page in service.iter_playlist_pages_async(playlist_id)]
+            result = await service.remove_items_async(playlist_id, playlist['tracks'][:10])
+            return pages, result
+
+        pages, result = asyncio.run(fetch_and_remove())
+        assert [len(page['tracks']) for page in pages] == [100, 50]
+        assert len(result['removed']) == 10 and backend.track_count(playlist_id) == 140
+        remaining = asyncio.run(service.get_playlist_async(playlist_id, revalidate=True))
+        assert len(remaining['tracks']) == 140
+
+        # Revalidation covers the iterator's own requests, not the caller's
+        # while the iterator is suspended
+        service.list_library()
+        pages = service.iter_playlist_pages(playlist_id, revalidate=True)
+        next(pages)
+        hits = get_response_cache().stats()['hits']
+        service.list_library()
+        assert get_response_cache().stats()['hits'] > hits
+        pages.close()
+
+        authorization = sapisid_authorization("SID=a; SAPISID=secret; HSID=b", timestamp=1700000000)
+        assert authorization.startswith("SAPISIDHASH 1700000000_")
+        assert sapisid_authorization("SID=a") is None
+        print("✓ PlaylistService fetched, listed and removed, sync and async")
+    finally:
+        fake_backend.uninstall()
+
+
+def test_library_crawl():
+    """A library crawl caches every playlist, revalidating responses when refreshing"""
+    backend = fake_backend.install(playlists=3, tracks=150, page_size=100)
+    try:
+        pool = signed_in_pool()
+        cache = PlaylistCache(os.path.join(tempfile.mkdtemp(), "cache.sqlite3"))
+        playlists = PlaylistService(pool).list_library()
+        results = []
+        summary = crawl_playlists(pool, playlists, cache, max_workers=2,
+                                  on_result=lambda playlist, count, error: results.append((count, error)))
+        assert summary == {'cached': 3, 'failed': [], 'stopped': False}
+        assert results == [(150, "")] * 3
+        assert [cache.get_info(playlist['id'])['track_count'] for playlist in playlists] == [150] * 3
+
+        # Crawled again within the response cache's TTL: answered from it,
+        # unless revalidating
+        browsed = backend.stats()['endpoints']['browse']
+        crawl_playlists(pool, playlists, cache)
+        assert backend.stats()['endpoints']['browse'] == browsed
+        crawl_playlists(pool, playlists, cache, revalidate=True)
+        assert backend.stats()['endpoints']['browse'] == browsed + 3 * 2
+        print("✓ Library crawled into the cache, revalidated on refresh")
+    finally:
+        fake_backend.uninstall()
+
+
+def test_track_removal():
+    """Batched removal isolates the tracks the server rejects"""
+    backend = fake_backend.install(tracks=300)
+    try:
+        playlist_id = backend.playlist_ids[0]
+        tracks = [{'video_id': f"vid{number:07d}", 'set_video_id': f"set{number:07d}"}
+                  for number in range(0, 300, 3)]
+        tracks.insert(40, {'video_id': "vid9999999", 'set_video_id': "set9999999"})
+
+        with signed_in_pool().lease() as ytmusic:
+            result = remove_playlist_tracks(ytmusic, playlist_id, tracks, batch_size=50)
+
+        assert len(result['removed']) == 100
+        assert [track['video_id'] for track, _ in result['failed']] == ["vid9999999"]
+        assert backend.track_count(playlist_id) == 200
+        print(f"✓ Removed {len(result['removed'])} tracks, isolated {len(result['failed'])} rejected")
+    finally:
+        fake_backend.uninstall()
+
+
+def test_partial_removal_failure():
+    """A rejected batch is narrowed down to its bad tracks; a lost connection fails the rest"""
+    backend = fake_backend.install(tracks=300)
+    try:
+        playlist_id = backend.playlist_ids[0]
+        tracks = [{'video_id': f"vid{number:07d}", 'set_video_id': f"set{number:07d}"}
+                  for number in range(250)]
+        tracks[130]['set_video_id'] = tracks[170]['set_video_id'] = "set9999999"
+
+        class DropsConnection:
+            """Client that loses the network when it gets to a given track"""
+
+            def __init__(self, ytmusic, offline_at):
+                self.ytmusic = ytmusic
+                self.offline_at = offline_at
+
+            def remove_playlist_items(self, playlist_id, videos):
+                if videos[0]['videoId'] == self.offline_at:
+                    backend.offline = True
+                return self.ytmusic.remove_playlist_items(playlist_id, videos)
+
+        # Batch 1 goes through, batch 2 is split down to its two bad tracks
+        # and the connection drops at batch 3
+        with signed_in_pool().lease() as ytmusic:
+            result = remove_playlist_tracks(DropsConnection(ytmusic, "vid0000200"), playlist_id, tracks,
+                                            batch_size=100)
+        backend.offline = False
+
+        removed = {track['video_id'] for track in result['removed']}
+        failed = {track['video_id']: error for track, error in result['failed']}
+        assert len(removed) == 198 and removed.isdisjoint(failed)
+        assert len(failed) == 52 and all(f"vid{number:07d}" in failed for number in range(200, 250))
+        assert "Connection error" not in failed["vid0000130"]
+        assert "Connection error" in failed["vid0000200"]
+        assert backend.track_count(playlist_id) == 300 - 198
+        print(f"✓ Removed {len(removed)} tracks, isolated 2 rejected, {len(failed) - 2} failed offline")
+    finally:
+        fake_backend.uninstall()
+
+
+def test_removal_rollback():
+    """Tracks the server refuses to remove go back to their original rows"""
+    backend = fake_backend.install(tracks=60)
+    try:
+        playlist_id = backend.playlist_ids[0]
+        tracks = signed_in_service().get_playlist(playlist_id)['tracks']
+        model = TrackTableModel()
+        model.set_tracks(list(tracks))
+        proxy = TrackSortProxyModel()
+        proxy.setSourceModel(model)
+        proxy.sort(TrackTableModel.COLUMN_TITLE, Qt.SortOrder.DescendingOrder)
+
+        # Tracks 10, 11 and 40 were already removed elsewhere: the server refuses them
+        selected = tracks[5:15] + [tracks[40]]
+        with signed_in_pool().lease() as ytmusic:
+            remove_playlist_tracks(ytmusic, playlist_id, [tracks[10], tracks[11], tracks[40]])
+        model.remove_tracks([track_key(track) for track in selected])
+        remover = TrackRemover(signed_in_service(), playlist_id, selected)
+        results = []
+        remover.removal_finished.connect(results.append)
+        remover.run()
+
+        failed = [track for track, error in results[0]['failed']]
+        assert [track.position for track in failed] == [11, 12, 41]
+        model.restore_tracks(failed)
+        expected = [track for track in tracks if track not in selected or track in failed]
+        assert model.tracks() == expected
+        assert proxy.rowCount() == len(expected)
+        shown = [model.track(proxy.mapToSource(proxy.index(row, 0)).row()).title_key
+                 for row in range(proxy.rowCount())]
+        assert shown == sorted((track.title_key for track in expected), reverse=True)
+        print(f"✓ {len(failed)} refused tracks restored at positions {[track.position for track in failed]}")
+    finally:
+        fake_backend.uninstall()
+
+
+def test_throttled_fetch():
+    """Injected 429s are retried without losing or duplicating pages"""
+    backend = fake_backend.install(tracks=400, page_size=100, throttle_rate=0.3, seed=7)
+    try:
+        fetcher = PlaylistFetcher(signed_in_service(), backend.playlist_ids[0])
+        results, errors = [], []
+        fetcher.data_ready.connect(results.append)
+        fetcher.error_occurred.connect(errors.append)
+        fetcher.run()
+
+        assert not errors, errors
+        assert [track['video_id'] for track in results[0]] == [f"vid{number:07d}" for number in range(400)]
+        assert backend.stats()['throttled'] > 0
+        print(f"✓ Fetch survived {backend.stats()['throttled']} throttled requests")
+    finally:
+        fake_backend.uninstall()
+
+
+def test_streaming_export():
+    """Pages from PlaylistFetcher can be exported as they arrive"""
+    backend = fake_backend.install(tracks=250, page_size=100)
+    try:
+        playlist_id = backend.playlist_ids[0]
+        path = os.path.join(tempfile.mkdtemp(), "tracks.jsonl")
+        fetcher = PlaylistFetcher(signed_in_service(), playlist_id, keep_tracks=False)
+        results = []
+        fetcher.data_ready.connect(results.append)
+        with open_writer(path) as writer:
+            fetcher.tracks_ready.connect(lambda page: writer.write(page, playlist_id))
+            fetcher.run()
+
+        assert results == [[]] and writer.count == 250
+        with open(path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        assert [row['position'] for row in rows] == list(range(1, 251))
+        assert tuple(rows[0]) == EXPORT_FIELDS
+        assert rows[0]['playlist_id'] == playlist_id and rows[0]['set_video_id'] == "set0000000"
+
+        # A writer without _write_rows() fails before it opens anything
+        class IncompleteWriter(TrackWriter):
+            def __init__(self, path):
+                super().__init__(path)
+                open(path, 'w').close()
+        unwritten = os.path.join(os.path.dirname(path), "unwritten.jsonl")
+        try:
+            IncompleteWriter(unwritten)
+            raise AssertionError("incomplete writer was created")
+        except TypeError:
+            pass
+        assert not os.path.exists(unwritten)
+        print(f"✓ Exported {writer.count} tracks page by page")
+    finally:
+        fake_backend.uninstall()
+
+
+def test_cli():
+    """The command line fetches, exports and removes without Qt"""
+    backend = fake_backend.install(tracks=120)
+    home = tempfile.mkdtemp()
+    environ = dict(os.environ)
+    os.environ['HOME'] = os.environ['XDG_CONFIG_HOME'] = home
+    try:
+        playlist_id = backend.playlist_ids[0]
+        auth_file = os.path.join(home, "auth.json")
+        with open(auth_file, 'w') as f:
+            json.dump(fake_backend.fake_browser_headers(), f)
+
+        assert cli.main(["fetch", playlist_id]) == 0
+        assert PlaylistCache().get_info(playlist_id)['track_count'] == 120
+        assert cli.main(["--auth", auth_file, "remove", playlist_id, "set0000007"]) == 0
+        assert backend.track_count(playlist_id) == 119
+        path = os.path.join(home, "tracks.csv")
+        assert cli.main(["export", playlist_id, "--output", path]) == 0
+        with open(path, encoding='utf-8') as f:
+            assert len(f.readlines()) == 1 + 119
+        # A failed fetch leaves the previous export in place
+        backend.offline = True
+        previous_governor = set_governor(RequestGovernor(max_retries=0))
+        try:
+            assert cli.main(["fetch", playlist_id, "--output", path, "--no-cache"]) == 1
+        finally:
+            set_governor(previous_governor)
+            backend.offline = False
+        with open(path, encoding='utf-8') as f:
+            assert len(f.readlines()) == 1 + 119
+        assert not [name for name in os.listdir(home) if name.endswith(".part")]
+        assert cli.main(["fetch", playlist_id, "--output", path, "--no-cache"]) == 0
+        with open(path, encoding='utf-8') as f:
+            assert len(f.readlines()) == 1 + 119
+
+        # Removal needs a login
+        assert cli.main(["remove", playlist_id, "set0000008"]) == 1
+
+        imported = subprocess.run(
+            [sys.executable, "-c", "import cli, sys; print(sorted(m for m in sys.modules if 'Qt' in m))"],
+            cwd=Path(__file__).parent / "src", capture_output=True, text=True, check=True).stdout
+        assert imported.strip() == "[]", imported
+        print("✓ Command line fetched, removed and exported without importing Qt")
+    finally:
+        os.environ.clear()
+        os.environ.update(environ)
+        fake_backend.uninstall()
+
+
+if __name__ == "__main__":
+    print("PlaylistCat 🐱 - Offline Backend Tests")
+    print("=" * 50)
+    test_playlist_fetch()
+    test_library_and_auth()
+    test_deferred_startup()
+    test_saved_auth_check_failures()
+    test_background_token_refresh()
+    test_playlist_service()
+    test_library_crawl()
+    test_track_removal()
+    test_partial_removal_failure()
+    test_removal_rollback()
+    test_throttled_fetch()
+    test_streaming_export()
+    test_cli()
+    print("\n🎉 All offline tests passed!")
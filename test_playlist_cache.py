@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the playlist cache: staged fetches, and cleaning up after fetches
+that never completed without touching those of other processes
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import playlist_cache
+from playlist_cache import PlaylistCache
+from utils import make_track
+
+
+def make_tracks(count: int, start: int = 1) -> list:
+    return [make_track(position, f"Artist {position}", f"Title {position}",
+                       f"vid{position:04d}", f"set{position:04d}")
+            for position in range(start, start + count)]
+
+
+def test_staged_fetch():
+    """Staged pages replace the cached playlist only when committed"""
+    cache = PlaylistCache(os.path.join(tempfile.mkdtemp(), "cache.sqlite3"))
+    cache.save_tracks("PL1", make_tracks(3), title="Old")
+
+    staging_id = cache.begin_staged_tracks("PL1")
+    cache.append_staged_tracks(staging_id, make_tracks(100))
+    cache.append_staged_tracks(staging_id, make_tracks(50, start=101))
+    assert len(cache.load_tracks("PL1")) == 3
+
+    cache.commit_staged_tracks(staging_id, "PL1", title="New")
+    tracks = cache.load_tracks("PL1")
+    assert [track.position for track in tracks] == list(range(1, 151))
+    assert cache.get_info("PL1")['title'] == "New" and cache.get_info("PL1")['track_count'] == 150
+
+    discarded = cache.begin_staged_tracks("PL1")
+    cache.append_staged_tracks(discarded, make_tracks(10))
+    cache.discard_staged_tracks(discarded)
+    assert len(cache.load_tracks("PL1")) == 150
+    assert [row['playlist_id'] for row in cache.cached_playlists()] == ["PL1"]
+    print("✓ Staged pages committed and discarded")
+
+
+def test_staging_cleanup():
+    """Opening the cache drops abandoned staged fetches only"""
+    path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+    cache = PlaylistCache(path)
+
+    # A fetch still running, e.g. in the GUI while the command line starts
+    running = cache.begin_staged_tracks("PL1")
+    cache.append_staged_tracks(running, make_tracks(20))
+    # A fetch whose process was killed two hours ago
+    abandoned = cache.begin_staged_tracks("PL2")
+    cache.append_staged_tracks(abandoned, make_tracks(20))
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE staging SET touched_at = touched_at - ? WHERE staging_id = ?",
+                     (2 * playlist_cache.STAGING_MAX_AGE, abandoned))
+    conn.close()
+
+    PlaylistCache(path)
+    conn = sqlite3.connect(path)
+    staged = dict(conn.execute("SELECT playlist_id, COUNT(*) FROM tracks GROUP BY playlist_id").fetchall())
+    conn.close()
+    assert staged == {running: 20}, staged
+
+    cache.append_staged_tracks(running, make_tracks(5, start=21))
+    cache.commit_staged_tracks(running, "PL1")
+    assert cache.get_info("PL1")['track_count'] == 25
+    print("✓ Abandoned staged fetch dropped, running one kept")
+
+
+if __name__ == "__main__":
+    print("PlaylistCat 🐱 - Playlist Cache Tests")
+    print("=" * 50)
+    test_staged_fetch()
+    test_staging_cleanup()
+    print("\n🎉 All playlist cache tests passed!")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the request governor: token bucket pacing, the AIMD
+concurrency window, Retry-After, the circuit breaker and which failures
+are retried, without network
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import requests
+
+import request_governor
+from request_governor import RequestGovernor, CircuitOpenError, is_idempotent
+
+
+def response(status_code: int, **headers) -> requests.Response:
+    """A bare response with the given status and headers"""
+    result = requests.Response()
+    result.status_code = status_code
+    result.headers.update(headers)
+    return result
+
+
+class Server:
+    """Callable standing in for a request: answers from a script of outcomes, then 200"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self) -> requests.Response:
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome if isinstance(outcome, requests.Response) else response(outcome)
+
+
+def quick_backoff():
+    """Shrink the backoff so retries don't slow the tests down; returns the old base"""
+    previous = request_governor.BACKOFF_BASE
+    request_governor.BACKOFF_BASE = 0.001
+    return previous
+
+
+def test_token_bucket():
+    """A burst goes out at once, then requests are paced at the rate"""
+    governor = RequestGovernor(rate=20.0, burst=3)
+    server = Server()
+    start = time.monotonic()
+    for _ in range(3):
+        governor.send(server)
+    burst_time = time.monotonic() - start
+    for _ in range(4):
+        governor.send(server)
+    paced_time = time.monotonic() - start - burst_time
+
+    assert burst_time < 0.04, burst_time
+    # Four more tokens at 20 per second
+    assert 0.15 <= paced_time < 0.5, paced_time
+    assert governor.stats()['sent'] == 7
+    print(f"✓ Burst of 3 in {burst_time * 1000:.0f} ms, 4 more paced over {paced_time * 1000:.0f} ms")
+
+
+def test_aimd_window():
+    """429s halve the concurrency window, successes grow it by one per window"""
+    governor = RequestGovernor(rate=1000.0, burst=100, concurrency=8, max_concurrency=8, max_retries=0)
+    for expected in (4, 2, 1, 1):
+        assert governor.send(Server(429)).status_code == 429
+        assert governor.stats()['concurrency'] == expected
+    assert governor.stats()['throttled'] == 4
+
+    # Each success adds 1/window: from 1, one success opens a second slot,
+    # the third slot takes about two more
+    governor.send(Server())
+    assert governor.stats()['concurrency'] == 2
+    for _ in range(2):
+        governor.send(Server())
+        assert governor.stats()['concurrency'] == 2
+    governor.send(Server())
+    assert governor.stats()['concurrency'] == 3
+    print("✓ Concurrency window shrank 8 -> 1 on 429s and grew back additively")
+
+
+def test_retry_after():
+    """A throttled request waits at least as long as the server's Retry-After"""
+    previous = quick_backoff()
+    try:
+        governor = RequestGovernor(rate=1000.0, burst=100)
+        assert governor._backoff(0, "2") >= 2.0
+        assert governor._backoff(0, "not a number") < 0.01
+        assert governor._backoff(0, "3600") == request_governor.BACKOFF_CAP
+
+        server = Server(response(429, **{'Retry-After': '0.2'}))
+        start = time.monotonic()
+        assert governor.send(server).status_code == 200
+        elapsed = time.monotonic() - start
+        assert server.calls == 2 and governor.stats()['retried'] == 1
+        assert elapsed >= 0.2, elapsed
+        print(f"✓ Retried after Retry-After: 0.2 ({elapsed * 1000:.0f} ms)")
+    finally:
+        request_governor.BACKOFF_BASE = previous
+
+
+def test_circuit_breaker():
+    """Repeated failures pause all requests; a successful probe resumes them"""
+    governor = RequestGovernor(rate=1000.0, burst=100, max_retries=0,
+                               breaker_threshold=3, breaker_cooldown=0.2)
+    for _ in range(3):
+        assert governor.send(Server(503)).status_code == 503
+    assert governor.stats()['circuit_open']
+
+    server = Server()
+    try:
+        governor.send(server)
+        raise AssertionError("request sent while the circuit was open")
+    except CircuitOpenError:
+        pass
+    assert server.calls == 0
+
+    # After the cooldown one probe goes out; its failure reopens the circuit
+    time.sleep(0.25)
+    assert governor.send(Server(503)).status_code == 503
+    assert governor.stats()['circuit_open']
+
+    time.sleep(0.25)
+    assert governor.send(server).status_code == 200
+    assert not governor.stats()['circuit_open']
+    assert governor.send(server).status_code == 200 and server.calls == 2
+    print("✓ Circuit opened after 3 failures, reopened on a failed probe and closed on success")
+
+
+def test_non_idempotent_requests():
+    """Writes are not sent again after a failure that may have come after they were applied"""
+    previous = quick_backoff()
+    try:
+        governor = RequestGovernor(rate=1000.0, burst=100)
+
+        # Reads are retried after timeouts and server errors
+        server = Server(requests.ReadTimeout("slow"), 503)
+        assert governor.send(server).status_code == 200 and server.calls == 3
+
+        # Writes are not
+        server = Server(requests.ReadTimeout("slow"))
+        try:
+            governor.send(server, idempotent=False)
+            raise AssertionError("timed-out write was not reported")
+        except requests.ReadTimeout:
+            pass
+        assert server.calls == 1
+        server = Server(503, 200)
+        assert governor.send(server, idempotent=False).status_code == 503 and server.calls == 1
+
+        # ...unless the server provably never processed them
+        server = Server(429, requests.ConnectTimeout("unreachable"))
+        assert governor.send(server, idempotent=False).status_code == 200 and server.calls == 3
+
+        assert is_idempotent('POST', 'browse') and is_idempotent('GET', 'anything')
+        assert not is_idempotent('POST', 'browse/edit_playlist')
+        print("✓ Reads retried after timeouts and 5xx, writes only after 429 and connect timeouts")
+    finally:
+        request_governor.BACKOFF_BASE = previous
+
+
+if __name__ == "__main__":
+    print("PlaylistCat 🐱 - Request Governor Tests")
+    print("=" * 50)
+    test_token_bucket()
+    test_aimd_window()
+    test_retry_after()
+    test_circuit_breaker()
+    test_non_idempotent_requests()
+    print("\n🎉 All request governor tests passed!")
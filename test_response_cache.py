@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""
+Unit tests for the HTTP response cache: freshness, byte-bounded LRU
+eviction, ETag revalidation and invalidation by writes, without network
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import requests
+
+from response_cache import ResponseCache, revalidating, is_write_endpoint
+
+API = "https://music.youtube.com/youtubei/v1/"
+HEADERS = {'Cookie': "SID=a; SAPISID=b", 'X-Goog-AuthUser': "0"}
+
+
+class Server:
+    """Stand-in for sending a request: records the extra headers of each call"""
+
+    def __init__(self, status_code: int = 200, content: bytes = b'{"items": []}', **headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.calls = []
+
+    def __call__(self, extra_headers) -> requests.Response:
+        self.calls.append(extra_headers)
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers.update(self.headers)
+        response._content = self.content if self.status_code != 304 else b''
+        return response
+
+
+def new_cache(**options) -> ResponseCache:
+    """A response cache in a fresh temporary database"""
+    return ResponseCache(os.path.join(tempfile.mkdtemp(), "cache.sqlite3"), **options)
+
+
+def browse(cache: ResponseCache, server: Server, browse_id: str = "VLPL1") -> requests.Response:
+    return cache.send('POST', API + "browse?alt=json", {'browseId': browse_id}, HEADERS, server)
+
+
+def test_ttl_expiry():
+    """Responses are served from the cache until their endpoint's TTL runs out"""
+    cache = new_cache(ttls={'browse': 0.2})
+    server = Server()
+    assert browse(cache, server).json() == {'items': []}
+    assert browse(cache, server).json() == {'items': []}
+    assert len(server.calls) == 1
+
+    # Another account never sees this one's responses
+    cache.send('POST', API + "browse?alt=json", {'browseId': "VLPL1"}, dict(HEADERS, Cookie="SID=c"), server)
+    assert len(server.calls) == 2
+
+    time.sleep(0.25)
+    browse(cache, server)
+    assert len(server.calls) == 3
+
+    # Endpoints without a TTL are not cached
+    for _ in range(2):
+        cache.send('POST', API + "next?alt=json", {'videoId': "v"}, HEADERS, server)
+    assert len(server.calls) == 5
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 3
+    print("✓ Fresh responses served from the cache, expired ones fetched again")
+
+
+def test_lru_eviction():
+    """Memory and disk hold at most their byte budgets, dropping the least recently used"""
+    cache = new_cache(memory_max_bytes=250, disk_max_bytes=250)
+    server = Server(content=b'x' * 100)
+    browse(cache, server, "one")
+    browse(cache, server, "two")
+    browse(cache, server, "one")  # Now the most recently used
+    browse(cache, server, "three")
+    assert len(server.calls) == 3
+    assert cache.stats()['memory_bytes'] == 200 and cache.stats()['memory_entries'] == 2
+
+    # A fresh process sees what is left on disk: "two" was evicted there too
+    reopened = ResponseCache(cache.db_path, memory_max_bytes=250, disk_max_bytes=250)
+    for browse_id in ("one", "three"):
+        browse(reopened, server, browse_id)
+    assert len(server.calls) == 3
+    browse(reopened, server, "two")
+    assert len(server.calls) == 4
+
+    # Responses larger than the memory budget are not stored at all
+    big = Server(content=b'x' * 300)
+    browse(cache, big, "big")
+    browse(cache, big, "big")
+    assert len(big.calls) == 2
+    print("✓ Least recently used responses evicted at the byte budget")
+
+
+def test_etag_revalidation():
+    """A forced refresh revalidates with If-None-Match and reuses the body on 304"""
+    cache = new_cache()
+    server = Server(ETag='"v1"')
+    first = browse(cache, server)
+
+    with revalidating():
+        server.status_code = 304
+        revalidated = browse(cache, server)
+    assert server.calls[-1] == {'If-None-Match': '"v1"'}
+    assert revalidated.status_code == 200 and revalidated.content == first.content
+    assert cache.stats()['revalidated'] == 1
+
+    # A changed response replaces the stored one
+    with revalidating():
+        server.status_code = 200
+        server.content = b'{"items": [1]}'
+        assert browse(cache, server).json() == {'items': [1]}
+    assert browse(cache, server).json() == {'items': [1]} and len(server.calls) == 3
+    print("✓ Revalidated with the stored ETag and reused the body on 304")
+
+
+def test_invalidation():
+    """Only writes drop cached responses, and rejected writes don't"""
+    cache = new_cache()
+    server = Server()
+    browse(cache, server)
+
+    for endpoint in ("next", "log_event", "account/account_menu"):
+        cache.send('POST', API + endpoint, {}, HEADERS, Server())
+    browse(cache, server)
+    assert len(server.calls) == 1
+
+    cache.send('POST', API + "browse/edit_playlist", {'playlistId': "PL1"}, HEADERS, Server(400))
+    browse(cache, server)
+    assert len(server.calls) == 1
+
+    cache.send('POST', API + "browse/edit_playlist", {'playlistId': "PL1"}, HEADERS, Server())
+    browse(cache, server)
+    assert len(server.calls) == 2
+
+    # A write that timed out may still have been applied
+    def timed_out(extra_headers):
+        raise requests.ReadTimeout("slow")
+    try:
+        cache.send('POST', API + "like/like", {'target': {'videoId': "v"}}, HEADERS, timed_out)
+        raise AssertionError("timeout was swallowed")
+    except requests.ReadTimeout:
+        pass
+    browse(cache, server)
+    assert len(server.calls) == 3
+
+    assert is_write_endpoint("playlist/create") and is_write_endpoint("like/removelike")
+    assert not is_write_endpoint("browse") and not is_write_endpoint("likes")
+    print("✓ Cache dropped after writes only")
+
+
+if __name__ == "__main__":
+    print("PlaylistCat 🐱 - Response Cache Tests")
+    print("=" * 50)
+    test_ttl_expiry()
+    test_lru_eviction()
+    test_etag_revalidation()
+    test_invalidation()
+    print("\n🎉 All response cache tests passed!")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+"""
+Tests for performance tracing: span nesting, the Chrome trace export and
+recording being off by default
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import tracing
+
+
+def trace_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "trace.json")
+
+
+def spans_of(path: str) -> list:
+    """The complete ('X') events of a saved trace"""
+    with open(path) as f:
+        trace = json.load(f)
+    return [event for event in trace['traceEvents'] if event['ph'] == 'X']
+
+
+def test_disabled_by_default():
+    """Without a recording, hooks record nothing and pass results through"""
+    assert not tracing.is_enabled()
+    with tracing.span("Ignored", status=200) as details:
+        details['extra'] = 1
+
+    @tracing.traced()
+    def double(value):
+        return value * 2
+    assert double(21) == 42
+    assert list(tracing.trace_iter(iter("abc"), "Ignored")) == ["a", "b", "c"]
+    assert tracing.stop() is None
+    print("✓ Nothing recorded while tracing is off")
+
+
+def test_span_nesting():
+    """Nested spans are saved inside their parents, with details and thread names"""
+    path = trace_path()
+    tracing.start(path)
+    try:
+        @tracing.traced(category="fetch")
+        def fetch_page(number):
+            with tracing.span("Normalize tracks", "processing", tracks=number) as details:
+                details['kept'] = number - 1
+
+        with tracing.span("Load playlist", "ui"):
+            for number in tracing.trace_iter((1, 2), "Fetch playlist page", "fetch"):
+                fetch_page(number)
+
+        worker = threading.Thread(target=fetch_page, args=(3,), name="Dummy-7")
+        worker.start()
+        worker.join()
+    finally:
+        saved = tracing.stop()
+    assert saved == path and not tracing.is_enabled()
+
+    with open(path) as f:
+        trace = json.load(f)
+    assert trace['otherData']['dropped_events'] == 0
+    thread_names = {event['args']['name'] for event in trace['traceEvents'] if event['ph'] == 'M'}
+    assert "MainThread" in thread_names and "Worker-7" in thread_names
+
+    def inside(inner, parent):
+        return (inner['tid'] == parent['tid'] and parent['ts'] <= inner['ts']
+                and inner['ts'] + inner['dur'] <= parent['ts'] + parent['dur'])
+
+    spans = spans_of(path)
+    names = [event['name'] for event in spans]
+    assert names.count("Normalize tracks") == 3
+    (outer,) = [event for event in spans if event['name'] == "Load playlist"]
+    # The iterator records one more span for finding it was exhausted
+    pages = [event for event in spans if event['name'] == "Fetch playlist page"]
+    assert [page['args']['index'] for page in pages] == [0, 1, 2]
+    assert all(inside(page, outer) for page in pages)
+
+    calls = [event for event in spans if event['name'].endswith("fetch_page")]
+    normalized = [event for event in spans if event['name'] == "Normalize tracks"]
+    assert len(calls) == 3 and all(call['cat'] == "fetch" for call in calls)
+    for call, inner in zip(calls, normalized):
+        assert inside(inner, call)
+        assert inner['args']['kept'] == inner['args']['tracks'] - 1
+    assert all(inside(call, outer) for call in calls[:2]) and not inside(calls[2], outer)
+    print(f"✓ {len(spans)} spans saved nested, with details and thread names")
+
+
+def test_event_limit():
+    """Spans past the limit are dropped and counted"""
+    path = trace_path()
+    previous = tracing.MAX_EVENTS
+    tracing.MAX_EVENTS = 5
+    tracing.start(path)
+    try:
+        for number in range(8):
+            with tracing.span("Span", number=number):
+                pass
+    finally:
+        tracing.stop()
+        tracing.MAX_EVENTS = previous
+
+    with open(path) as f:
+        trace = json.load(f)
+    assert [event['args']['number'] for event in spans_of(path)] == [0, 1, 2, 3, 4]
+    assert trace['otherData']['dropped_events'] == 3
+    print("✓ Spans past the limit dropped and counted")
+
+
+def test_start_from_environment():
+    """PLAYLISTCAT_TRACE starts a recording to the named file"""
+    previous = os.environ.pop(tracing.TRACE_ENV_VAR, None)
+    try:
+        assert not tracing.start_from_environment() and not tracing.is_enabled()
+        path = trace_path()
+        os.environ[tracing.TRACE_ENV_VAR] = path
+        assert tracing.start_from_environment() and tracing.is_enabled()
+        assert tracing.stop() == path and os.path.exists(path)
+        print("✓ Recording started from the environment")
+    finally:
+        os.environ.pop(tracing.TRACE_ENV_VAR, None)
+        if previous is not None:
+            os.environ[tracing.TRACE_ENV_VAR] = previous
+
+
+if __name__ == "__main__":
+    print("PlaylistCat 🐱 - Tracing Tests")
+    print("=" * 50)
+    test_disabled_by_default()
+    test_span_nesting()
+    test_event_limit()
+    test_start_from_environment()
+    print("\n🎉 All tracing tests passed!")
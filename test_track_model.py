@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+"""
+Model tests for the track table: refreshing, removing and restoring rows,
+and the sorting proxy's row mapping, without a window
+"""
+
+import os
+import sys
+import random
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from PyQt6.QtCore import Qt, QCoreApplication, QPersistentModelIndex
+
+from utils import make_track, track_key, diff_tracks
+from track_model import TrackTableModel, TrackSortProxyModel, contiguous_runs
+from exporters import export_tracks
+
+app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+
+def make_tracks(numbers) -> list:
+    """Tracks vid<number>/set<number>, at positions 1..n in the given order"""
+    return [make_track(position, f"Artist {number:03d}", f"Title {number:03d}",
+                       f"vid{number:03d}", f"set{number:03d}")
+            for position, number in enumerate(numbers, 1)]
+
+
+def numbers_of(tracks) -> list:
+    return [int(track.set_video_id[3:]) for track in tracks]
+
+
+def sorted_model(tracks, column=TrackTableModel.COLUMN_POSITION, order=Qt.SortOrder.AscendingOrder):
+    """A model over tracks behind a proxy sorted on column"""
+    model = TrackTableModel()
+    model.set_tracks(tracks)
+    proxy = TrackSortProxyModel()
+    proxy.setSourceModel(model)
+    proxy.sort(column, order)
+    return model, proxy
+
+
+def proxy_numbers(proxy) -> list:
+    """Track numbers in the order the proxy shows them"""
+    model = proxy.sourceModel()
+    return numbers_of(model.track(proxy.mapToSource(proxy.index(row, 0)).row())
+                      for row in range(proxy.rowCount()))
+
+
+def assert_consistent(proxy):
+    """Both directions of the proxy mapping agree with each other"""
+    model = proxy.sourceModel()
+    assert proxy.rowCount() == model.rowCount()
+    for row in range(proxy.rowCount()):
+        source = proxy.mapToSource(proxy.index(row, 1))
+        assert source.isValid() and source.column() == 1
+        assert proxy.mapFromSource(source).row() == row
+
+
+def test_proxy_mapping():
+    """The proxy maps both ways after sorting, appending pages and removing rows"""
+    # Artist names run against the playlist order, so sorts really permute
+    numbers = [(number * 37) % 100 for number in range(100)]
+    model, proxy = sorted_model(make_tracks(numbers[:40]))
+    assert proxy_numbers(proxy) == numbers[:40]
+    selected = QPersistentModelIndex(proxy.index(5, TrackTableModel.COLUMN_TITLE))
+
+    proxy.sort(TrackTableModel.COLUMN_ARTIST)
+    assert proxy_numbers(proxy) == sorted(numbers[:40])
+    assert_consistent(proxy)
+    assert numbers_of([model.track(proxy.mapToSource(selected).row())]) == [numbers[5]]
+    assert selected.column() == TrackTableModel.COLUMN_TITLE
+
+    # Later pages are merged into the sorted order as they arrive
+    inserted = []
+    proxy.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    for start in (40, 70):
+        model.append_tracks(make_tracks(numbers)[start:start + 30])
+    assert proxy_numbers(proxy) == sorted(numbers)
+    assert sum(last - first + 1 for first, last in inserted) == 60
+    assert_consistent(proxy)
+
+    proxy.sort(TrackTableModel.COLUMN_TITLE, Qt.SortOrder.DescendingOrder)
+    assert proxy_numbers(proxy) == sorted(numbers, reverse=True)
+    model.remove_tracks([f"set{number:03d}" for number in numbers[10:60]])
+    assert proxy_numbers(proxy) == sorted(numbers[:10] + numbers[60:], reverse=True)
+    assert_consistent(proxy)
+
+    # Column -1 shows the source order, and out-of-range rows map to nothing
+    proxy.sort(-1)
+    assert proxy_numbers(proxy) == numbers[:10] + numbers[60:]
+    assert not proxy.mapToSource(proxy.index(proxy.rowCount(), 0)).isValid()
+    assert not proxy.mapFromSource(model.index(model.rowCount(), 0)).isValid()
+    print("✓ Proxy mapping consistent through sorts, appended pages and removals")
+
+
+def test_diff_moves():
+    """diff_tracks reports changes by key and counts the fewest tracks that moved"""
+    old = make_tracks(range(10))
+    assert diff_tracks(old, make_tracks(range(10))) == {'added': [], 'removed': [], 'updated': [], 'moved': 0}
+
+    # 9 to the front: only it moved, though every position changed
+    diff = diff_tracks(old, make_tracks([9] + list(range(9))))
+    assert diff['moved'] == 1 and len(diff['updated']) == 10
+    # Swapping neighbours moves one of them; reversing all but one
+    assert diff_tracks(old, make_tracks([1, 0] + list(range(2, 10))))['moved'] == 1
+    assert diff_tracks(old, make_tracks(range(9, -1, -1)))['moved'] == 9
+
+    # Removals and additions alone shift positions but move nothing
+    diff = diff_tracks(old, make_tracks([0, 100, 2, 3, 5, 6, 7, 8, 9, 101]))
+    assert diff['moved'] == 0 and diff['removed'] == ["set001", "set004"]
+    assert numbers_of(diff['added']) == [100, 101]
+    assert numbers_of(diff['updated']) == [5, 6, 7, 8, 9]
+
+    # Same track, new details
+    renamed = make_tracks(range(10))
+    renamed[4] = make_track(5, "Artist 004", "Title 004 (Remastered)", "vid004", "set004")
+    assert numbers_of(diff_tracks(old, renamed)['updated']) == [4]
+
+    # Against the quadratic longest increasing subsequence on shuffles
+    shuffler = random.Random(7)
+    for _ in range(50):
+        order = list(range(60))
+        shuffler.shuffle(order)
+        order = order[:shuffler.randint(0, 60)]
+        longest = [1] * len(order)
+        for i in range(len(order)):
+            for j in range(i):
+                if order[j] < order[i]:
+                    longest[i] = max(longest[i], longest[j] + 1)
+        expected = len(order) - max(longest, default=0)
+        assert diff_tracks(make_tracks(range(60)), make_tracks(order))['moved'] == expected
+    print("✓ Diff found added, removed and updated tracks and the fewest moves")
+
+
+def test_refresh_keeps_playlist_order():
+    """A refresh that adds, removes and moves tracks leaves the rows in playlist order"""
+    tracks = make_tracks(range(30))
+    model, proxy = sorted_model(tracks, TrackTableModel.COLUMN_TITLE)
+    selected = QPersistentModelIndex(proxy.index(proxy.rowCount() - 1, 0))
+
+    # Drop 0-2 and 5, move 29 to the front and 7 further down, add 300-302
+    order = [29, 3, 4, 6, 300] + [n for n in range(8, 20)] + [7, 301] + list(range(20, 29)) + [302]
+    refreshed = make_tracks(order)
+    diff = model.update_tracks(refreshed)
+
+    assert len(diff['added']) == 3 and len(diff['removed']) == 4
+    assert model.tracks() is tracks
+    assert numbers_of(tracks) == order
+    assert [track.position for track in tracks] == list(range(1, len(order) + 1))
+    assert proxy_numbers(proxy) == sorted(order)
+    assert_consistent(proxy)
+    # The selection follows its track, not its row
+    assert numbers_of([model.track(proxy.mapToSource(selected).row())]) == [29]
+
+    # Removing and restoring after the refresh puts rows back where they were
+    removed = model.remove_tracks([track_key(track) for track in tracks[2::5]])
+    model.restore_tracks(removed)
+    assert numbers_of(tracks) == order
+    assert_consistent(proxy)
+
+    path = os.path.join(tempfile.mkdtemp(), "tracks.csv")
+    assert export_tracks(path, model.tracks(), "PL1") == len(order)
+    with open(path, encoding='utf-8') as f:
+        rows = [line.split(',') for line in f.read().splitlines()[1:]]
+    assert [int(row[1]) for row in rows] == list(range(1, len(order) + 1))
+    assert [row[5] for row in rows] == [f"set{number:03d}" for number in order]
+    print(f"✓ Refresh kept {len(order)} tracks in playlist order through remove, restore and export")
+
+
+def test_scattered_removal():
+    """Removing scattered rows keeps the sorted proxy mapped and emits one notification per run"""
+    tracks = make_tracks(range(200))
+    model, proxy = sorted_model(tracks, TrackTableModel.COLUMN_TITLE, Qt.SortOrder.DescendingOrder)
+    source_runs, proxy_runs = [], []
+    model.rowsRemoved.connect(lambda parent, first, last: source_runs.append((first, last)))
+    proxy.rowsRemoved.connect(lambda parent, first, last: proxy_runs.append((first, last)))
+
+    gone = set(range(0, 200, 7)) | {50, 51, 52, 53} | {199}
+    removed = model.remove_tracks([f"set{number:03d}" for number in gone] + ["set999"])
+
+    remaining = [number for number in range(200) if number not in gone]
+    assert numbers_of(removed) == sorted(gone)
+    assert numbers_of(model.tracks()) == remaining
+    assert proxy_numbers(proxy) == sorted(remaining, reverse=True)
+    assert_consistent(proxy)
+    # 49-53 go in one run, every other removed row in a run of its own,
+    # bottom first
+    assert len(source_runs) == len(gone) - 4
+    assert source_runs[0] == (199, 199) and (49, 53) in source_runs
+    assert sum(last - first + 1 for first, last in proxy_runs) == len(gone)
+
+    # A single removal, as a Remove button click does
+    assert numbers_of([model.remove_track("set001")]) == [1]
+    assert proxy_numbers(proxy) == sorted(remaining[1:], reverse=True)
+    assert_consistent(proxy)
+    print(f"✓ Removed {len(gone)} scattered tracks in {len(source_runs) - 1} runs")
+
+
+def test_removal_batches():
+    """A bulk removal is one batch of contiguous runs, announced before and after"""
+    assert contiguous_runs([]) == []
+    assert contiguous_runs([4]) == [(4, 4)]
+    assert contiguous_runs([0, 1, 2, 5, 7, 8]) == [(0, 2), (5, 5), (7, 8)]
+
+    model, proxy = sorted_model(make_tracks(range(20)), TrackTableModel.COLUMN_TITLE)
+    events = []
+    model.removal_batch_started.connect(lambda rows: events.append(("started", rows)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(("removed", first, last)))
+    model.removal_batch_finished.connect(lambda: events.append(("finished",)))
+
+    model.remove_tracks([f"set{number:03d}" for number in (8, 2, 3, 9, 15, 4)])
+    assert events == [("started", [2, 3, 4, 8, 9, 15]), ("removed", 15, 15),
+                      ("removed", 8, 9), ("removed", 2, 4), ("finished",)]
+    assert_consistent(proxy)
+
+    # Nothing to remove, nothing announced
+    events.clear()
+    assert model.remove_tracks(["set002", "set999"]) == [] and events == []
+    print("✓ Bulk removal announced as one batch of contiguous runs")
+
+
+def test_partial_restore():
+    """Restoring only the refused tracks of a removal puts them back at their rows"""
+    tracks = make_tracks(range(50))
+    model, proxy = sorted_model(tracks, TrackTableModel.COLUMN_ARTIST, Qt.SortOrder.DescendingOrder)
+    removed = model.remove_tracks([f"set{number:03d}" for number in (0, 10, 11, 12, 30, 49)])
+    assert len(removed) == 6 and model.rowCount() == 44
+
+    # The server refused 0, 11 and 49: those come back, the rest stay removed
+    refused = [track for track in removed if numbers_of([track])[0] in (0, 11, 49)]
+    model.restore_tracks(refused)
+    remaining = [number for number in range(50) if number not in (10, 12, 30)]
+    assert numbers_of(model.tracks()) == remaining
+    assert [model.row_for_key(f"set{number:03d}") for number in (0, 11, 49)] == [0, 10, 46]
+    assert proxy_numbers(proxy) == sorted(remaining, reverse=True)
+    assert_consistent(proxy)
+    print("✓ Refused tracks restored at their original rows")
+
+
+if __name__ == "__main__":
+    print("PlaylistCat 🐱 - Track Model Tests")
+    print("=" * 50)
+    test_proxy_mapping()
+    test_diff_moves()
+    test_refresh_keeps_playlist_order()
+    test_scattered_removal()
+    test_removal_batches()
+    test_partial_restore()
+    print("\n🎉 All track model tests passed!")
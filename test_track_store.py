@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the memory-mapped track list of low-memory mode: it behaves like
+a plain list of tracks, also as the list behind the track table model
+"""
+
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from PyQt6.QtCore import Qt, QCoreApplication
+
+import track_store
+from track_store import MappedTrackList, MappedTrackStore
+from track_model import TrackTableModel, TrackSortProxyModel
+from utils import make_track, track_key
+
+app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+
+def make_tracks(count: int, start: int = 0) -> list:
+    return [make_track(number + 1, f"Artist {number:04d}", f"Title {number:04d}",
+                       f"vid{number:04d}", f"set{number:04d}")
+            for number in range(start, start + count)]
+
+
+def test_list_operations():
+    """Every list operation the model uses gives the same result as on a list"""
+    tracks = make_tracks(2500)
+    mapped = MappedTrackList(tracks)
+    expected = list(tracks)
+    try:
+        assert len(mapped) == 2500 and list(mapped) == expected
+        assert mapped[0] == expected[0] and mapped[-1] == expected[-1]
+        assert mapped[10:20] == expected[10:20] and mapped[::500] == expected[::500]
+
+        extra = make_tracks(3, start=5000)
+        for target in (mapped, expected):
+            del target[100:200]
+            del target[5]
+            target[7] = extra[0]
+            target[50:50] = extra[1:]
+            target.insert(0, extra[2])
+            target.append(extra[0])
+            target.extend(make_tracks(1200, start=6000))
+        assert len(mapped) == len(expected) and list(mapped) == expected
+
+        expected.sort(key=lambda track: track.title_key, reverse=True)
+        mapped[:] = expected
+        assert mapped[:] == expected
+        assert [track_key(track) for track in mapped][:3] == ["set7199", "set7198", "set7197"]
+        print(f"✓ {len(mapped)} mapped tracks match a list through slicing, deletion and insertion")
+    finally:
+        mapped.close()
+
+
+def test_text_round_trip():
+    """Non-ASCII text and collation keys come back unchanged"""
+    tracks = [make_track(1, "Sigur Rós", "Hoppípolla", "vid1", "set1"),
+              make_track(2, "坂本龍一", "Merry Christmas Mr. Lawrence", "vid2", "set2"),
+              make_track(3, "", "", "", "")]
+    mapped = MappedTrackList(tracks)
+    try:
+        assert list(mapped) == tracks
+        assert [(track.artist_key, track.title_key) for track in mapped] == \
+            [(track.artist_key, track.title_key) for track in tracks]
+        print("✓ Non-ASCII text and collation keys round-tripped")
+    finally:
+        mapped.close()
+
+
+def test_read_cache():
+    """Repeated reads are served from the cache; full scans leave it alone"""
+    previous = track_store.CACHE_ROWS
+    track_store.CACHE_ROWS = 10
+    mapped = MappedTrackList(make_tracks(100))
+    try:
+        first = mapped[3]
+        assert mapped[3] is first
+        for row in range(20, 30):
+            mapped[row]
+        assert mapped[3] is not first and mapped[3] == first
+
+        visible = mapped[50:60]
+        for _ in mapped:
+            pass
+        assert all(mapped[row] is track for row, track in enumerate(visible, 50))
+        print("✓ Recently read rows cached, full scans bypass the cache")
+    finally:
+        track_store.CACHE_ROWS = previous
+        mapped.close()
+
+
+def test_store_growth():
+    """Reads see records appended after the file was first mapped"""
+    store = MappedTrackStore()
+    try:
+        offsets = store.append(make_tracks(5))
+        assert store.read(offsets[4]).title == "Title 0004"
+        more = store.append(make_tracks(5, start=5))
+        assert store.read(more[0]).title == "Title 0005" and store.read(offsets[0]).title == "Title 0000"
+        assert len(store.append([])) == 0 and store.size > 0
+        print("✓ Store remapped as it grows")
+    finally:
+        store.close()
+
+
+def test_model_over_mapped_list():
+    """The track table and its sorting proxy work the same over a mapped list"""
+    tracks = MappedTrackList(make_tracks(300))
+    try:
+        model = TrackTableModel()
+        model.set_tracks(tracks)
+        proxy = TrackSortProxyModel()
+        proxy.setSourceModel(model)
+        proxy.sort(TrackTableModel.COLUMN_TITLE, Qt.SortOrder.DescendingOrder)
+
+        model.append_tracks(make_tracks(100, start=300))
+        removed = model.remove_tracks([f"set{number:04d}" for number in range(0, 400, 4)])
+        assert len(removed) == 100 and model.rowCount() == 300
+        model.restore_tracks(removed[:10])
+        assert model.tracks() is tracks and model.rowCount() == 310
+
+        titles = [proxy.index(row, TrackTableModel.COLUMN_TITLE).data() for row in range(proxy.rowCount())]
+        assert titles == sorted(titles, reverse=True) and titles[0] == "Title 0399"
+        assert [track.position for track in tracks] == sorted(track.position for track in tracks)
+
+        diff = model.update_tracks(make_tracks(50))
+        assert len(diff['removed']) == 263 and len(diff['added']) == 3 and model.rowCount() == 50
+        assert list(tracks) == make_tracks(50)
+        print("✓ Model and proxy work over a mapped track list")
+    finally:
+        tracks.close()
+
+
+def test_refresh_moves_mapped_rows():
+    """A refresh that moves tracks reorders a mapped list in place"""
+    tracks = MappedTrackList(make_tracks(40))
+    try:
+        model = TrackTableModel()
+        model.set_tracks(tracks)
+        proxy = TrackSortProxyModel()
+        proxy.setSourceModel(model)
+        proxy.sort(TrackTableModel.COLUMN_ARTIST)
+        layouts = []
+        model.layoutChanged.connect(lambda: layouts.append(model.rowCount()))
+
+        # 39 moves to the front, 5 and 6 swap, 10 is dropped
+        order = [39] + [number for number in range(39) if number != 10]
+        order[6], order[7] = order[7], order[6]
+        refreshed = [make_track(position, f"Artist {number:04d}", f"Title {number:04d}",
+                                f"vid{number:04d}", f"set{number:04d}")
+                     for position, number in enumerate(order, 1)]
+        diff = model.update_tracks(refreshed)
+
+        assert diff['moved'] == 2 and diff['removed'] == ["set0010"] and layouts == [39]
+        assert model.tracks() is tracks and list(tracks) == refreshed
+        assert [model.row_for_key(f"set{number:04d}") for number in (39, 6, 5)] == [0, 6, 7]
+        artists = [proxy.index(row, TrackTableModel.COLUMN_ARTIST).data() for row in range(proxy.rowCount())]
+        assert artists == sorted(artists) and len(artists) == 39
+        for row in range(proxy.rowCount()):
+            assert proxy.mapFromSource(proxy.mapToSource(proxy.index(row, 0))).row() == row
+
+        tracks.sort(key=lambda track: track.title_key, reverse=True)
+        assert [track.title for track in tracks][:2] == ["Title 0039", "Title 0038"]
+        print("✓ Refresh moved rows of a mapped track list in place")
+    finally:
+        tracks.close()
+
+
+if __name__ == "__main__":
+    print("PlaylistCat 🐱 - Track Store Tests")
+    print("=" * 50)
+    test_list_operations()
+    test_text_round_trip()
+    test_read_cache()
+    test_store_growth()
+    test_model_over_mapped_list()
+    test_refresh_moves_mapped_rows()
+    print("\n🎉 All track store tests passed!")